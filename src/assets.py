@@ -0,0 +1,222 @@
+"""
+Shared asset registry for Point of No Return
+"""
+import threading
+from types import MappingProxyType
+import src.constants as constants
+import src.utils as utils
+
+
+def load_options(folder):
+    """
+    Finds what to make along with the images of an animation folder: sword
+    masks for attack animations, and translucent copies for the sprites that
+    flash while invincible
+
+    Args:
+        folder: a string, the folder relative to the image folder
+
+    Returns:
+        a dict of the keyword arguments to load the folder with
+        utils.get_animation_info
+    """
+    names = folder.split('/')
+    return {'sword_masks': names[-1].startswith('attack_'),
+            'faded': names[0] in constants.FLASHING_SPRITES}
+
+
+class AssetRegistry:
+    """
+    Loads each animation folder once and shares the frozen result between every
+    sprite that uses the same art. Folders can also be loaded elsewhere, like
+    on a Preloader's worker threads, and handed over as futures.
+
+    Attributes:
+        _folders: a dict mapping folder keys (paths relative to the image
+            folder) to read-only animation info
+        _pending: a dict mapping folder keys to Futures of the animation info
+            of folders being loaded in the background
+        _animation_sets: a dict mapping (image_path, names) tuples to read-only
+            dicts of animation names to animation info
+        _hits: an int, how many animation set requests were served from cache
+        _misses: an int, how many animation set requests had to be built
+        _lock: a threading.RLock held while the registry changes, since
+            sprites can be made on more than one thread
+    """
+    def __init__(self):
+        """
+        Initializes an empty registry
+        """
+        self._folders = {}
+        self._pending = {}
+        self._animation_sets = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    @property
+    def stats(self):
+        """
+        Returns a dict with the cache hits, misses, number of cached folders,
+        number of folders still loading in the background and the number of
+        bytes held by the cached images
+        """
+        seen = set()
+        held = 0
+        for info in self._folders.values():
+            for surf in info['animations'] + info.get('faded', ()):
+                if id(surf) not in seen:
+                    seen.add(id(surf))
+                    held += surf.get_pitch() * surf.get_height()
+        return {'hits': self._hits, 'misses': self._misses,
+                'entries': len(self._folders), 'pending': len(self._pending),
+                'bytes': held}
+
+    def animations(self, image_path, names):
+        """
+        Returns the animations for a sprite, loading any folders that haven't
+        been loaded yet
+
+        Args:
+            image_path: a string, the sprite's folder relative to the image
+                folder
+            names: a tuple of animation names. 'stills' is the sprite's base
+                folder, 'still_<direction>' is the first frame of the
+                <direction> folder, and anything else is a subfolder.
+                'attack_<direction>' subfolders also get sword masks, and
+                the folders of FLASHING_SPRITES get translucent copies
+
+        Returns:
+            a read-only dict mapping each name to its animation info
+        """
+        key = (image_path, tuple(names))
+        with self._lock:
+            if key in self._animation_sets:
+                self._hits += 1
+                return self._animation_sets[key]
+            self._misses += 1
+            animation_set = MappingProxyType(
+                {name: self._animation(image_path, name) for name in key[1]})
+            self._animation_sets[key] = animation_set
+            return animation_set
+
+    def preload(self, folder, future):
+        """
+        Hands over a folder being loaded in the background, so requests for
+        it wait for that load instead of starting another one. Ignored if the
+        folder is already loaded.
+
+        Args:
+            folder: a string, the folder relative to the image folder
+            future: a concurrent.futures.Future of the folder's animation info,
+                as returned by utils.get_animation_info
+        """
+        with self._lock:
+            if folder not in self._folders:
+                self._pending[folder] = future
+
+    def collect(self, wait=False):
+        """
+        Stores the animation info of the background loads that are done
+
+        Args:
+            wait: a boolean, whether to wait for every background load to
+                finish. Defaults to False, which only stores the finished ones
+
+        Returns:
+            an int, how many folders are still loading
+        """
+        with self._lock:
+            for folder, future in list(self._pending.items()):
+                if wait or future.done():
+                    del self._pending[folder]
+                    self._store(folder, future.result())
+            return len(self._pending)
+
+    def evict(self, image_path=None):
+        """
+        Drops cached animations so they get loaded again on the next request.
+        Sprites that already hold the old animations keep using them.
+
+        Args:
+            image_path: a string, the sprite folder to evict. Defaults to None,
+                which evicts everything
+        """
+        with self._lock:
+            if image_path is None:
+                self._folders.clear()
+                self._pending.clear()
+                self._animation_sets.clear()
+                return
+            for folders in (self._folders, self._pending):
+                for folder in list(folders):
+                    if folder == image_path\
+                            or folder.startswith(f'{image_path}/'):
+                        del folders[folder]
+            for key in list(self._animation_sets):
+                if key[0] == image_path:
+                    del self._animation_sets[key]
+
+    def reload(self, image_path):
+        """
+        Reloads every cached animation set for a sprite folder from disk
+
+        Args:
+            image_path: a string, the sprite folder to reload
+        """
+        with self._lock:
+            names = [key[1] for key in self._animation_sets
+                     if key[0] == image_path]
+            self.evict(image_path)
+            for animation_names in names:
+                self.animations(image_path, animation_names)
+
+    def _animation(self, image_path, name):
+        """
+        Returns the animation info for one animation name of a sprite
+
+        Args:
+            image_path: a string, the sprite's folder relative to the image
+                folder
+            name: a string, the animation name
+
+        Returns:
+            a read-only dict of animation info
+        """
+        if name == 'stills':
+            folder = image_path
+        else:
+            folder = f'{image_path}/{name}'
+        if folder in self._folders:
+            return self._folders[folder]
+
+        if folder in self._pending:
+            info = self._pending.pop(folder).result()
+        elif name.startswith('still_'):
+            moving = self._animation(image_path, name[len('still_'):])
+            info = {key: value[0:1] if isinstance(value, tuple) else value
+                    for key, value in moving.items()}
+        else:
+            info = utils.get_animation_info(
+                f'{constants.IMAGE_FOLDER}/{folder}', **load_options(folder))
+        return self._store(folder, info)
+
+    def _store(self, folder, info):
+        """
+        Freezes and keeps the animation info of a folder
+
+        Args:
+            folder: a string, the folder relative to the image folder
+            info: a dict of animation info from utils.get_animation_info
+
+        Returns:
+            the read-only dict of animation info that was kept
+        """
+        self._folders[folder] = MappingProxyType(
+            {key: tuple(value) if isinstance(value, list) else value
+             for key, value in info.items()})
+        return self._folders[folder]
+
+
+# The registry shared by every sprite in the process
+REGISTRY = AssetRegistry()
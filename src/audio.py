@@ -0,0 +1,175 @@
+"""
+Sound effect mixing for Point of No Return
+"""
+import time
+import pygame
+import src.constants as constants
+
+
+class AudioManager:  # pylint: disable=too-many-instance-attributes
+    """
+    Plays sound effects on a fixed number of mixer channels reserved for each
+    effect, so a burst of hits in a horde can't take every channel or pile
+    up voices. Repeats of an effect right after it started are merged into
+    the voice already playing. When all of an effect's channels are busy, it
+    steals the oldest voice of the least important effect playing that is
+    less important than it, or is dropped if there is none.
+
+    Attributes:
+        _load: a function that takes the name of a sound effect and returns
+            its Sound
+        _channels: a dict mapping effect names to how many channels to
+            reserve for them
+        _priorities: a dict mapping effect names to ints, higher for effects
+            that can steal the voices of lower ones
+        _merge_time: a float, the seconds after an effect starts that repeats
+            of it are merged into it
+        _clock: a function that returns the current time in seconds
+        _sounds: a dict mapping effect names to the Sounds loaded so far
+        _pools: a dict mapping effect names to lists of the Channels reserved
+            for them, or None until the first effect plays
+        _voices: a dict mapping Channels to a tuple of the name of the effect
+            last started on them and when it started
+        _started: a dict mapping effect names to when they last started
+        _counts: a dict mapping 'played', 'merged', 'stolen' and 'dropped' to
+            how many triggers were played, merged, played on a stolen voice
+            and dropped
+    """
+    def __init__(self, load, channels=None, priorities=None,
+                 merge_time=constants.SOUND_MERGE_TIME,
+                 clock=time.perf_counter):
+        """
+        Initializes the manager without touching the mixer, which is set up
+        the first time an effect plays
+
+        Args:
+            load: a function that takes the name of a sound effect and
+                returns its Sound
+            channels: a dict mapping effect names to how many channels to
+                reserve for them. Defaults to SOUND_CHANNELS
+            priorities: a dict mapping effect names to ints, higher for
+                effects that can steal the voices of lower ones. Defaults to
+                SOUND_PRIORITIES
+            merge_time: a float, the seconds after an effect starts that
+                repeats of it are merged into it
+            clock: a function that returns the current time in seconds
+        """
+        self._load = load
+        self._channels = constants.SOUND_CHANNELS if channels is None\
+            else channels
+        self._priorities = constants.SOUND_PRIORITIES if priorities is None\
+            else priorities
+        self._merge_time = merge_time
+        self._clock = clock
+        self._sounds = {}
+        self._pools = None
+        self._voices = {}
+        self._started = {}
+        self._counts = {'played': 0, 'merged': 0, 'stolen': 0, 'dropped': 0}
+
+    @property
+    def stats(self):
+        """
+        Returns a dict with how many triggers were played, merged into a
+        voice already playing, played on a stolen voice and dropped, and how
+        many voices are playing now
+        """
+        playing = sum(channel.get_busy() for channel in self._voices)
+        return {**self._counts, 'playing': playing}
+
+    def play(self, name):
+        """
+        Plays a sound effect on one of its reserved channels
+
+        Args:
+            name: a string, the name of the sound effect
+
+        Returns:
+            the Channel the effect is playing on, or None if it was merged or
+            dropped
+        """
+        now = self._clock()
+        started = self._started.get(name)
+        if started is not None and now - started < self._merge_time:
+            self._counts['merged'] += 1
+            return None
+        channel = self._free_channel(name)
+        if channel is None:
+            channel = self._victim(name)
+            if channel is None:
+                self._counts['dropped'] += 1
+                return None
+            channel.stop()
+            self._counts['stolen'] += 1
+        channel.play(self._sound(name))
+        self._voices[channel] = (name, now)
+        self._started[name] = now
+        self._counts['played'] += 1
+        return channel
+
+    def _sound(self, name):
+        """
+        Returns a sound effect, loading it the first time it is played
+
+        Args:
+            name: a string, the name of the sound effect
+        """
+        sound = self._sounds.get(name)
+        if sound is None:
+            sound = self._sounds[name] = self._load(name)
+        return sound
+
+    def _reserve(self):
+        """
+        Reserves channels for each effect at the start of the mixer's
+        channels, so nothing else playing sounds can take them
+        """
+        total = sum(self._channels.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self._pools = {}
+        index = 0
+        for name, count in self._channels.items():
+            self._pools[name] = [pygame.mixer.Channel(index + offset)
+                                 for offset in range(count)]
+            index += count
+
+    def _free_channel(self, name):
+        """
+        Finds one of an effect's reserved channels that isn't playing
+
+        Args:
+            name: a string, the name of the sound effect
+
+        Returns:
+            a free Channel, or None if they are all busy
+        """
+        if self._pools is None:
+            self._reserve()
+        for channel in self._pools.get(name, ()):
+            if not channel.get_busy():
+                return channel
+        return None
+
+    def _victim(self, name):
+        """
+        Finds the voice to steal for an effect whose channels are all busy,
+        the oldest voice of the least important effect less important than it
+
+        Args:
+            name: a string, the name of the sound effect
+
+        Returns:
+            the Channel to steal, or None if no voice is less important
+        """
+        priority = self._priorities.get(name, 0)
+        victim = None
+        lowest = None
+        for channel, (playing, started) in self._voices.items():
+            other = self._priorities.get(playing, 0)
+            if other >= priority or not channel.get_busy():
+                continue
+            if lowest is None or (other, started) < lowest:
+                victim, lowest = channel, (other, started)
+        return victim
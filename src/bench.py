@@ -0,0 +1,344 @@
+"""
+Scenario benchmarks for Point of No Return
+
+Runs named workloads through the game, its controllers and optionally the
+view on SDL's dummy drivers, and reports the time each subsystem takes per
+tick and the memory used:
+    python -m src.bench
+    python -m src.bench --save-baseline baseline.json
+    python -m src.bench --baseline baseline.json --threshold 0.15
+"""
+import argparse
+from collections import namedtuple
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pygame
+import src.constants as constants
+from src.constants import MOVES
+from src.controller import PlayerController, DemonController, ScrollController
+from src.game import Game
+from src.inputs import idle_keys
+
+# A benchmark workload. demons is how many demons to spawn before the first
+# tick, obstacles is how many obstacles to spawn ahead of the player, spread
+# evenly over the ticks, walk is the MOVES key held down (or None) and draw is
+# None to not draw, or 'full' or 'dirty' to draw every tick with a GraphicView
+# that redraws the whole screen or only the parts that changed
+Scenario = namedtuple('Scenario', 'name description ticks demons obstacles '
+                                  'walk draw')
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+    Scenario('demons_chasing', '200 demons chasing an idle player', 600, 200,
+             0, None, None),
+    Scenario('long_walk', 'walking up past 5,000 spawned obstacles', 2500, 0,
+             5000, 'up', None),
+    Scenario('full_draw', 'drawing 50 demons with lighting every tick', 600,
+             50, 0, 'left', 'full'),
+    Scenario('dirty_draw', 'drawing 50 demons with dirty rects every tick',
+             600, 50, 0, 'left', 'dirty'),
+)}
+
+# Percentiles reported for each subsystem
+METRICS = ('mean', 'p95', 'p99')
+
+
+def _keys(walk):
+    """
+    Returns a function that gives the key state for a scenario
+
+    Args:
+        walk: a key name from MOVES to hold down, or None to press nothing
+    """
+    pressed = idle_keys()
+    if walk is not None:
+        pressed[MOVES[walk]] = True
+    return lambda: pressed
+
+
+def _steps(scenario, screen):
+    """
+    Sets up a game for a scenario
+
+    Args:
+        scenario: the Scenario to set up
+        screen: the display Surface to draw on
+
+    Returns:
+        a tuple of the Game and a list of (subsystem name, update function)
+        pairs to run every tick
+    """
+    game = Game(seed=0)
+    game.running = True
+    for _ in range(scenario.demons):
+        game.create_new_demon()
+    steps = [('player', PlayerController(game, _keys(scenario.walk)).update),
+             ('demons', DemonController(game).update),
+             ('scroll', ScrollController(game).update),
+             ('game', game.update)]
+    if scenario.draw:
+        # Imported here so scenarios that don't draw don't need the view
+        from src.view import GraphicView  # pylint: disable=import-outside-toplevel
+        view = GraphicView(game, screen, dirty_rects=scenario.draw == 'dirty')
+        steps.append(('draw', view.draw))
+    return game, steps
+
+
+def _before_tick(game, scenario, tick, ticks):
+    """
+    Does the untimed work for a tick of a scenario. Spawns its share of the
+    scenario's obstacles ahead of the player and tops the player's health back
+    up, so the workload stays the same and the view never opens the game over
+    menu.
+
+    Args:
+        game: the Game running the scenario
+        scenario: the Scenario being run
+        tick: an int, the tick about to run
+        ticks: an int, how many ticks the scenario runs for
+    """
+    spawns = (tick + 1) * scenario.obstacles // ticks\
+        - tick * scenario.obstacles // ticks
+    for _ in range(spawns):
+        game.create_new_obstacle(scenario.walk != 'down')
+
+    player = game.player
+    player.entity.health = constants.PLAYER_HEALTH
+    if not player.alive():
+        game.all_sprites.add(player)
+
+
+def summarize(names, times, total='tick'):
+    """
+    Summarizes the time taken by each subsystem
+
+    Args:
+        names: a list of the subsystem names
+        times: an array with a row of seconds per subsystem for each tick
+        total: a string, the name to summarize the total of each row under.
+            Defaults to 'tick'. None leaves the total out
+
+    Returns:
+        a dict mapping each subsystem, and the total, to a dict of its mean,
+        p95 and p99 milliseconds per tick
+    """
+    times = times * 1000
+    columns = list(times.T)
+    if total is not None:
+        names = names + [total]
+        columns.append(times.sum(axis=1))
+    return {name: {'mean': float(column.mean()),
+                   'p95': float(np.percentile(column, 95)),
+                   'p99': float(np.percentile(column, 99))}
+            for name, column in zip(names, columns)}
+
+
+def run_scenario(scenario, screen, ticks=None, memory=True):
+    """
+    Runs a scenario and measures it
+
+    Args:
+        scenario: the Scenario to run
+        screen: the display Surface to draw on
+        ticks: an int, how many ticks to run. Defaults to None, which uses the
+            scenario's number of ticks
+        memory: a boolean, whether to run the scenario a second time with
+            tracemalloc to measure its peak memory
+
+    Returns:
+        a dict with the ticks run, the number of sprites at the end, a dict
+        mapping each subsystem (and 'tick' for the total) to its mean, p95
+        and p99 milliseconds per tick, and the peak traced memory in bytes
+        (or None if not measured). If the scenario couldn't be set up, the
+        dict only has 'skipped' with the reason.
+    """
+    ticks = scenario.ticks if ticks is None else ticks
+    try:
+        game, steps = _steps(scenario, screen)
+    except pygame.error as error:
+        return {'skipped': str(error)}
+
+    times = np.zeros((ticks, len(steps)))
+    for tick in range(ticks):
+        _before_tick(game, scenario, tick, ticks)
+        for column, (_, update) in enumerate(steps):
+            start = time.perf_counter()
+            update()
+            times[tick, column] = time.perf_counter() - start
+    result = {'ticks': ticks, 'sprites': len(game.all_sprites),
+              'subsystems': summarize([name for name, _ in steps], times),
+              'memory_peak': None}
+
+    if memory:
+        tracemalloc.start()
+        game, steps = _steps(scenario, screen)
+        for tick in range(ticks):
+            _before_tick(game, scenario, tick, ticks)
+            for _, update in steps:
+                update()
+        result['memory_peak'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def compare(results, baseline, threshold=0.1, memory_threshold=0.1,
+            min_delta=0.05):
+    """
+    Finds the metrics that got worse than a baseline by more than a threshold
+
+    Args:
+        results: a dict mapping scenario names to results from run_scenario
+        baseline: a dict of earlier results in the same format
+        threshold: a float, how much slower (as a fraction) a time can get
+            before it counts as a regression
+        memory_threshold: a float, how much more memory (as a fraction) a
+            scenario can use before it counts as a regression
+        min_delta: a float, the smallest increase in milliseconds that can
+            count as a regression, to ignore noise in very fast subsystems
+
+    Returns:
+        a list of strings describing each regression
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or 'skipped' in result or 'skipped' in base:
+            continue
+        for subsystem, stats in result['subsystems'].items():
+            base_stats = base['subsystems'].get(subsystem)
+            if base_stats is None:
+                continue
+            for metric in METRICS:
+                old, new = base_stats[metric], stats[metric]
+                if new > old * (1 + threshold) and new - old > min_delta:
+                    regressions.append(f'{name} {subsystem} {metric}: '
+                                       f'{old:.3f} ms -> {new:.3f} ms')
+        old, new = base.get('memory_peak'), result['memory_peak']
+        if old and new and new > old * (1 + memory_threshold):
+            regressions.append(f'{name} memory peak: {old} B -> {new} B')
+    return regressions
+
+
+def print_result(name, result):
+    """
+    Prints a table of a scenario's results
+
+    Args:
+        name: a string, the scenario name
+        result: a dict of results from run_scenario
+    """
+    if 'skipped' in result:
+        print(f'{name}: skipped ({result["skipped"]})')
+        return
+    print(f'{name}: {result["ticks"]} ticks, {result["sprites"]} sprites at '
+          f'the end')
+    print(f'  {"subsystem":<10}' + ''.join(f'{metric:>10}'
+                                            for metric in METRICS) + ' (ms)')
+    for subsystem, stats in result['subsystems'].items():
+        print(f'  {subsystem:<10}' + ''.join(f'{stats[metric]:>10.3f}'
+                                              for metric in METRICS))
+    if result['memory_peak'] is not None:
+        print(f'  memory peak: {result["memory_peak"] / 2 ** 20:.1f} MiB')
+
+
+def baseline_main(parser, measure, argv=None, memory=True, min_delta=0.05):
+    """
+    Runs a benchmark command line with the baseline options: measures the
+    results, saves them to a baseline JSON and compares them against one
+
+    Args:
+        parser: an ArgumentParser with the command's own options, which gets
+            the baseline options added to it
+        measure: a function that takes the parsed options, prints the results
+            and returns a dict mapping names to results in the format of
+            run_scenario
+        argv: a list of command line arguments. Defaults to None, which uses
+            sys.argv
+        memory: a boolean, whether the results measure memory, so it can
+            regress. Defaults to True
+        min_delta: a float, the smallest increase in milliseconds that can
+            count as a regression
+
+    Returns:
+        an int exit code, 1 if any metric regressed past its threshold
+    """
+    parser.add_argument('--baseline', metavar='PATH',
+                        help='baseline JSON to compare the results against')
+    parser.add_argument('--save-baseline', metavar='PATH',
+                        help='write the results to a baseline JSON')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='fraction a time can grow by before it is a '
+                             'regression')
+    if memory:
+        parser.add_argument('--memory-threshold', type=float, default=0.1,
+                            help='fraction the memory peak can grow by before '
+                                 'it is a regression')
+    args = parser.parse_args(argv)
+    results = measure(args)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as baseline:
+            json.dump(results, baseline, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline:
+            regressions = compare(
+                results, json.load(baseline), args.threshold,
+                args.memory_threshold if memory else 0, min_delta)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+        print('no regressions against the baseline')
+    return 0
+
+
+def main(argv=None):
+    """
+    Parses the command line, runs the scenarios, prints the results and
+    compares them against a baseline
+
+    Args:
+        argv: a list of command line arguments. Defaults to None, which uses
+            sys.argv
+
+    Returns:
+        an int exit code, 1 if any metric regressed past its threshold
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark Point of No Return scenarios')
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help=f'scenarios to run, from {", ".join(SCENARIOS)} '
+                             '(defaults to all of them)')
+    parser.add_argument('--ticks', type=int, default=None,
+                        help='ticks to run each scenario for, instead of its '
+                             'default')
+    parser.add_argument('--no-memory', action='store_true',
+                        help="don't measure memory")
+
+    def measure(args):
+        """
+        Runs the chosen scenarios and prints the results of each
+        """
+        for name in args.scenarios:
+            if name not in SCENARIOS:
+                parser.error(f'unknown scenario {name}')
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.init()
+        screen = pygame.display.set_mode(constants.SCREEN_SIZE)
+
+        results = {}
+        for name in args.scenarios or SCENARIOS:
+            results[name] = run_scenario(SCENARIOS[name], screen, args.ticks,
+                                         not args.no_memory)
+            print_result(name, results[name])
+        return results
+
+    return baseline_main(parser, measure, argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
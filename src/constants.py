@@ -4,9 +4,7 @@ Constants for Point of No Return
 from enum import IntEnum
 import os
 import pygame
-import pygame_menu.themes
 from pygame import locals  # pylint: disable=redefined-builtin
-from pygame_menu.themes import Theme
 
 
 class GameEvent(IntEnum):
@@ -20,32 +18,47 @@ class GameEvent(IntEnum):
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 SCREEN_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+BACKGROUND_COLOR = (255, 0, 0)
+# Whether the view only redraws the parts of the screen that changed, and the
+# fraction of the screen that can change before it redraws all of it instead
+DIRTY_RECTS = False
+DIRTY_RECT_MAX_FRACTION = 0.5
 FRAME_RATE = 60
+# Seconds of game time in one tick at the frame rate, and the most a single
+# tick can advance the game by, so a long stall doesn't teleport sprites
+TICK = 1 / FRAME_RATE
+MAX_TICK = 0.1
+# Ticks per second the simulation runs at when it is decoupled from drawing,
+# and how many pixels a sprite can move between ticks before it counts as
+# respawned and isn't interpolated
+SIM_TICK_RATE = 120
+INTERPOLATION_MAX_DIST = 100
+# Timers closer to zero than this count as finished
+TIME_EPSILON = 1e-9
+# Milliseconds a frame can take while keeping up with the frame rate
+FRAME_BUDGET = 1000 / FRAME_RATE
+# How many recent frames the profiler keeps
+PROFILER_FRAMES = 10 * FRAME_RATE
 
 # Media constants
 current_dir = os.path.dirname(__file__)
 IMAGE_FOLDER = os.path.join(current_dir, '../media/images')
 AUDIO_FOLDER = os.path.join(current_dir, '../media/audio')
+# Worker threads that load the media in the background at startup
+PRELOAD_WORKERS = 4
 
-# Menu constants
-GAME_THEME = Theme(
-    background_color=
-    pygame_menu.baseimage.BaseImage(
-        f'{IMAGE_FOLDER}/backgrounds/start_menu.png'),
-    selection_color=(255, 255, 255),
-    title_bar_style=pygame_menu.widgets.MENUBAR_STYLE_NONE,
-    title_close_button=False,
-    title_font=pygame_menu.font.FONT_8BIT,
-    title_font_size=45,
-    title_offset=(30, 30),
-    widget_font=pygame_menu.font.FONT_BEBAS,
-    widget_font_size=50,
-    widget_padding=15
-)
+# Menu constants. The view builds the menu theme from these the first time
+# it shows a menu, so importing the constants doesn't load pygame_menu
+MENU_BACKGROUND = f'{IMAGE_FOLDER}/backgrounds/start_menu.png'
+MENU_SELECTION_COLOR = (255, 255, 255)
+MENU_TITLE_FONT_SIZE = 45
+MENU_TITLE_OFFSET = (30, 30)
+MENU_WIDGET_FONT_SIZE = 50
+MENU_WIDGET_PADDING = 15
 CONTROL_COLOR = (230, 230, 230)
 CONTROL_SIZE = 30
-SCORE_COLOR = GAME_THEME.selection_color
-SCORE_SIZE = GAME_THEME.widget_font_size + 20
+SCORE_COLOR = MENU_SELECTION_COLOR
+SCORE_SIZE = MENU_WIDGET_FONT_SIZE + 20
 
 # Sprite speeds
 PLAYER_SPEED = 150
@@ -61,6 +74,11 @@ HEALTH_BAR_COLOR_2 = (100, 0, 0)
 HEALTH_BAR_UNIT_WIDTH = 80
 HEALTH_BAR_HEIGHT = 20
 HEALTH_BAR_POS = (20, 20)
+# The area the health bar can cover, at full health plus the unit that
+# flashes while the player is invincible
+HEALTH_BAR_RECT = (HEALTH_BAR_POS[0], HEALTH_BAR_POS[1],
+                   HEALTH_BAR_UNIT_WIDTH * (PLAYER_HEALTH + 1),
+                   HEALTH_BAR_HEIGHT)
 
 # Sprite invincibility info
 DEFAULT_INVINCIBILITY = 1
@@ -68,7 +86,28 @@ PLAYER_INVINCIBILITY = DEFAULT_INVINCIBILITY
 DEMON_INVINCIBILITY = DEFAULT_INVINCIBILITY
 TRANSPARENT_TIME = 1/6
 INVINCIBILITY_ALPHA = 100
+# The image folders of the sprites that flash while invincible, the only ones
+# that get translucent copies of their frames
+FLASHING_SPRITES = ('player', 'demon')
+# The image folders of every sprite the game draws, the ones preloaded
+SPRITE_FOLDERS = ('player', 'demon', 'obstacle', 'flashlight')
 DEMON_SLOW_SCALE = 0.9
+# Whether the demon controller steers and moves all demons at once with NumPy
+VECTORIZED_DEMONS = True
+# Whether demons keep apart from each other, how close (in pixels) another
+# demon has to be to push a demon away, and how hard the push steers it
+# compared to heading for the player
+DEMON_SEPARATION = True
+SEPARATION_RADIUS = 48
+SEPARATION_WEIGHT = 1.0
+# Whether demons find their way around obstacles with a flow field, on a grid
+# of cells this many pixels wide. The part of an obstacle that stops demons is
+# its bottom OBSTACLE_BASE_HEIGHT pixels, which the centers of demons keep
+# FLOW_CLEARANCE pixels away from
+FLOW_FIELD = True
+FLOW_CELL_SIZE = 20
+OBSTACLE_BASE_HEIGHT = 40
+FLOW_CLEARANCE = 30
 
 # Sprite knockback times (in seconds) and distances
 DEFAULT_KNOCKBACK_TIME = 0.25
@@ -83,13 +122,41 @@ LIGHT_DIFF = DARKNESS - LIGHT
 LIGHT_SIZE = 175
 FLASHLIGHT_SPAWN = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 130)
 
+# Sound effect voices. How many mixer channels are reserved for each effect,
+# how important each effect is when a voice has to be stolen for it, and the
+# seconds after an effect starts that repeats of it are merged into it
+SOUND_CHANNELS = {'player_hit': 1, 'player_attack': 1, 'demon_hit': 4}
+SOUND_PRIORITIES = {'player_hit': 2, 'player_attack': 1, 'demon_hit': 0}
+SOUND_MERGE_TIME = 0.05
+
+# The most game events kept between frames
+EVENT_QUEUE_SIZE = 256
+
+# How many sprites the entity store has room for before it grows
+ENTITY_STORE_CAPACITY = 256
+
+# Collision info, the size in pixels of the cells sprites are bucketed into
+COLLISION_CELL_SIZE = 128
+
 # Spawn info
 DEMON_SPAWN_TIME = 3000
+DEMON_SPAWN_TICKS = DEMON_SPAWN_TIME * FRAME_RATE // 1000
 DEMON_MIN_SPAWN_DIST = 20
 DEMON_MAX_SPAWN_DIST = 100
+# Demons spawn in waves every DEMON_SPAWN_TICKS. How many demons come in the
+# first wave, how many more each wave after it brings (fractions add up over
+# waves), and the most demons alive at once, so a horde can't stall frames
+WAVE_SIZE = 1
+WAVE_GROWTH = 0.1
+DEMON_ALIVE_CAP = 200
+# How many demons to build up front, and the most killed demons to keep
+DEMON_POOL_SIZE = 10
+DEMON_POOL_CAP = 100
 OBSTACLE_SPAWN_TRIGGER_DIST = SCREEN_HEIGHT/2 - 100
 OBSTACLE_MIN_SPAWN_DIST = 50
 OBSTACLE_MAX_SPAWN_DIST = 200
+# Obstacles further than this above or below the player are recycled
+OBSTACLE_DESPAWN_DIST = SCREEN_HEIGHT + OBSTACLE_MAX_SPAWN_DIST
 
 # Controls
 MOVES = {
@@ -2,9 +2,12 @@
 Controllers for Point of No Return
 """
 from abc import ABC, abstractmethod
+import numpy as np
 import pygame
 import src.constants as constants
 from src.constants import MOVES
+from src.flowfield import FlowField
+from src.separation import Separation
 from src.sprites import Direction
 
 
@@ -42,9 +45,13 @@ class Controller(ABC):
         return self._sprite
 
     @abstractmethod
-    def update(self):
+    def update(self, dt=constants.TICK):
         """
         Updates the game model based on player inputs
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
         """
         return
 
@@ -52,22 +59,34 @@ class Controller(ABC):
 class PlayerController(Controller):
     """
     Controls the player with player input
+
+    Attributes:
+        _get_pressed: a function that returns the current state of the keys,
+            indexable by pygame key constants
     """
-    def __init__(self, game):
+    def __init__(self, game, get_pressed=pygame.key.get_pressed):
         """
         Creates a Controller for the player
 
         Args:
             game: a Game containing the player to update with this controller
                 and the game state to update
+            get_pressed: a function that returns the current state of the keys,
+                indexable by pygame key constants. Defaults to reading the
+                keyboard
         """
         super().__init__(game, game.player)
+        self._get_pressed = get_pressed
 
-    def update(self):
+    def update(self, dt=constants.TICK):
         """
         Updates the player state based on user keyboard input
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
         """
-        pressed_keys = pygame.key.get_pressed()
+        pressed_keys = self._get_pressed()
 
         # If the sprite is attacking, lock the player's movement
         if self.sprite.is_attacking:
@@ -98,40 +117,222 @@ class PlayerController(Controller):
                                                  self.sprite.rect.top <= 0):
                     direction[1] = 0
 
-                self.sprite.set_direction((direction[0], direction[1]))
-        self.sprite.update()
+                self.sprite.set_direction((direction[0], direction[1]), dt)
+        self.sprite.update(dt=dt)
 
 
 class DemonController(Controller):
     """
     Controls the demons
+
+    Attributes:
+        _vectorized: a boolean, True to steer and move every demon at once
+            through the entity store and False to update them one at a time
+        _flow_field: the FlowField that steers the demons around obstacles, or
+            None to steer them straight at the player
+        _separation: the Separation that pushes the demons apart, or None to
+            let them bunch up
     """
-    def __init__(self, game):
+    def __init__(self, game, vectorized=constants.VECTORIZED_DEMONS,
+                 flow_field=constants.FLOW_FIELD,
+                 separation=constants.DEMON_SEPARATION):
         """
         Creates a Controller for the demons
 
         Args:
             game: a Game containing the demon Sprite Group to update with this
                 controller and the game state to update
+            vectorized: a boolean, whether to steer and move every demon at
+                once with NumPy. Defaults to VECTORIZED_DEMONS
+            flow_field: a boolean, whether to steer the demons around
+                obstacles with a flow field. Defaults to FLOW_FIELD
+            separation: a boolean, whether to push the demons away from the
+                demons near them. Defaults to DEMON_SEPARATION
         """
         super().__init__(game, game.demons)
+        self._vectorized = vectorized
+        self._flow_field = FlowField(game) if flow_field else None
+        self._separation = Separation() if separation else None
+
+    @property
+    def vectorized(self):
+        """
+        Returns whether the demons are steered and moved in one NumPy pass
+        """
+        return self._vectorized
+
+    @property
+    def flow_field(self):
+        """
+        Returns the FlowField that steers the demons around obstacles, or None
+        if they are steered straight at the player
+        """
+        return self._flow_field
 
-    def update(self):
+    @property
+    def separation(self):
+        """
+        Returns the Separation that pushes the demons apart, or None if they
+        aren't pushed apart
+        """
+        return self._separation
+
+    def update(self, dt=constants.TICK):
         """
-        Updates the demon states to move towards the player
+        Updates the demon states to move towards the player, around the
+        obstacles in the way and away from the demons crowding them
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
         """
-        for demon in self.sprite:
+        demons = self.sprite.sprites()
+        if not demons:
+            return
+        if self._flow_field is not None:
+            self._flow_field.update()
+        centers = np.array([demon.rect.center for demon in demons],
+                           dtype=float)
+        pushes = None if self._separation is None\
+            else self._separation.forces(centers)
+        if self._vectorized:
+            self._update_vectorized(dt, demons, centers, pushes)
+            return
+        pushes = [None] * len(demons) if pushes is None else pushes.tolist()
+        for demon, push in zip(demons, pushes):
             player_pos = self.game.player.rect.center
-            direction = (player_pos[0] - demon.rect.centerx,
-                         player_pos[1] - demon.rect.centery)
+            direction = None
+            if self._flow_field is not None:
+                direction = self._flow_field.direction(demon.rect.center)
+            if direction is None:
+                direction = (player_pos[0] - demon.rect.centerx,
+                             player_pos[1] - demon.rect.centery)
             dist = (direction[0] ** 2 + direction[1] ** 2) ** 0.5
             if dist == 0:
                 continue
             scale = 1 / dist
+            if push is not None and (push[0] or push[1]):
+                direction = (direction[0] * scale
+                             + constants.SEPARATION_WEIGHT * push[0],
+                             direction[1] * scale
+                             + constants.SEPARATION_WEIGHT * push[1])
+                dist = (direction[0] ** 2 + direction[1] ** 2) ** 0.5
+                if dist == 0:
+                    continue
+                scale = 1 / dist
             if self.game.player.is_invincible:
                 scale *= constants.DEMON_SLOW_SCALE
             demon.set_direction((direction[0] * scale, direction[1] * scale))
-            demon.update()
+            demon.update(dt=dt)
+
+    def _update_vectorized(self, dt, demons, centers, pushes):
+        """
+        Steers every demon towards the player at once and moves them all
+        through the entity store. Only the animations, obstacle collisions
+        and the timers of demons that were hit are updated one at a time.
+
+        Args:
+            dt: a float, the seconds of game time to advance by
+            demons: a list of the Demons to steer
+            centers: an N x 2 array of the demons' centers
+            pushes: an N x 2 array of how hard the demons near each demon push
+                it away, or None if they don't
+        """
+        directions, moving = self._directions(centers, pushes)
+        entities = self.game.entities
+        rows = np.fromiter((demon.entity.row for demon in demons),
+                           dtype=np.intp, count=len(demons))
+        # Start from the rects of any demons that were moved directly, like
+        # GameSprite.position does
+        positions = entities.positions
+        moved = (np.floor(positions[rows] + 0.5) != centers).any(axis=1)
+        positions[rows[moved]] = centers[moved]
+
+        rows = rows[moving]
+        entities.directions[rows] = directions[moving]
+        steered = entities.sprites(rows)
+        for demon in steered:
+            demon.steer(dt)
+        self._move(dt, rows, steered)
+        # Only demons that were hit have timers left to count down
+        hit = (entities.timers[rows] > 0).any(axis=1)
+        for demon in entities.sprites(rows[hit]):
+            demon.settle(dt)
+
+    def _directions(self, centers, pushes):
+        """
+        Finds the way every demon should move, towards the player and around
+        the obstacles and demons in the way
+
+        Args:
+            centers: an N x 2 array of the demons' centers
+            pushes: an N x 2 array of how hard the demons near each demon push
+                it away, or None if they don't
+
+        Returns:
+            a tuple of an N x 2 array of each demon's direction and a boolean
+            array of whether each demon moves
+        """
+        directions = np.subtract(self.game.player.rect.center, centers)
+        if self._flow_field is not None:
+            flow = self._flow_field.sample(centers)
+            detour = flow.any(axis=1)
+            directions[detour] = flow[detour]
+        dists = np.sqrt(directions[:, 0] ** 2 + directions[:, 1] ** 2)
+        moving = dists != 0
+        scales = np.divide(1, dists, out=np.zeros_like(dists), where=moving)
+        if pushes is not None:
+            self._push_apart(directions, scales, moving, pushes)
+        if self.game.player.is_invincible:
+            scales *= constants.DEMON_SLOW_SCALE
+        directions *= scales[:, np.newaxis]
+        return directions, moving
+
+    def _move(self, dt, rows, demons):
+        """
+        Moves demons in their stored directions at once, then moves the rects
+        of the ones that reached a new pixel
+
+        Args:
+            dt: a float, the seconds of game time to advance by
+            rows: an int array of the demons' entity store rows
+            demons: a list of the Demons in those rows
+        """
+        entities = self.game.entities
+        speeds = np.fromiter((demon.speed for demon in demons), dtype=float,
+                             count=len(demons))
+        starts = entities.positions[rows]
+        ends = starts + entities.directions[rows] * speeds[:, np.newaxis] * dt
+        entities.positions[rows] = ends
+        # The rects are rounded half up from the sub-pixel positions
+        centers = np.floor(ends + 0.5)
+        changed = (np.floor(starts + 0.5) != centers).any(axis=1)
+        for demon, center in zip(entities.sprites(rows[changed]),
+                                 centers[changed].astype(int).tolist()):
+            demon.place((center[0], center[1]))
+
+    @staticmethod
+    def _push_apart(directions, scales, moving, pushes):
+        """
+        Adds the pushes from nearby demons to the demons' directions towards
+        the player, in place
+
+        Args:
+            directions: an N x 2 array of the way to the player from each demon
+            scales: an array of what to scale each direction by to make it a
+                unit vector
+            moving: a boolean array, whether each demon moves
+            pushes: an N x 2 array of how hard the demons near each demon push
+                it away
+        """
+        pushed = moving & pushes.any(axis=1)
+        steer = directions[pushed] * scales[pushed, np.newaxis]\
+            + constants.SEPARATION_WEIGHT * pushes[pushed]
+        dists = np.sqrt(steer[:, 0] ** 2 + steer[:, 1] ** 2)
+        directions[pushed] = steer
+        moving[pushed] = dists != 0
+        scales[pushed] = np.divide(1, dists, out=np.zeros_like(dists),
+                                   where=dists != 0)
 
 
 class ScrollController(Controller):
@@ -148,12 +349,17 @@ class ScrollController(Controller):
         """
         super().__init__(game, game.all_sprites)
 
-    def update(self):
+    def update(self, dt=constants.TICK):
         """
         Updates all sprite positions to scroll as the player moves vertically
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
         """
+        scroll = -self.game.player.current_direction[1]\
+            * self.game.player.speed * dt
         for entity in self.sprite:
-            entity.move((0, -self.game.player.current_direction[1]
-                         * self.game.player.frame_speed))
+            entity.move((0, scroll))
         for obs in self.game.obstacles:
-            obs.update()
+            obs.update(dt=dt)
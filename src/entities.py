@@ -0,0 +1,311 @@
+"""
+Array-backed entity store for Point of No Return
+"""
+import numpy as np
+import src.constants as constants
+
+# Columns of EntityStore.state
+X, Y, DIRECTION_X, DIRECTION_Y, HEALTH, INVINCIBILITY, KNOCKBACK = range(7)
+COLUMNS = KNOCKBACK + 1
+
+
+class EntityStore:
+    """
+    Keeps the numeric state of every sprite in the game in contiguous NumPy
+    arrays, one row per sprite, so systems can work on all of them at once.
+    The rows are the sprites' state, which the sprites read and write through
+    their EntityViews.
+
+    Attributes:
+        ids: an int array, the entity id in each row, or -1 if the row is free
+        state: a float array with a row for each entity and a column for each
+            of X, Y, DIRECTION_X, DIRECTION_Y, HEALTH, INVINCIBILITY and
+            KNOCKBACK
+        _sprites: a list of the sprite in each row, or None if the row is free
+        _entities: a list of the EntityView of each row, or None if the row is
+            free
+        _free: a list of free rows
+        _next_id: an int, the id to give the next entity
+    """
+    def __init__(self, capacity=constants.ENTITY_STORE_CAPACITY):
+        """
+        Initializes an empty store
+
+        Args:
+            capacity: an int, how many rows to allocate up front. The store
+                doubles in size whenever it runs out of rows
+        """
+        self.ids = np.full(capacity, -1, dtype=np.int64)
+        self.state = np.zeros((capacity, COLUMNS))
+        self._sprites = [None] * capacity
+        self._entities = [None] * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+        self._next_id = 0
+
+    def __len__(self):
+        """
+        Returns the number of entities in the store
+        """
+        return len(self._sprites) - len(self._free)
+
+    @property
+    def positions(self):
+        """
+        Returns an N x 2 view of the center position of each row
+        """
+        return self.state[:, X:Y + 1]
+
+    @property
+    def directions(self):
+        """
+        Returns an N x 2 view of the direction of each row
+        """
+        return self.state[:, DIRECTION_X:DIRECTION_Y + 1]
+
+    @property
+    def timers(self):
+        """
+        Returns an N x 2 view of the seconds of invincibility and knockback
+        left in each row
+        """
+        return self.state[:, INVINCIBILITY:KNOCKBACK + 1]
+
+    def allocate(self, sprite, entity=None):
+        """
+        Gives a sprite a row in the store
+
+        Args:
+            sprite: the Sprite to store the state of
+            entity: a detached EntityView with the sprite's state, which is
+                moved into the row. Defaults to None, which starts the row
+                at zero with a new view
+
+        Returns:
+            the EntityView of the sprite's row
+        """
+        if not self._free:
+            self._grow()
+        row = self._free.pop()
+        self.ids[row] = self._next_id
+        self._next_id += 1
+        self._sprites[row] = sprite
+        if entity is None:
+            entity = EntityView()
+        entity.attach(self, row)
+        self._entities[row] = entity
+        return entity
+
+    def release(self, entity):
+        """
+        Frees the row of an entity so it can be reused. The entity keeps its
+        state, detached from the store.
+
+        Args:
+            entity: an EntityView from allocate
+        """
+        row = entity.row
+        entity.detach()
+        self.ids[row] = -1
+        self._sprites[row] = None
+        self._entities[row] = None
+        self._free.append(row)
+
+    def sprites(self, rows):
+        """
+        Finds the sprites stored in some rows
+
+        Args:
+            rows: an iterable of row numbers
+
+        Returns:
+            a list of the sprite in each row
+        """
+        return [self._sprites[row] for row in rows]
+
+    def _grow(self):
+        """
+        Doubles the number of rows in the store
+        """
+        capacity = len(self._sprites)
+        self.ids = np.concatenate((self.ids, np.full(capacity, -1,
+                                                     dtype=np.int64)))
+        self.state = np.concatenate((self.state, np.zeros_like(self.state)))
+        self._sprites.extend([None] * capacity)
+        self._entities.extend([None] * capacity)
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+        # Point the live views at the new array
+        for entity in self._entities[:capacity]:
+            if entity is not None:
+                entity.rebind()
+
+
+class EntityView:
+    """
+    A light handle on the state of one entity. The state is a row of an
+    EntityStore while the entity has one, and the view's own array while it
+    doesn't, so it carries over from one row to the next.
+
+    Attributes:
+        row: an int, the row number in the store, or None while detached
+        _store: the EntityStore that holds the row, or None while detached
+        _data: a memoryview of the state, which reads and writes single
+            values faster than a NumPy view
+    """
+    __slots__ = ('row', '_store', '_data')
+
+    def __init__(self):
+        """
+        Initializes a detached view with all of its state at zero
+        """
+        self.row = None
+        self._store = None
+        self._data = memoryview(np.zeros(COLUMNS))
+
+    @property
+    def id(self):  # pylint: disable=invalid-name
+        """
+        Returns the entity id of the row, or None while detached
+        """
+        if self._store is None:
+            return None
+        return int(self._store.ids[self.row])
+
+    @property
+    def position(self):
+        """
+        Returns the stored sub-pixel center position as a tuple of 2 floats
+        """
+        data = self._data
+        return (data[X], data[Y])
+
+    @position.setter
+    def position(self, position):
+        """
+        Stores a new center position
+
+        Args:
+            position: a tuple of 2 numbers
+        """
+        data = self._data
+        data[X] = position[0]
+        data[Y] = position[1]
+
+    @property
+    def direction(self):
+        """
+        Returns the stored direction as a tuple of 2 floats
+        """
+        data = self._data
+        return (data[DIRECTION_X], data[DIRECTION_Y])
+
+    @direction.setter
+    def direction(self, direction):
+        """
+        Stores a new direction
+
+        Args:
+            direction: a tuple of 2 numbers
+        """
+        data = self._data
+        data[DIRECTION_X] = direction[0]
+        data[DIRECTION_Y] = direction[1]
+
+    @property
+    def health(self):
+        """
+        Returns the stored health
+        """
+        return self._data[HEALTH]
+
+    @health.setter
+    def health(self, health):
+        """
+        Stores a new health
+
+        Args:
+            health: a number
+        """
+        self._data[HEALTH] = health
+
+    @property
+    def invincibility(self):
+        """
+        Returns the stored seconds of invincibility left
+        """
+        return self._data[INVINCIBILITY]
+
+    @invincibility.setter
+    def invincibility(self, seconds):
+        """
+        Stores new seconds of invincibility left
+
+        Args:
+            seconds: a number
+        """
+        self._data[INVINCIBILITY] = seconds
+
+    @property
+    def knockback(self):
+        """
+        Returns the stored seconds of knockback left
+        """
+        return self._data[KNOCKBACK]
+
+    @knockback.setter
+    def knockback(self, seconds):
+        """
+        Stores new seconds of knockback left
+
+        Args:
+            seconds: a number
+        """
+        self._data[KNOCKBACK] = seconds
+
+    @property
+    def timers(self):
+        """
+        Returns the stored seconds of invincibility and knockback left as a
+        tuple of 2 floats
+        """
+        data = self._data
+        return (data[INVINCIBILITY], data[KNOCKBACK])
+
+    @timers.setter
+    def timers(self, timers):
+        """
+        Stores new invincibility and knockback seconds left
+
+        Args:
+            timers: a tuple of 2 numbers, the seconds of invincibility and
+                knockback left
+        """
+        data = self._data
+        data[INVINCIBILITY] = timers[0]
+        data[KNOCKBACK] = timers[1]
+
+    def attach(self, store, row):
+        """
+        Moves the state into a row of a store
+
+        Args:
+            store: the EntityStore that holds the row
+            row: an int, the row number in the store
+        """
+        store.state[row] = self._data
+        self.row = row
+        self._store = store
+        self._data = memoryview(store.state[row])
+
+    def detach(self):
+        """
+        Moves the state out of the store's row into the view's own array
+        """
+        self._data = memoryview(np.array(self._data))
+        self.row = None
+        self._store = None
+
+    def rebind(self):
+        """
+        Points the view at its row again after the store's arrays are replaced
+        """
+        self._data = memoryview(self._store.state[self.row])
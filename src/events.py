@@ -0,0 +1,97 @@
+"""
+Game event queue for Point of No Return
+"""
+from collections import deque, namedtuple
+from enum import IntEnum
+import src.constants as constants
+
+
+class EventType(IntEnum):
+    """
+    The kinds of things that can happen in the game
+    """
+    PLAYER_HIT = 0
+    PLAYER_ATTACK = 1
+    PLAYER_DIED = 2
+    DEMON_HIT = 3
+    DEMON_KILLED = 4
+
+
+# Something that happened in the game: its EventType, the game tick it
+# happened on and the (x, y) center of the sprite it happened to
+Event = namedtuple('Event', 'type tick position')
+
+
+class EventQueue:
+    """
+    Collects what happened in the game since it was last drained, so the view
+    and anything else can react to it without checking every sprite. Only
+    keeps the most recent events if nothing drains it, like in headless runs,
+    but counts every event of each type.
+
+    Attributes:
+        _events: a deque of the Events since the last drain, oldest first
+        _counts: a list of how many events of each type were emitted,
+            indexed by EventType
+        _dropped: an int, how many events were dropped because the queue was
+            full
+    """
+    __slots__ = ('_events', '_counts', '_dropped')
+
+    def __init__(self, capacity=constants.EVENT_QUEUE_SIZE):
+        """
+        Initializes an empty queue
+
+        Args:
+            capacity: an int, the most events to keep between drains
+        """
+        self._events = deque(maxlen=capacity)
+        self._counts = [0] * len(EventType)
+        self._dropped = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    @property
+    def counts(self):
+        """
+        Returns a dict mapping the name of each event type to how many events
+        of that type were emitted, and 'dropped' to how many were dropped
+        """
+        counts = {event_type.name.lower(): self._counts[event_type]
+                  for event_type in EventType}
+        counts['dropped'] = self._dropped
+        return counts
+
+    def emit(self, event_type, tick, position):
+        """
+        Adds an event to the queue
+
+        Args:
+            event_type: the EventType of what happened
+            tick: an int, the game tick it happened on
+            position: a tuple of the (x, y) center of the sprite it happened to
+        """
+        if len(self._events) == self._events.maxlen:
+            self._dropped += 1
+        self._events.append(Event(event_type, tick, position))
+        self._counts[event_type] += 1
+
+    def drain(self):
+        """
+        Takes every event out of the queue
+
+        Returns:
+            a tuple of the Events since the last drain, oldest first
+        """
+        events = tuple(self._events)
+        self._events.clear()
+        return events
+
+    def clear(self):
+        """
+        Forgets the events since the last drain and the counts
+        """
+        self._events.clear()
+        self._counts = [0] * len(EventType)
+        self._dropped = 0
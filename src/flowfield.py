@@ -0,0 +1,244 @@
+"""
+Flow field pathfinding for the demons in Point of No Return
+"""
+import math
+import numpy as np
+import pygame
+import src.constants as constants
+
+# The (column, row) offsets of the 8 neighbours of a cell, and the unit
+# direction towards each of them
+NEIGHBOURS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1),
+              (1, 1))
+_NEIGHBOUR_DIRECTIONS = np.array([(dx / math.hypot(dx, dy),
+                                   dy / math.hypot(dx, dy))
+                                  for dx, dy in NEIGHBOURS])
+# Distance given to cells the player can't be reached from
+_UNREACHABLE = np.iinfo(np.int32).max // 2
+
+
+class FlowField:  # pylint: disable=too-many-instance-attributes
+    """
+    A grid over the screen and the ring demons spawn in, holding the way to
+    step from each cell to reach the player around the obstacles. It is only
+    rebuilt when the player moves to another cell or the obstacles move, and
+    any number of demons can look up their direction in it in constant time.
+    Cells with a path to the player as short as the straight line have no
+    direction, so the demons there keep heading straight at the player.
+
+    Attributes:
+        _game: the Game with the player and obstacles to path around
+        _cell_size: an int, the width of a cell in pixels
+        _origin: a tuple of the (x, y) screen position of the grid's top left
+        _shape: a tuple of the (rows, columns) in the grid
+        _target: a tuple of the (row, column) of the player's cell, or None
+            before the field is first built
+        _blocked: a boolean array, whether each cell is too close to the base
+            of an obstacle to pass through
+        _distances: an int array, how many steps each cell is from the player,
+            or -1 if the player can't be reached from it
+        _flow: an array of the unit (x, y) direction to step from each cell,
+            or (0, 0) for cells where heading straight for the player is fine
+        _builds: an int, how many times the field has been built
+    """
+    def __init__(self, game, cell_size=constants.FLOW_CELL_SIZE):
+        """
+        Initializes the field, which is built the first time it is updated
+
+        Args:
+            game: the Game with the player and obstacles to path around
+            cell_size: an int, the width of a cell in pixels
+        """
+        margin = constants.DEMON_MAX_SPAWN_DIST
+        self._game = game
+        self._cell_size = cell_size
+        self._origin = (-margin, -margin)
+        self._shape = (math.ceil((constants.SCREEN_HEIGHT + 2 * margin)
+                                 / cell_size),
+                       math.ceil((constants.SCREEN_WIDTH + 2 * margin)
+                                 / cell_size))
+        self._target = None
+        self._blocked = np.zeros(self._shape, dtype=bool)
+        self._distances = np.full(self._shape, -1, dtype=np.int32)
+        self._flow = np.zeros(self._shape + (2,))
+        self._builds = 0
+
+    @property
+    def shape(self):
+        """
+        Returns a tuple of the (rows, columns) in the grid
+        """
+        return self._shape
+
+    @property
+    def distances(self):
+        """
+        Returns an int array of how many steps each cell is from the player,
+        or -1 if the player can't be reached from it
+        """
+        return self._distances
+
+    @property
+    def builds(self):
+        """
+        Returns how many times the field has been built
+        """
+        return self._builds
+
+    def cell(self, position):
+        """
+        Finds the cell a position is in
+
+        Args:
+            position: a tuple of an (x, y) screen position
+
+        Returns:
+            a tuple of the (row, column) of the cell, which may be outside the
+            grid
+        """
+        return (math.floor((position[1] - self._origin[1]) / self._cell_size),
+                math.floor((position[0] - self._origin[0]) / self._cell_size))
+
+    def update(self):
+        """
+        Rebuilds the field if the player moved to another cell or the
+        obstacles moved since it was last built
+        """
+        rows, cols = self._shape
+        row, col = self.cell(self._game.player.rect.center)
+        target = (min(max(row, 0), rows - 1), min(max(col, 0), cols - 1))
+        blocked = self._blocked_cells()
+        blocked[target] = False
+        if target != self._target or not np.array_equal(blocked,
+                                                        self._blocked):
+            self._target = target
+            self._blocked = blocked
+            self._build()
+
+    def direction(self, position):
+        """
+        Looks up the way a demon at a position should step
+
+        Args:
+            position: a tuple of the demon's (x, y) center
+
+        Returns:
+            a tuple of the unit (x, y) direction to step, or None if the demon
+            should head straight for the player
+        """
+        row, col = self.cell(position)
+        if not (0 <= row < self._shape[0] and 0 <= col < self._shape[1]):
+            return None
+        flow = self._flow[row, col]
+        if not flow.any():
+            return None
+        return (float(flow[0]), float(flow[1]))
+
+    def sample(self, positions):
+        """
+        Looks up the way demons at some positions should step
+
+        Args:
+            positions: an N x 2 array of the demons' (x, y) centers
+
+        Returns:
+            an N x 2 array of the unit (x, y) direction each demon should step,
+            or (0, 0) for the ones that should head straight for the player
+        """
+        cells = np.floor((positions[:, ::-1] - self._origin[::-1])
+                         / self._cell_size).astype(np.intp)
+        inside = np.all((cells >= 0) & (cells < self._shape), axis=1)
+        flow = np.zeros((len(positions), 2))
+        flow[inside] = self._flow[cells[inside, 0], cells[inside, 1]]
+        return flow
+
+    def _blocked_cells(self):
+        """
+        Finds the cells too close to the base of an obstacle to pass through
+
+        Returns:
+            a boolean array, True for each blocked cell
+        """
+        blocked = np.zeros(self._shape, dtype=bool)
+        clearance = 2 * constants.FLOW_CLEARANCE
+        for obs in self._game.obstacles:
+            base = pygame.Rect(obs.rect.left,
+                               obs.rect.bottom - constants.OBSTACLE_BASE_HEIGHT,
+                               obs.rect.width, constants.OBSTACLE_BASE_HEIGHT)
+            base.inflate_ip(clearance, clearance)
+            top, left = self.cell(base.topleft)
+            bottom, right = self.cell(base.bottomright)
+            blocked[max(top, 0):max(bottom + 1, 0),
+                    max(left, 0):max(right + 1, 0)] = True
+        return blocked
+
+    def _build(self):
+        """
+        Finds how many steps every cell is from the player, then points each
+        cell that has to detour at its neighbour closest to the player
+        """
+        self._builds += 1
+        self._distances = self._spread()
+        target_row, target_col = self._target
+        row_index, col_index = np.indices(self._shape)
+        # Ties go to the neighbour nearest the player in a straight line
+        straight = np.hypot(row_index - target_row, col_index - target_col)
+        score = np.where(self._distances >= 0,
+                         self._distances + straight / (straight.max() + 1),
+                         _UNREACHABLE)
+        best, reachable = self._best_neighbours(score)
+
+        # Only cells whose way to the player is longer than a straight line,
+        # or that are blocked themselves, need to follow the field
+        steps = np.maximum(np.abs(row_index - target_row),
+                           np.abs(col_index - target_col))
+        detour = reachable & ((self._distances > steps) | self._blocked)
+        self._flow = np.where(detour[..., np.newaxis],
+                              _NEIGHBOUR_DIRECTIONS[best], 0.0)
+
+    def _spread(self):
+        """
+        Grows a wavefront out from the player's cell around the blocked cells
+
+        Returns:
+            an int array of how many steps each cell is from the player, or
+            -1 if the player can't be reached from it
+        """
+        distances = np.full(self._shape, -1, dtype=np.int32)
+        distances[self._target] = 0
+        open_cells = ~self._blocked
+        frontier = np.zeros(self._shape, dtype=bool)
+        frontier[self._target] = True
+        step = 0
+        while frontier.any():
+            step += 1
+            # Grow the frontier to its 8 neighbours, rows then columns
+            grown = frontier.copy()
+            grown[1:] |= frontier[:-1]
+            grown[:-1] |= frontier[1:]
+            spread = grown.copy()
+            spread[:, 1:] |= grown[:, :-1]
+            spread[:, :-1] |= grown[:, 1:]
+            frontier = spread & open_cells & (distances < 0)
+            distances[frontier] = step
+        return distances
+
+    def _best_neighbours(self, score):
+        """
+        Finds the neighbour of each cell with the lowest score
+
+        Args:
+            score: a float array of each cell's score, _UNREACHABLE for cells
+                that can't be stepped to
+
+        Returns:
+            a tuple of an int array of the index in NEIGHBOURS of each cell's
+            best neighbour, and a boolean array of whether it can be stepped to
+        """
+        rows, cols = self._shape
+        padded = np.pad(score, 1, constant_values=_UNREACHABLE)
+        neighbours = np.stack([padded[1 + dy:1 + dy + rows,
+                                      1 + dx:1 + dx + cols]
+                               for dx, dy in NEIGHBOURS])
+        return neighbours.argmin(axis=0),\
+            neighbours.min(axis=0) < _UNREACHABLE
@@ -1,12 +1,18 @@
 """
 Point of No Return Game class
 """
+import hashlib
 import math
 import random
-import pygame
 import src.constants as constants
+import src.profiler as profiler
 import src.sprites as sprites
 import src.utils as utils
+from src.entities import EntityStore
+from src.events import EventQueue, EventType
+from src.groups import SpatialGroup, YSortedGroup
+from src.pool import DemonPool
+from src.spawner import SpawnDirector
 
 
 class Game:  # pylint: disable=too-many-instance-attributes
@@ -16,115 +22,173 @@ class Game:  # pylint: disable=too-many-instance-attributes
     Attributes:
         running: a boolean, True if the game is currently running, False if not
         paused: a boolean, True if the game is paused, False if not
+        entities: an EntityStore with the state of every sprite in the game
+        events: an EventQueue of what happened in the game since the view
+            last drained it
         player: a Player sprite for the player in the game
-        demons: a LayeredUpdates Sprite Group of demons
-        obstacles: a LayeredUpdates Sprite Group of obstacles
-        all_sprites: a LayeredUpdates Sprite Group of all sprites in the game
+        demons: a SpatialGroup of demons
+        demon_pool: a DemonPool that spawns and keeps the demons
+        obstacles: a SpatialGroup of obstacles
+        all_sprites: a YSortedGroup of all sprites in the game, in draw order
         score: an int, tracks the player's score
         demons_killed: an int, tracks how many demons the player has killed
+        random: a Random that all of the game's random choices are made or
+            seeded with
+        ticks: an int, how many times the game has been updated since it
+            started
+        restarts: an int, how many times the game has been restarted
+        spawn_ticks: an int, how many ticks between demon waves, or None if
+            waves are spawned from outside the game
+        spawner: a SpawnDirector that spawns the demons in waves
+        _obstacle_pool: a list of despawned Obstacles to reuse for new
+            obstacles
     """
-    def __init__(self):
+    def __init__(self, seed=None, spawn_ticks=None):
         """
         Initializes this instance of the game
+
+        Args:
+            seed: the seed for the game's random choices. Defaults to None,
+                which seeds from the system
+            spawn_ticks: an int, how many ticks between demon waves. Defaults
+                to None, which leaves starting waves to the caller (e.g. a
+                pygame timer)
         """
+        self.random = random.Random(seed)
+        self.ticks = 0
+        self.restarts = 0
+        self.spawn_ticks = spawn_ticks
         self.running = False
         self.paused = False
+        self.entities = EntityStore()
+        self.events = EventQueue()
         self.player = sprites.Player(self)
-        self.demons = pygame.sprite.LayeredUpdates()
-        self.obstacles = pygame.sprite.LayeredUpdates()
-        self.all_sprites = pygame.sprite.LayeredUpdates()
+        self.demons = SpatialGroup()
+        self.obstacles = SpatialGroup()
+        self.all_sprites = YSortedGroup()
         self.all_sprites.add(self.player)
+        self.demon_pool = DemonPool(self)
+        self.spawner = SpawnDirector(self)
+        self._obstacle_pool = []
         self.create_new_obstacle(True)
         self.score = 0
         self.demons_killed = 0
 
     def create_new_demon(self):
         """
-        Spawns a new demon in the game at a random location outside the screen.
+        Spawns a new demon from the demon pool at a random location outside
+        the screen, unless the most demons allowed are already alive.
         """
-        min_x = constants.SCREEN_WIDTH/2 + constants.DEMON_MIN_SPAWN_DIST
-        min_y = constants.SCREEN_HEIGHT/2 + constants.DEMON_MIN_SPAWN_DIST
-        dist = constants.DEMON_MAX_SPAWN_DIST - constants.DEMON_MIN_SPAWN_DIST
-
-        theta = random.uniform(-math.pi, math.pi)
-        max_theta = math.atan(min_y / min_x)
-        is_x = abs(theta) < max_theta or abs(theta) > math.pi - max_theta
-        trig = abs(math.cos(theta) if is_x else math.sin(theta))
-
-        min_rad = (min_x if is_x else min_y) / trig
-        rad = random.uniform(min_rad, min_rad + dist / trig)
-        spawn_pos = (rad * math.cos(theta) + constants.SCREEN_WIDTH / 2,
-                     rad * math.sin(theta) + constants.SCREEN_HEIGHT / 2)
-
-        demon = sprites.Demon(self, spawn_pos=spawn_pos)
-        self.demons.add(demon)
-        self.all_sprites.add(demon)
+        self.spawner.spawn(1)
 
     def create_new_obstacle(self, is_top):
         """
-        Spawns a new obstacle in the game
+        Spawns a new obstacle in the game, reusing a despawned obstacle if
+        there is one
 
         Args:
             is_top: a boolean, True if the obstacles should spawn above the
                 screen, False if it should spawn below
         """
-        y_val = -random.randint(constants.OBSTACLE_MIN_SPAWN_DIST,
-                                constants.OBSTACLE_MAX_SPAWN_DIST)
+        y_val = -self.random.randint(constants.OBSTACLE_MIN_SPAWN_DIST,
+                                     constants.OBSTACLE_MAX_SPAWN_DIST)
         if not is_top:
             y_val = constants.SCREEN_HEIGHT - y_val
 
-        obs = sprites.Obstacle(self, (random.randint(0, constants.SCREEN_WIDTH),
-                                      y_val))
+        spawn_pos = (self.random.randint(0, constants.SCREEN_WIDTH), y_val)
+        if self._obstacle_pool:
+            obs = self._obstacle_pool.pop()
+            obs.reset(spawn_pos)
+        else:
+            obs = sprites.Obstacle(self, spawn_pos)
         self.obstacles.add(obs)
         self.all_sprites.add(obs)
 
+    def despawn_far_obstacles(self):
+        """
+        Removes obstacles that are too far above or below the player and keeps
+        them to be reused by create_new_obstacle
+        """
+        for obs in self.obstacles.sprites():
+            if abs(obs.rect.centery - self.player.rect.centery)\
+                    > constants.OBSTACLE_DESPAWN_DIST:
+                obs.kill()
+                self._obstacle_pool.append(obs)
+
     def restart(self):
         """
         Resets game state and restarts the game
         """
         self.player.reset()
-        self.demons.empty()
+        for demon in self.demons.sprites():
+            self.demon_pool.release(demon)
+        self._obstacle_pool.extend(self.obstacles)
         self.obstacles.empty()
         self.all_sprites.empty()
         self.all_sprites.add(self.player)
         self.create_new_obstacle(True)
         self.score = 0
+        self.ticks = 0
+        self.restarts += 1
+        self.spawner.reset()
+        self.events.clear()
         self.running = True
         self.paused = False
 
     def update(self):
         """
         Updates the game state, including checking attacks against demons and
-        damage to the player. Also creates new obstacles as the player moves
-        forward or backward on the map.
+        damage to the player, and adds kills and the player's death to the
+        event queue. Also creates new obstacles as the player moves
+        forward or backward on the map and removes the ones left behind, and
+        spawns a wave of demons every spawn_ticks ticks.
         """
+        self.ticks += 1
         self.demons_killed = 0
 
-        collisions = utils.spritecollide(self.player, self.demons)
-        for demon in collisions:
-            if utils.touching_sword(self.player, demon):
-                demon.damage(self.player.current_facing.value)
-                if demon.health <= 0:
-                    self.demons_killed += 1
-                    demon.kill()
-            else:
-                if demon.current_direction == (0, 0):
-                    self.player.damage(demon.current_facing.value)
+        with profiler.PROFILER.span('collision'):
+            collisions = utils.spritecollide(self.player, self.demons)
+            for demon in collisions:
+                if utils.touching_sword(self.player, demon):
+                    demon.damage(self.player.current_facing.value)
+                    if demon.health <= 0:
+                        self.demons_killed += 1
+                        self.events.emit(EventType.DEMON_KILLED, self.ticks,
+                                         demon.rect.center)
+                        self.demon_pool.release(demon)
                 else:
-                    self.player.damage(demon.current_direction)
-            if self.player.health <= 0:
-                self.player.kill()
+                    if demon.current_direction == (0, 0):
+                        self.player.damage(demon.current_facing.value)
+                    else:
+                        self.player.damage(demon.current_direction)
+                if self.player.health <= 0 and self.player.alive():
+                    self.player.kill()
+                    self.events.emit(EventType.PLAYER_DIED, self.ticks,
+                                     self.player.rect.center)
         self.score += self.demons_killed * 100
 
-        for group in (self.all_sprites, self.demons, self.obstacles):
-            for entity in group:
-                group.change_layer(entity, entity.layer)
-
+        self.despawn_far_obstacles()
         if self.player.current_direction[1] < 0\
                 and self.player.layer - constants.OBSTACLE_SPAWN_TRIGGER_DIST\
-                < self.obstacles.get_bottom_layer():
+                < min((obs.layer for obs in self.obstacles),
+                      default=math.inf):
             self.create_new_obstacle(True)
         elif self.player.current_direction[1] > 0\
                 and self.player.layer + constants.OBSTACLE_SPAWN_TRIGGER_DIST\
-                > self.obstacles.get_top_layer():
+                > max((obs.layer for obs in self.obstacles),
+                      default=-math.inf):
             self.create_new_obstacle(False)
+
+        self.spawner.update()
+
+    def state_hash(self):
+        """
+        Returns a hex string hash of the game state, for checking that two runs
+        of the game ended in the same state
+        """
+        state = [self.ticks, self.score, self.player.health,
+                 tuple(self.player.rect)]
+        state.extend((tuple(demon.rect), demon.health)
+                     for demon in self.demons)
+        state.extend(tuple(obs.rect) for obs in self.obstacles)
+        return hashlib.sha256(repr(state).encode()).hexdigest()
@@ -0,0 +1,296 @@
+"""
+Sprite groups for Point of No Return
+"""
+from operator import attrgetter
+import pygame
+import src.constants as constants
+import src.profiler as profiler
+
+
+class SpatialHash:
+    """
+    A uniform grid that buckets sprites by the cells their rects cover
+
+    Attributes:
+        _cell_size: an int, the width and height of each cell in pixels
+        _cells: a dict mapping (column, row) tuples to dicts whose keys are the
+            sprites in that cell (used as an insertion-ordered set)
+        _sprite_cells: a dict mapping each sprite to the (left, top, right,
+            bottom) range of cells it is in
+    """
+    def __init__(self, cell_size=constants.COLLISION_CELL_SIZE):
+        """
+        Initializes an empty spatial hash
+
+        Args:
+            cell_size: an int, the width and height of each cell in pixels
+        """
+        self._cell_size = cell_size
+        self._cells = {}
+        self._sprite_cells = {}
+
+    def __len__(self):
+        """
+        Returns the number of sprites in the hash
+        """
+        return len(self._sprite_cells)
+
+    def cell_range(self, rect):
+        """
+        Finds the cells that a rect covers
+
+        Args:
+            rect: a Rect to find the cells of
+
+        Returns:
+            a tuple of 4 ints, the (left, top, right, bottom) range of cells,
+            inclusive
+        """
+        size = self._cell_size
+        return (rect.left // size, rect.top // size,
+                max(rect.left, rect.right - 1) // size,
+                max(rect.top, rect.bottom - 1) // size)
+
+    def insert(self, sprite):
+        """
+        Adds a sprite to every cell its rect covers
+
+        Args:
+            sprite: a Sprite with a rect
+        """
+        cells = self.cell_range(sprite.rect)
+        self._sprite_cells[sprite] = cells
+        for col in range(cells[0], cells[2] + 1):
+            for row in range(cells[1], cells[3] + 1):
+                self._cells.setdefault((col, row), {})[sprite] = None
+
+    def remove(self, sprite):
+        """
+        Removes a sprite from the hash if it is in it
+
+        Args:
+            sprite: a Sprite to remove
+        """
+        cells = self._sprite_cells.pop(sprite, None)
+        if cells is None:
+            return
+        for col in range(cells[0], cells[2] + 1):
+            for row in range(cells[1], cells[3] + 1):
+                bucket = self._cells[(col, row)]
+                del bucket[sprite]
+                if not bucket:
+                    del self._cells[(col, row)]
+
+    def update(self, sprite):
+        """
+        Moves a sprite to the cells its rect currently covers. Does nothing if
+        the sprite hasn't changed cells.
+
+        Args:
+            sprite: a Sprite already in the hash
+        """
+        if self._sprite_cells.get(sprite) == self.cell_range(sprite.rect):
+            return
+        self.remove(sprite)
+        self.insert(sprite)
+
+    def query(self, rect):
+        """
+        Finds the sprites in any cell that a rect covers
+
+        Args:
+            rect: a Rect to find nearby sprites of
+
+        Returns:
+            a list of candidate sprites that could be touching rect
+        """
+        cells = self.cell_range(rect)
+        if cells[0] == cells[2] and cells[1] == cells[3]:
+            return list(self._cells.get((cells[0], cells[1]), ()))
+        candidates = {}
+        for col in range(cells[0], cells[2] + 1):
+            for row in range(cells[1], cells[3] + 1):
+                bucket = self._cells.get((col, row))
+                if bucket:
+                    candidates.update(bucket)
+        return list(candidates)
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """
+    A sprite group that keeps its sprites in a spatial hash so collision checks
+    only test nearby sprites
+
+    Attributes:
+        _hash: a SpatialHash of the sprites in the group
+        _candidates: an int, how many sprites have been tested for collisions
+        _hits: an int, how many of the tested sprites were colliding
+    """
+    def __init__(self, *sprites, cell_size=constants.COLLISION_CELL_SIZE):
+        """
+        Initializes the group
+
+        Args:
+            sprites: any Sprites to add to the group
+            cell_size: an int, the width and height of each hash cell in pixels
+        """
+        self._hash = SpatialHash(cell_size)
+        self._candidates = 0
+        self._hits = 0
+        super().__init__(*sprites)
+
+    @property
+    def stats(self):
+        """
+        Returns a dict with how many candidates have been tested for
+        collisions and how many of them were hits
+        """
+        return {'candidates': self._candidates, 'hits': self._hits}
+
+    def reset_stats(self):
+        """
+        Resets the collision counters
+        """
+        self._candidates = 0
+        self._hits = 0
+
+    def add_internal(self, sprite, layer=None):
+        """
+        Adds a sprite to the group and the spatial hash
+
+        Args:
+            sprite: a Sprite to add
+            layer: unused, for compatibility with the other pygame groups
+        """
+        super().add_internal(sprite, layer)
+        self._hash.insert(sprite)
+
+    def remove_internal(self, sprite):
+        """
+        Removes a sprite from the group and the spatial hash
+
+        Args:
+            sprite: a Sprite to remove
+        """
+        super().remove_internal(sprite)
+        self._hash.remove(sprite)
+
+    def reindex(self, sprite):
+        """
+        Updates the position of a sprite in the group after it moves
+
+        Args:
+            sprite: a Sprite in the group
+        """
+        self._hash.update(sprite)
+
+    def query(self, rect):
+        """
+        Finds the sprites in the group that could be touching a rect
+
+        Args:
+            rect: a Rect to find nearby sprites of
+
+        Returns:
+            a list of candidate sprites
+        """
+        return self._hash.query(rect)
+
+    def collide(self, sprite):
+        """
+        Finds the sprites in the group whose masks overlap a sprite's mask
+
+        Args:
+            sprite: a sprite with a rect and a mask
+
+        Returns:
+            a list of sprites from the group that are colliding with sprite
+        """
+        collisions = []
+        for candidate in self._hash.query(sprite.rect):
+            self._candidates += 1
+            if sprite.rect.colliderect(candidate.rect) and\
+                    pygame.sprite.collide_mask(sprite, candidate) is not None:
+                collisions.append(candidate)
+        self._hits += len(collisions)
+        return collisions
+
+
+class YSortedGroup(pygame.sprite.Group):
+    """
+    A sprite group that iterates over its sprites in order of their layer, so
+    sprites lower on the screen are drawn on top
+
+    Sprites tell the group when their layer changes, and the group only sorts
+    again before it is next iterated. Between frames the order barely changes,
+    so the sort runs over an almost sorted list, which takes linear time.
+
+    Attributes:
+        _order: a list of the sprites in the group, sorted by layer when
+            _sorted is True. May still hold removed sprites, and sprites that
+            were removed and added again twice, while _stale is True
+        _sorted: a boolean, whether _order is sorted by the current layers
+        _stale: a boolean, whether _order still holds removed sprites
+    """
+    _layer_of = attrgetter('layer')
+
+    def __init__(self, *sprites):
+        """
+        Initializes the group
+
+        Args:
+            sprites: any Sprites to add to the group
+        """
+        self._order = []
+        self._sorted = True
+        self._stale = False
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        """
+        Adds a sprite to the group
+
+        Args:
+            sprite: a Sprite to add
+            layer: unused, for compatibility with the other pygame groups
+        """
+        super().add_internal(sprite, layer)
+        self._order.append(sprite)
+        self._sorted = False
+
+    def remove_internal(self, sprite):
+        """
+        Removes a sprite from the group. It is dropped from the draw order the
+        next time the group is iterated
+
+        Args:
+            sprite: a Sprite to remove
+        """
+        super().remove_internal(sprite)
+        self._stale = True
+
+    def reindex(self, sprite):  # pylint: disable=unused-argument
+        """
+        Marks the draw order as out of date after a sprite's layer changes
+
+        Args:
+            sprite: a Sprite in the group whose layer changed
+        """
+        self._sorted = False
+
+    def sprites(self):
+        """
+        Returns a list of the sprites in the group, sorted by layer. Sprites on
+        the same layer keep the order they were in before
+        """
+        if self._stale:
+            # Sprites removed and added again are in the list twice
+            spritedict = self.spritedict
+            self._order = list(dict.fromkeys(
+                sprite for sprite in self._order if sprite in spritedict))
+            self._stale = False
+        if not self._sorted:
+            with profiler.PROFILER.span('layers'):
+                self._order.sort(key=self._layer_of)
+            self._sorted = True
+        return list(self._order)
@@ -0,0 +1,221 @@
+"""
+Player input sources for Point of No Return, including recording and replaying
+the key state of every tick
+"""
+import random
+import struct
+import zlib
+import src.constants as constants
+from src.constants import MOVES
+
+# Replay files start with this, followed by the header and the compressed
+# key states
+REPLAY_MAGIC = b'PNR1'
+REPLAY_HEADER = struct.Struct('<qII')
+# The keys in the order of their bits in a recorded key state
+RECORDED_KEYS = tuple(MOVES.values())
+
+
+def seed_fits(seed):
+    """
+    Finds if a seed fits in the signed 64-bit field of a replay file header
+
+    Args:
+        seed: an int, or None for a seed that is picked later
+
+    Returns:
+        a boolean, True iff the seed can be recorded
+    """
+    return seed is None or -2 ** 63 <= seed < 2 ** 63
+
+
+def idle_keys():
+    """
+    Returns a key state with no keys pressed
+    """
+    return {key: False for key in RECORDED_KEYS}
+
+
+def encode_keys(pressed_keys):
+    """
+    Packs the state of the keys in MOVES into an int
+
+    Args:
+        pressed_keys: a key state, indexable by pygame key constants
+
+    Returns:
+        an int with one bit set for each pressed key
+    """
+    bits = 0
+    for index, key in enumerate(RECORDED_KEYS):
+        if pressed_keys[key]:
+            bits |= 1 << index
+    return bits
+
+
+def decode_keys(bits):
+    """
+    Unpacks a key state made by encode_keys
+
+    Args:
+        bits: an int with one bit set for each pressed key
+
+    Returns:
+        a dict mapping the keys in MOVES to whether they're pressed
+    """
+    return {key: bool(bits & (1 << index))
+            for index, key in enumerate(RECORDED_KEYS)}
+
+
+class RandomKeys:  # pylint: disable=too-few-public-methods
+    """
+    Presses random keys, holding each choice for a number of ticks
+
+    Attributes:
+        _rng: a Random to choose keys with
+        _hold: an int, how many ticks to hold each choice for
+        _ticks: an int, how many more ticks to hold the current choice
+        _pressed: a dict mapping the keys in MOVES to whether they're pressed
+    """
+    def __init__(self, seed=None, hold=constants.FRAME_RATE // 2):
+        """
+        Initializes the random key presser
+
+        Args:
+            seed: the seed for choosing keys. Defaults to None, which seeds
+                from the system
+            hold: an int, how many ticks to hold each choice for
+        """
+        self._rng = random.Random(seed)
+        self._hold = hold
+        self._ticks = 0
+        self._pressed = idle_keys()
+
+    def __call__(self):
+        """
+        Returns the key state for the current tick
+        """
+        if self._ticks == 0:
+            self._ticks = self._hold
+            for key in self._pressed:
+                self._pressed[key] = self._rng.random() < 0.25
+        self._ticks -= 1
+        return self._pressed
+
+
+class InputRecorder:
+    """
+    Passes key states through from another input source while recording them
+
+    Attributes:
+        seed: the seed of the game being recorded
+        spawn_ticks: an int, how many ticks between demon spawns in the game
+            being recorded
+        _get_pressed: a function that returns the key state to record
+        _states: a list of the recorded key states as ints
+    """
+    def __init__(self, get_pressed, seed, spawn_ticks):
+        """
+        Initializes the recorder
+
+        Args:
+            get_pressed: a function that returns the key state to record
+            seed: an int, the seed of the game being recorded
+            spawn_ticks: an int, how many ticks between demon spawns in the
+                game being recorded
+        """
+        self.seed = seed
+        self.spawn_ticks = spawn_ticks
+        self._get_pressed = get_pressed
+        self._states = []
+
+    def __len__(self):
+        """
+        Returns the number of ticks recorded
+        """
+        return len(self._states)
+
+    def __call__(self):
+        """
+        Returns the key state for the current tick and records it
+        """
+        pressed_keys = self._get_pressed()
+        self._states.append(encode_keys(pressed_keys))
+        return pressed_keys
+
+    def save(self, path):
+        """
+        Writes the recording to a file
+
+        Args:
+            path: a string, the file to write
+        """
+        states = struct.pack(f'<{len(self._states)}H', *self._states)
+        with open(path, 'wb') as replay:
+            replay.write(REPLAY_MAGIC)
+            replay.write(REPLAY_HEADER.pack(self.seed, self.spawn_ticks,
+                                            len(self._states)))
+            replay.write(zlib.compress(states))
+
+
+class InputReplay:
+    """
+    Plays back key states from a recording, one tick per call. Returns no keys
+    pressed once the recording runs out.
+
+    Attributes:
+        seed: an int, the seed of the recorded game
+        spawn_ticks: an int, how many ticks between demon spawns in the
+            recorded game
+        _states: a tuple of the recorded key states as ints
+        _tick: an int, the next tick to play back
+    """
+    def __init__(self, seed, spawn_ticks, states):
+        """
+        Initializes the replay
+
+        Args:
+            seed: an int, the seed of the recorded game
+            spawn_ticks: an int, how many ticks between demon spawns in the
+                recorded game
+            states: a sequence of key states as ints from encode_keys
+        """
+        self.seed = seed
+        self.spawn_ticks = spawn_ticks
+        self._states = tuple(states)
+        self._tick = 0
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a recording from a file written by InputRecorder.save
+
+        Args:
+            path: a string, the file to read
+
+        Returns:
+            an InputReplay of the recording
+        """
+        with open(path, 'rb') as replay:
+            data = replay.read()
+        if not data.startswith(REPLAY_MAGIC):
+            raise ValueError(f'{path} is not a replay file')
+        start = len(REPLAY_MAGIC)
+        seed, spawn_ticks, ticks = REPLAY_HEADER.unpack_from(data, start)
+        states = zlib.decompress(data[start + REPLAY_HEADER.size:])
+        return cls(seed, spawn_ticks, struct.unpack(f'<{ticks}H', states))
+
+    def __len__(self):
+        """
+        Returns the number of ticks in the recording
+        """
+        return len(self._states)
+
+    def __call__(self):
+        """
+        Returns the recorded key state for the next tick
+        """
+        if self._tick >= len(self._states):
+            return idle_keys()
+        self._tick += 1
+        return decode_keys(self._states[self._tick - 1])
@@ -0,0 +1,95 @@
+"""
+Darkness overlay for Point of No Return, with the flashlight's light cut out
+"""
+import pygame
+import src.constants as constants
+
+
+class Lighting:
+    """
+    Keeps one darkness overlay for the whole screen and moves the flashlight's
+    light around in it, without allocating any surfaces once every flashlight
+    frame has been seen
+
+    Attributes:
+        _darkness: an int, the alpha of the darkness outside the light
+        _light_diff: an int, how much alpha the light takes away from the
+            darkness
+        _overlay: a screen sized SRCALPHA Surface of darkness with the light
+            cut out
+        _cutouts: a dict mapping flashlight frame Surfaces to the Surface of
+            alpha that frame takes away from the darkness
+        _light: a tuple of the flashlight frame and the (x, y) position of the
+            light currently cut out of the overlay, or None if there isn't one
+    """
+    def __init__(self, size=constants.SCREEN_SIZE,
+                 darkness=constants.DARKNESS, light_diff=constants.LIGHT_DIFF):
+        """
+        Initializes the overlay with no light cut out
+
+        Args:
+            size: a tuple of two ints, the size of the overlay in pixels
+            darkness: an int from 0-255, the alpha of the darkness
+            light_diff: an int from 0-255, how much alpha the light takes away
+        """
+        self._darkness = darkness
+        self._light_diff = light_diff
+        self._overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self._overlay.fill((0, 0, 0, darkness))
+        self._cutouts = {}
+        self._light = None
+
+    @property
+    def overlay(self):
+        """
+        Returns the darkness overlay Surface
+        """
+        return self._overlay
+
+    @property
+    def cached_frames(self):
+        """
+        Returns the number of flashlight frames with a cutout
+        """
+        return len(self._cutouts)
+
+    def cutout(self, frame):
+        """
+        Returns the alpha a flashlight frame takes away from the darkness,
+        making it the first time the frame is seen
+
+        Args:
+            frame: a Surface, a frame of the flashlight animation
+        """
+        cutout = self._cutouts.get(frame)
+        if cutout is None:
+            cutout = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
+            cutout.fill((0, 0, 0, self._light_diff))
+            cutout.blit(frame, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+            self._cutouts[frame] = cutout
+        return cutout
+
+    def update(self, frame, rect):
+        """
+        Moves the light in the overlay to a new frame and position. Fills the
+        darkness back in where the old light was and cuts out the new one, only
+        if either of them changed.
+
+        Args:
+            frame: a Surface, the flashlight's current frame
+            rect: a Rect, where the flashlight is
+
+        Returns:
+            the overlay Surface
+        """
+        light = (frame, rect.topleft)
+        if light == self._light:
+            return self._overlay
+        if self._light is not None:
+            old_frame, old_position = self._light
+            self._overlay.fill((0, 0, 0, self._darkness),
+                               (old_position, old_frame.get_size()))
+        self._overlay.blit(self.cutout(frame), rect.topleft,
+                           special_flags=pygame.BLEND_RGBA_SUB)
+        self._light = light
+        return self._overlay
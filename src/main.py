@@ -1,54 +1,262 @@
 """
 Main class with game loop for Point of No Return
 """
+import argparse
+import contextlib
+import cProfile
+import json
+import random
 import pygame
 import src.constants as constants
-from src.controller import PlayerController, DemonController, ScrollController
+import src.profiler as profiler
+from src.controller import PlayerController
 from src.game import Game
+from src.inputs import InputRecorder, seed_fits
+from src.preloader import Preloader
+from src.simulation import Simulation
 from src.view import GraphicView
 
 
-def main():
+def create_game(seed=None, record=None):
     """
-    Initializes pygame, runs the main game loop
+    Creates the game and the controller for the player
+
+    Args:
+        seed: an int, the seed for a deterministic game. Defaults to None,
+            which makes a game that spawns demons on a timer, unless recording
+        record: a string, the path to record the input of the first run to.
+            Defaults to None, which doesn't record
+
+    Returns:
+        a tuple of the Game, the PlayerController and the InputRecorder, which
+        is None if not recording
     """
-    pygame.init()
-    screen = pygame.display.set_mode(constants.SCREEN_SIZE)
-    game = Game()
-    player = PlayerController(game)
-    demons = DemonController(game)
-    all_sprites = ScrollController(game)
-    view = GraphicView(game, screen)
-    view.setup()
+    # Deterministic games spawn demons by counting ticks instead of on a timer
+    if seed is None and record is None:
+        game = Game()
+        return game, PlayerController(game), None
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    game = Game(seed, constants.DEMON_SPAWN_TICKS)
+    if record is None:
+        return game, PlayerController(game), None
+    recorder = InputRecorder(pygame.key.get_pressed, seed,
+                             constants.DEMON_SPAWN_TICKS)
+    return game, PlayerController(game, recorder), recorder
 
-    pygame.time.set_timer(constants.GameEvent.ADD_DEMON,
-                          constants.DEMON_SPAWN_TIME)
 
-    clock = pygame.time.Clock()
+def handle_events(game):
+    """
+    Handles the pygame events since the last frame
+
+    Args:
+        game: the Game being played
+
+    Returns:
+        a boolean, True if the window was closed
+    """
+    exited = False
+    for event in pygame.event.get():
+        if event.type == pygame.locals.KEYDOWN:
+            if event.key == pygame.locals.K_ESCAPE:
+                game.paused = True
+        elif event.type == pygame.locals.QUIT:
+            game.running = False
+            exited = True
+        elif event.type == constants.GameEvent.ADD_DEMON:
+            game.spawner.spawn_wave()
+    return exited
+
+
+def report_profile(cprofile=None, frames=None, audio=None):
+    """
+    Prints the frame profiler's report, the sound effect counters and the
+    slowest functions, and writes the kept frames to a file
+
+    Args:
+        cprofile: a cProfile.Profile of the run to print the slowest
+            functions of. Defaults to None, which doesn't print them
+        frames: a string, the path to write the kept frames to as CSV, or JSON
+            if it ends in .json. Defaults to None, which doesn't write them
+        audio: a dict of the AudioManager's stats to print. Defaults to None,
+            which doesn't print them
+    """
+    # Only needed on the way out, so it isn't imported at startup
+    import pstats  # pylint: disable=import-outside-toplevel
+    print(profiler.PROFILER.report())
+    if audio is not None:
+        print('sound effects: ' + ', '.join(f'{name} {count}' for name, count
+                                            in audio.items()))
+    if cprofile is not None:
+        cprofile.disable()
+        pstats.Stats(cprofile).sort_stats('cumulative').print_stats(20)
+    if frames is not None:
+        profiler.PROFILER.export(frames)
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line
 
+    Args:
+        argv: a list of command line arguments. Defaults to None, which uses
+            sys.argv
+
+    Returns:
+        the argparse Namespace of the options
+    """
+    parser = argparse.ArgumentParser(description='Play Point of No Return')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed for a deterministic game')
+    parser.add_argument('--record', metavar='PATH',
+                        help='record the input of the first run to a replay '
+                             'file for python -m src.sim --replay')
+    parser.add_argument('--profile', action='store_true',
+                        help='run under cProfile and print the slowest '
+                             'functions and frame stages on exit')
+    parser.add_argument('--frames', metavar='PATH',
+                        help='write the stage timings of recent frames to a '
+                             'CSV file, or JSON if PATH ends in .json, on exit')
+    parser.add_argument('--dirty-rects', action='store_true',
+                        default=constants.DIRTY_RECTS,
+                        help='only redraw the parts of the screen that '
+                             'changed each frame')
+    parser.add_argument('--decoupled', action='store_true',
+                        help='simulate at a fixed tick rate apart from '
+                             'drawing, and draw the sprites between the last '
+                             'two ticks')
+    parser.add_argument('--tick-rate', type=float, default=None,
+                        help='ticks per second to simulate at when '
+                             f'decoupled (defaults to {constants.SIM_TICK_RATE}'
+                             ', or the frame rate when recording)')
+    parser.add_argument('--threaded', action='store_true',
+                        help='simulate on a separate thread, implies '
+                             '--decoupled')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='print the milliseconds each stage of startup '
+                             'took as JSON after the first frame of the start '
+                             'menu, and exit')
+    args = parser.parse_args(argv)
+    if args.record and not seed_fits(args.seed):
+        parser.error('--record needs a --seed that fits in 64 bits')
+    args.decoupled = args.decoupled or args.threaded
+    # Replays always run at the frame rate
+    if args.tick_rate is None:
+        args.tick_rate = constants.FRAME_RATE if args.record\
+            else constants.SIM_TICK_RATE
+    elif args.record and args.decoupled\
+            and args.tick_rate != constants.FRAME_RATE:
+        parser.error('--record only works at a --tick-rate of '
+                     f'{constants.FRAME_RATE}')
+    return args
+
+
+def game_loop(game, view, sim, recorder, args):
+    """
+    Runs the game until the window is closed
+
+    Args:
+        game: the Game being played
+        view: the GraphicView to draw the game with
+        sim: the Simulation that updates the game
+        recorder: the InputRecorder recording the first run, or None if not
+            recording
+        args: the argparse Namespace of the options
+    """
+    clock = pygame.time.Clock()
+    # Deterministic games advance by a fixed tick so replays match, others by
+    # the real time each frame took
+    dt = constants.TICK
+    span = profiler.PROFILER.span
+    restarts = game.restarts
     exited = False
     while not exited:
         if game.running:
-            for event in pygame.event.get():
-                if event.type == pygame.locals.KEYDOWN:
-                    if event.key == pygame.locals.K_ESCAPE:
-                        game.paused = True
-                elif event.type == pygame.locals.QUIT:
+            profiler.PROFILER.start_frame()
+            with sim.lock:
+                with span('events'):
+                    exited = handle_events(game)
+                if not args.decoupled:
+                    sim.step(dt)
+                elif not sim.threaded:
+                    sim.advance(dt)
+
+                if not game.player.alive():
                     game.running = False
-                    exited = True
-                elif event.type == constants.GameEvent.ADD_DEMON:
-                    game.create_new_demon()
 
-            player.update()
-            demons.update()
-            all_sprites.update()
-            game.update()
+                frame = sim.frame() if args.decoupled else None
+                # The menus change the game, so the simulation thread waits
+                # for them to close
+                menu = game.paused or not game.player.alive()
+                # The menus can quit the program, so save the recording
+                # before they open
+                if recorder is not None and (exited or menu):
+                    recorder.save(args.record)
+            with sim.lock if menu else contextlib.nullcontext():
+                with span('draw'):
+                    view.draw(dt, frame)
+                # Stop recording once a menu restarts the game, since replays
+                # only follow the first run
+                if recorder is not None and game.restarts != restarts:
+                    recorder = None
+                    sim.player = PlayerController(game)
+            profiler.PROFILER.end_frame()
+            elapsed = clock.tick(constants.FRAME_RATE) / 1000
+            if game.spawn_ticks is None or args.decoupled:
+                dt = min(elapsed, constants.MAX_TICK)
+
+
+def main(argv=None):
+    """
+    Initializes pygame, runs the main game loop
+
+    Args:
+        argv: a list of command line arguments. Defaults to None, which uses
+            sys.argv
+    """
+    args = parse_args(argv)
+    # Times startup as a single frame, when asked to
+    startup = profiler.Profiler(capacity=1)
+    startup.enabled = args.startup_report
+    startup.start_frame()
+
+    with startup.span('init'):
+        pygame.init()
+        screen = pygame.display.set_mode(constants.SCREEN_SIZE)
+    with startup.span('game'):
+        # Load the media in the background while the start menu shows
+        preloader = Preloader()
+        preloader.start()
+        game, player, recorder = create_game(args.seed, args.record)
+        sim = Simulation(game, player, args.tick_rate)
+    with startup.span('view'):
+        view = GraphicView(game, screen, args.dirty_rects, preloader)
+    with startup.span('menu'):
+        view.setup(loop=not args.startup_report)
+    if args.startup_report:
+        frame = startup.end_frame()
+        print(json.dumps({'total': frame['total'], **frame['spans']}))
+        preloader.finish()
+        return
+
+    if game.spawn_ticks is None:
+        pygame.time.set_timer(constants.GameEvent.ADD_DEMON,
+                              constants.DEMON_SPAWN_TIME)
 
-            if not game.player.alive():
-                game.running = False
+    profiler.PROFILER.enabled = True
+    cprofile = cProfile.Profile() if args.profile else None
+    if cprofile is not None:
+        cprofile.enable()
 
-            view.draw()
-            clock.tick(constants.FRAME_RATE)
+    # The menus exit the program themselves, so report from a finally
+    try:
+        if args.threaded:
+            sim.start()
+        game_loop(game, view, sim, recorder, args)
+    finally:
+        sim.stop()
+        if args.profile or args.frames:
+            report_profile(cprofile, args.frames, view.audio.stats)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,101 @@
+"""
+Object pools for Point of No Return
+"""
+import src.constants as constants
+from src.sprites import Demon
+
+
+class DemonPool:  # pylint: disable=too-many-instance-attributes
+    """
+    Keeps killed demons so they can be respawned instead of building new ones
+
+    Attributes:
+        _game: a Game that the demons belong to
+        _idle: a list of Demons waiting to be respawned
+        _cap: an int, the most idle demons the pool keeps
+        _in_use: an int, how many demons from the pool are currently spawned
+        _high_water: an int, the most demons that have been spawned at once
+        _created: an int, how many demons the pool has built
+        _reused: an int, how many spawns reused an idle demon
+        _dropped: an int, how many killed demons were thrown away because the
+            pool was full
+    """
+    def __init__(self, game, size=constants.DEMON_POOL_SIZE,
+                 cap=constants.DEMON_POOL_CAP):
+        """
+        Initializes the pool and builds its first demons
+
+        Args:
+            game: a Game that the demons belong to
+            size: an int, how many demons to build up front
+            cap: an int, the most idle demons to keep
+        """
+        self._game = game
+        self._cap = cap
+        self._in_use = 0
+        self._high_water = 0
+        self._created = 0
+        self._reused = 0
+        self._dropped = 0
+        self._idle = [self._create() for _ in range(min(size, cap))]
+
+    def __len__(self):
+        """
+        Returns the number of idle demons in the pool
+        """
+        return len(self._idle)
+
+    @property
+    def stats(self):
+        """
+        Returns a dict with the number of idle and spawned demons, the most
+        demons spawned at once, and how many demons were built, reused and
+        dropped
+        """
+        return {'idle': len(self._idle), 'in_use': self._in_use,
+                'high_water': self._high_water, 'created': self._created,
+                'reused': self._reused, 'dropped': self._dropped}
+
+    def acquire(self, spawn_pos):
+        """
+        Gets a demon ready to spawn, reusing an idle demon if there is one
+
+        Args:
+            spawn_pos: a tuple of 2 ints, where to spawn the demon
+
+        Returns:
+            a Demon at full health at spawn_pos
+        """
+        if self._idle:
+            demon = self._idle.pop()
+            self._reused += 1
+        else:
+            demon = self._create()
+        demon.reset(spawn_pos)
+        self._in_use += 1
+        self._high_water = max(self._high_water, self._in_use)
+        return demon
+
+    def release(self, demon):
+        """
+        Removes a demon from the game and keeps it to be respawned
+
+        Args:
+            demon: a Demon from acquire to remove from the game
+        """
+        demon.kill()
+        self._in_use = max(0, self._in_use - 1)
+        if len(self._idle) < self._cap:
+            self._idle.append(demon)
+        else:
+            self._dropped += 1
+
+    def _create(self):
+        """
+        Builds a new demon
+
+        Returns:
+            a new Demon
+        """
+        self._created += 1
+        return Demon(self._game)
@@ -0,0 +1,156 @@
+"""
+Background asset preloader for Point of No Return
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pygame
+import src.assets as assets
+import src.constants as constants
+import src.utils as utils
+
+
+def animation_folders(image_folder=constants.IMAGE_FOLDER,
+                      sprites=constants.SPRITE_FOLDERS):
+    """
+    Finds the animation folders of the game's sprites, the ones with an
+    info.json
+
+    Args:
+        image_folder: a string, the folder with the sprite folders
+        sprites: a tuple of the sprite folders to search, relative to
+            image_folder. Defaults to every sprite the game draws
+
+    Returns:
+        a sorted list of the folders relative to image_folder, with '/'
+        between folder names like the asset registry's keys
+    """
+    folders = []
+    for sprite in sprites:
+        for path, _, files in os.walk(f'{image_folder}/{sprite}'):
+            if 'info.json' in files:
+                folder = os.path.relpath(path, image_folder)
+                folders.append(folder.replace(os.sep, '/'))
+    return sorted(folders)
+
+
+class Preloader:
+    """
+    Decodes every animation frame and sound effect on a pool of worker
+    threads, and hands the animations to the asset registry as they finish
+
+    Attributes:
+        _registry: the AssetRegistry to fill
+        _image_folder: a string, the folder with the animation folders
+        _audio_folder: a string, the folder with the sound effects
+        _workers: an int, how many worker threads to load with
+        _executor: the ThreadPoolExecutor loading the assets, or None if it
+            isn't running
+        _futures: a list of the Futures of every load started
+        _sounds: a dict mapping sound effect names to Futures of their Sounds
+    """
+    def __init__(self, registry=assets.REGISTRY,
+                 image_folder=constants.IMAGE_FOLDER,
+                 audio_folder=constants.AUDIO_FOLDER,
+                 workers=constants.PRELOAD_WORKERS):
+        """
+        Initializes a preloader that hasn't started loading
+
+        Args:
+            registry: the AssetRegistry to fill. Defaults to the shared one
+            image_folder: a string, the folder with the animation folders
+            audio_folder: a string, the folder with the sound effects
+            workers: an int, how many worker threads to load with
+        """
+        self._registry = registry
+        self._image_folder = image_folder
+        self._audio_folder = audio_folder
+        self._workers = workers
+        self._executor = None
+        self._futures = []
+        self._sounds = {}
+
+    @property
+    def progress(self):
+        """
+        Returns the fraction of the loads started that are done, from 0 to 1
+        """
+        if not self._futures:
+            return 1.0
+        return sum(future.done() for future in self._futures)\
+            / len(self._futures)
+
+    @property
+    def done(self):
+        """
+        Returns whether every load started is done
+        """
+        return all(future.done() for future in self._futures)
+
+    def start(self):
+        """
+        Starts loading every sound effect and animation folder in the
+        background, sound effects first since the view needs them right away
+        """
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(self._workers,
+                                            thread_name_prefix='preloader')
+        if pygame.mixer.get_init():
+            for file in sorted(os.listdir(self._audio_folder)):
+                name, extension = os.path.splitext(file)
+                if extension == '.wav':
+                    self._sounds[name] = self._submit(
+                        pygame.mixer.Sound, f'{self._audio_folder}/{file}')
+        for folder in animation_folders(self._image_folder):
+            self._registry.preload(folder, self._submit(
+                utils.get_animation_info, f'{self._image_folder}/{folder}',
+                **assets.load_options(folder)))
+
+    def collect(self):
+        """
+        Hands the animations that finished loading to the registry
+
+        Returns:
+            a boolean, whether everything has finished loading
+        """
+        self._registry.collect()
+        return self.done
+
+    def finish(self):
+        """
+        Waits for everything to load, hands it all to the registry and shuts
+        the worker threads down
+        """
+        self._registry.collect(wait=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def sound(self, name):
+        """
+        Returns a sound effect, waiting for it if it is still loading and
+        loading it now if it wasn't preloaded
+
+        Args:
+            name: a string, the name of the sound effect's file without .wav
+        """
+        future = self._sounds.get(name)
+        if future is None:
+            return pygame.mixer.Sound(f'{self._audio_folder}/{name}.wav')
+        return future.result()
+
+    def _submit(self, function, *args, **kwargs):
+        """
+        Starts a load on the worker threads and keeps track of it
+
+        Args:
+            function: the function that does the load
+            *args: the positional arguments for function
+            **kwargs: the keyword arguments for function
+
+        Returns:
+            the Future of the load
+        """
+        future = self._executor.submit(function, *args, **kwargs)
+        self._futures.append(future)
+        return future
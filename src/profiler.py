@@ -0,0 +1,252 @@
+"""
+Frame profiler for Point of No Return, timing named spans of each frame
+"""
+from collections import deque
+import csv
+import json
+import threading
+import time
+import numpy as np
+import src.constants as constants
+
+
+class _Span:
+    """
+    Times one named span, adding the milliseconds to the profiler's current
+    frame. Spans with the same name can run more than once a frame, but can't
+    be nested inside each other.
+
+    Attributes:
+        _name: a string, the name of the span
+        _profiler: the Profiler to record to
+        _start: a float, the perf_counter when the span was entered
+    """
+    __slots__ = ('_name', '_profiler', '_start')
+
+    def __init__(self, name, profiler):
+        """
+        Initializes the span
+
+        Args:
+            name: a string, the name of the span
+            profiler: the Profiler to record to
+        """
+        self._name = name
+        self._profiler = profiler
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = (time.perf_counter() - self._start) * 1000
+        current = self._profiler.current
+        current[self._name] = current.get(self._name, 0.0) + elapsed
+
+
+class _NullSpan:  # pylint: disable=too-few-public-methods
+    """
+    A span that does nothing, used while the profiler is disabled
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:  # pylint: disable=too-many-instance-attributes
+    """
+    Keeps the span timings of the most recent frames in a ring buffer. Only
+    spans on the thread that started the frame are timed, so work on other
+    threads doesn't land in whichever frame happens to be open.
+
+    Attributes:
+        enabled: a boolean, whether spans are timed
+        budget: a float, the milliseconds a frame can take before it is slow
+        current: a dict mapping span names to milliseconds for the frame
+            being timed
+        _frames: a deque of the finished frames, each a dict with the frame
+            number, its total milliseconds and its spans
+        _spans: a dict mapping span names to their reusable _Span
+        _frame_start: a float, the perf_counter when the current frame
+            started, or None if no frame has been started
+        _frame_count: an int, how many frames have finished
+        _slow_count: an int, how many finished frames were over budget
+        _thread: an int, the identifier of the thread spans are timed on
+    """
+
+    def __init__(self, capacity=constants.PROFILER_FRAMES,
+                 budget=constants.FRAME_BUDGET):
+        """
+        Initializes a disabled profiler
+
+        Args:
+            capacity: an int, how many recent frames to keep
+            budget: a float, the milliseconds a frame can take before it is
+                slow
+        """
+        self.enabled = False
+        self.budget = budget
+        self.current = {}
+        self._frames = deque(maxlen=capacity)
+        self._spans = {}
+        self._frame_start = None
+        self._frame_count = 0
+        self._slow_count = 0
+        self._thread = threading.get_ident()
+
+    @property
+    def frames(self):
+        """
+        Returns a list of the kept frames, oldest first
+        """
+        return list(self._frames)
+
+    @property
+    def slow_frames(self):
+        """
+        Returns a list of the kept frames that took longer than the budget
+        """
+        return [frame for frame in self._frames
+                if frame['total'] > self.budget]
+
+    @property
+    def stats(self):
+        """
+        Returns a dict with the number of frames finished and how many of them
+        were over budget
+        """
+        return {'frames': self._frame_count, 'slow': self._slow_count}
+
+    def span(self, name):
+        """
+        Returns a context manager that times a named span of the frame
+
+        Args:
+            name: a string, the name of the span
+        """
+        if not self.enabled or threading.get_ident() != self._thread:
+            return _NULL_SPAN
+        span = self._spans.get(name)
+        if span is None:
+            span = self._spans[name] = _Span(name, self)
+        return span
+
+    def start_frame(self):
+        """
+        Starts timing a new frame on the calling thread
+        """
+        if self.enabled:
+            self.current = {}
+            self._thread = threading.get_ident()
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Finishes the current frame and keeps its timings
+
+        Returns:
+            the dict kept for the frame, or None if no frame was being timed
+        """
+        if not self.enabled or self._frame_start is None:
+            return None
+        total = (time.perf_counter() - self._frame_start) * 1000
+        frame = {'frame': self._frame_count, 'total': total,
+                 'spans': self.current}
+        self._frames.append(frame)
+        self._frame_count += 1
+        if total > self.budget:
+            self._slow_count += 1
+        self.current = {}
+        self._frame_start = None
+        return frame
+
+    def reset(self):
+        """
+        Forgets every kept frame and the counts
+        """
+        self.current = {}
+        self._frames.clear()
+        self._frame_start = None
+        self._frame_count = 0
+        self._slow_count = 0
+
+    def span_names(self):
+        """
+        Returns a list of every span name in the kept frames, in the order
+        they were first seen
+        """
+        names = {}
+        for frame in self._frames:
+            names.update(dict.fromkeys(frame['spans']))
+        return list(names)
+
+    def summary(self):
+        """
+        Summarizes the kept frames
+
+        Returns:
+            a dict mapping 'total' and each span name to a dict of the mean,
+            p95 and max milliseconds per frame it ran in
+        """
+        columns = {'total': [frame['total'] for frame in self._frames]}
+        for name in self.span_names():
+            columns[name] = [frame['spans'][name] for frame in self._frames
+                             if name in frame['spans']]
+        return {name: {'mean': float(np.mean(times)),
+                       'p95': float(np.percentile(times, 95)),
+                       'max': float(np.max(times))}
+                for name, times in columns.items() if times}
+
+    def export(self, path):
+        """
+        Writes the kept frames to a file, as JSON if the path ends in .json
+        and as CSV with a column per span otherwise
+
+        Args:
+            path: a string, the file to write
+        """
+        if path.endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as output:
+                json.dump({'budget': self.budget, 'frames': self.frames},
+                          output, indent=1)
+            return
+        names = self.span_names()
+        with open(path, 'w', newline='', encoding='utf-8') as output:
+            writer = csv.writer(output)
+            writer.writerow(['frame', 'total', 'over_budget'] + names)
+            for frame in self._frames:
+                writer.writerow([frame['frame'], f"{frame['total']:.4f}",
+                                 int(frame['total'] > self.budget)]
+                                + [f"{frame['spans'].get(name, 0.0):.4f}"
+                                   for name in names])
+
+    def report(self):
+        """
+        Returns a string with the summary of the kept frames and the stages
+        that took the longest in each slow frame
+        """
+        lines = [f"{self._frame_count} frames, {self._slow_count} over the "
+                 f"{self.budget:.1f} ms budget",
+                 f"{'span':<12}{'mean':>10}{'p95':>10}{'max':>10} (ms)"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<12}{stats['mean']:>10.3f}"
+                         f"{stats['p95']:>10.3f}{stats['max']:>10.3f}")
+        for frame in self.slow_frames:
+            worst = max(frame['spans'].items(), key=lambda span: span[1],
+                        default=('none', 0.0))
+            lines.append(f"slow frame {frame['frame']}: "
+                         f"{frame['total']:.2f} ms, {worst[0]} took "
+                         f"{worst[1]:.2f} ms")
+        return '\n'.join(lines)
+
+
+# The profiler shared by the game loop and the code it times
+PROFILER = Profiler()
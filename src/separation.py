@@ -0,0 +1,154 @@
+"""
+Separation steering that keeps the demons in Point of No Return apart
+"""
+import numpy as np
+import src.constants as constants
+
+# The (column, row) offsets of the cells next to a cell that are paired with
+# it, half of its 8 neighbours so each pair of cells is only paired once
+_FORWARD_CELLS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+def _pair_runs(order, starts, counts, keys):
+    """
+    Pairs each point with every point in a cell, given points sorted by cell
+    so each cell's points are a run in the sorted order
+
+    Args:
+        order: an int array of the points' indices, sorted by cell
+        starts: an int array of where each cell's run starts in order
+        counts: an int array of how many points are in each cell
+        keys: an int array of the key of the cell to pair each point with
+
+    Returns:
+        a tuple of two int arrays of the indices of the first and second
+        point in each pair
+    """
+    runs = counts[keys]
+    total = runs.sum()
+    first = np.repeat(np.arange(len(keys)), runs)
+    # Each pair's place in its first point's run of the other cell
+    offsets = np.arange(total) - np.repeat(np.cumsum(runs) - runs, runs)
+    return first, order[np.repeat(starts[keys], runs) + offsets]
+
+
+def cell_pairs(positions, cell_size):
+    """
+    Finds every pair of points in the same or neighbouring cells of a grid,
+    without comparing points further apart. Points are sorted by cell so each
+    cell's points are a run in the sorted order, and each point is paired
+    with the runs of its own cell and its neighbouring cells at once.
+
+    Args:
+        positions: an N x 2 array of (x, y) points
+        cell_size: a float, the width of a cell
+
+    Returns:
+        a tuple of two int arrays of the indices of the first and second
+        point in each pair, with each pair listed once
+    """
+    cells = np.floor(positions / cell_size).astype(np.intp)
+    # Leave a column and row free on each side, so neighbour keys never wrap
+    cells -= cells.min(axis=0) - 1
+    width = cells[:, 0].max() + 2
+    keys = cells[:, 1] * width + cells[:, 0]
+    order = np.argsort(keys, kind='stable')
+    # Room for the keys of the cells after the last one, which are empty
+    counts = np.bincount(keys, minlength=keys.max() + width + 2)
+    starts = np.cumsum(counts) - counts
+
+    first, second = _pair_runs(order, starts, counts, keys)
+    keep = first < second
+    firsts, seconds = [first[keep]], [second[keep]]
+    for dx, dy in _FORWARD_CELLS:
+        first, second = _pair_runs(order, starts, counts,
+                                   keys + dy * width + dx)
+        firsts.append(first)
+        seconds.append(second)
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+class Separation:
+    """
+    Pushes the demons away from the other demons near them, so they spread
+    around the player instead of stacking up on one spot. Only demons in
+    neighbouring cells as wide as the push radius are compared, so the cost
+    grows with how crowded each demon is rather than with every pair.
+
+    Attributes:
+        _radius: a float, how close in pixels another demon has to be to push
+        _candidates: an int, how many pairs of demons have been compared
+        _neighbours: an int, how many of the compared pairs were close enough
+            to push
+    """
+    def __init__(self, radius=constants.SEPARATION_RADIUS):
+        """
+        Initializes the separation
+
+        Args:
+            radius: a float, how close in pixels another demon has to be to
+                push
+        """
+        self._radius = radius
+        self._candidates = 0
+        self._neighbours = 0
+
+    @property
+    def stats(self):
+        """
+        Returns a dict with how many pairs of demons have been compared, and
+        how many of them were close enough to push
+        """
+        return {'candidates': self._candidates,
+                'neighbours': self._neighbours}
+
+    def forces(self, positions):
+        """
+        Adds up how hard the demons near each demon push it away. Each
+        neighbour pushes directly away from itself, from 1 when on top of the
+        demon down to 0 at the radius
+
+        Args:
+            positions: an N x 2 array of the demons' (x, y) centers
+
+        Returns:
+            an N x 2 array of the push on each demon
+        """
+        count = len(positions)
+        forces = np.zeros((count, 2))
+        if count < 2:
+            return forces
+        first, second, pushes = self._pushes(positions)
+        for axis, push in enumerate(pushes):
+            forces[:, axis] = np.bincount(first, push, count)\
+                - np.bincount(second, push, count)
+        return forces
+
+    def _pushes(self, positions):
+        """
+        Finds the pairs of demons close enough to push each other
+
+        Args:
+            positions: an N x 2 array of the demons' (x, y) centers
+
+        Returns:
+            a tuple of int arrays of the first and second demon in each pair,
+            and a tuple of arrays of the x and y push on the first demon of
+            each pair, which the second demon gets the opposite of
+        """
+        first, second = cell_pairs(positions, self._radius)
+        self._candidates += len(first)
+        xs, ys = positions[:, 0], positions[:, 1]
+        offset_x = xs[first] - xs[second]
+        offset_y = ys[first] - ys[second]
+        dists = np.sqrt(offset_x ** 2 + offset_y ** 2)
+        close = np.flatnonzero(dists < self._radius)
+        self._neighbours += len(close)
+        first, second, dists = first[close], second[close], dists[close]
+        offset_x, offset_y = offset_x[close], offset_y[close]
+        # Demons on the same spot push apart sideways
+        stacked = dists == 0
+        offset_x[stacked] = 1
+        dists[stacked] = 1
+        strength = (1 - dists / self._radius) / dists
+        return first, second, (offset_x * strength, offset_y * strength)
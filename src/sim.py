@@ -0,0 +1,161 @@
+"""
+Headless simulation of Point of No Return for load tests and balance runs
+
+Runs the game and its controllers without a view, audio or frame cap:
+    python -m src.sim --ticks 10000 --spawn-rate 5 --seed 1 --input random
+    python -m src.sim --tick-rate 30
+    python -m src.sim --replay run.pnr
+"""
+import argparse
+import os
+import random
+import time
+import pygame
+import src.constants as constants
+from src.controller import PlayerController, DemonController, ScrollController
+from src.game import Game
+from src.inputs import idle_keys, RandomKeys, InputRecorder, InputReplay,\
+    seed_fits
+
+INPUTS = {
+    'idle': lambda seed: idle_keys,
+    'random': RandomKeys,
+}
+
+
+def run(ticks, spawn_ticks=constants.DEMON_SPAWN_TICKS, *, seed=None,  # pylint: disable=too-many-arguments
+        get_pressed=idle_keys, dt=constants.TICK, waves=None):
+    """
+    Runs the game as fast as possible without drawing it
+
+    Args:
+        ticks: an int, the most ticks to run for. The run ends early if the
+            player dies
+        spawn_ticks: an int, how many ticks between demon waves, or 0 to not
+            spawn demons
+        seed: the seed for the game's random choices. Defaults to None, which
+            seeds from the system
+        get_pressed: a function that returns the key state for each tick
+        dt: a float, the seconds of game time each tick advances by
+        waves: a tuple of how many demons come in the first wave, how many
+            more each wave brings and the most demons alive at once. Defaults
+            to None, which uses the game's defaults
+
+    Returns:
+        a dict with the number of ticks run, the seconds taken, the ticks per
+        second, the final score, the number of live demons, whether the
+        player survived, the hash of the final game state, how many game
+        events of each type were emitted and the spawner's stats
+    """
+    game = Game(seed, spawn_ticks)
+    game.running = True
+    if waves is not None:
+        game.spawner.size, game.spawner.growth, game.spawner.cap = waves
+    player = PlayerController(game, get_pressed)
+    demons = DemonController(game)
+    all_sprites = ScrollController(game)
+
+    start = time.perf_counter()
+    while game.ticks < ticks and game.player.alive():
+        player.update(dt)
+        demons.update(dt)
+        all_sprites.update(dt)
+        game.update()
+    seconds = time.perf_counter() - start
+
+    return {'ticks': game.ticks, 'seconds': seconds,
+            'ticks_per_second': game.ticks / seconds if seconds else 0,
+            'score': game.score, 'demons': len(game.demons),
+            'survived': game.player.alive(), 'state_hash': game.state_hash(),
+            'events': game.events.counts, 'spawner': game.spawner.stats}
+
+
+def main(argv=None):
+    """
+    Parses the command line, runs the simulation and prints a report
+
+    Args:
+        argv: a list of command line arguments. Defaults to None, which uses
+            sys.argv
+    """
+    parser = argparse.ArgumentParser(
+        description='Run Point of No Return without a display')
+    parser.add_argument('--ticks', type=int, default=60 * constants.FRAME_RATE,
+                        help='most ticks to run for')
+    parser.add_argument('--spawn-rate', type=float,
+                        default=1000 / constants.DEMON_SPAWN_TIME,
+                        help='demons spawned per second of game time')
+    parser.add_argument('--wave-size', type=int, default=constants.WAVE_SIZE,
+                        help='demons in the first wave')
+    parser.add_argument('--wave-growth', type=float,
+                        default=constants.WAVE_GROWTH,
+                        help='how many more demons each wave brings')
+    parser.add_argument('--alive-cap', type=int,
+                        default=constants.DEMON_ALIVE_CAP,
+                        help='most demons alive at once')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed for spawns and random input')
+    parser.add_argument('--tick-rate', type=float,
+                        default=constants.FRAME_RATE,
+                        help='ticks per second of game time, ignored when '
+                             'replaying')
+    parser.add_argument('--input', choices=sorted(INPUTS), default='idle',
+                        help='where the player input comes from')
+    parser.add_argument('--record', metavar='PATH',
+                        help='record the input of the run to a replay file')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='replay the input, seed and spawn rate of a '
+                             'recorded run, ignoring the other options')
+    args = parser.parse_args(argv)
+    # Replays always run at the frame rate
+    if args.record and args.tick_rate != constants.FRAME_RATE:
+        parser.error('--record only works at the default --tick-rate')
+    if args.record and not seed_fits(args.seed):
+        parser.error('--record needs a --seed that fits in 64 bits')
+    waves = (args.wave_size, args.wave_growth, args.alive_cap)
+    if args.record and waves != (constants.WAVE_SIZE, constants.WAVE_GROWTH,
+                                 constants.DEMON_ALIVE_CAP):
+        parser.error('--record only works with the default waves')
+
+    # Images still need a display mode to convert, so use SDL's dummy driver
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    dt = constants.TICK
+    if args.replay:
+        get_pressed = InputReplay.load(args.replay)
+        ticks = len(get_pressed)
+        waves = None
+        seed = get_pressed.seed
+        spawn_ticks = get_pressed.spawn_ticks
+    else:
+        ticks = args.ticks
+        seed = args.seed
+        if seed is None and args.record:
+            seed = random.randrange(2 ** 32)
+        dt = 1 / args.tick_rate
+        spawn_ticks = round(args.tick_rate / args.spawn_rate)\
+            if args.spawn_rate else 0
+        get_pressed = INPUTS[args.input](seed)
+        if args.record:
+            get_pressed = InputRecorder(get_pressed, seed, spawn_ticks)
+
+    report = run(ticks, spawn_ticks, seed=seed, get_pressed=get_pressed,
+                 dt=dt, waves=waves)
+    if args.record and not args.replay:
+        get_pressed.save(args.record)
+    print(f"{report['ticks']} ticks in {report['seconds']:.2f} s "
+          f"({report['ticks_per_second']:.0f} ticks/s)")
+    print(f"score: {report['score']}, demons alive: {report['demons']}, "
+          f"player {'survived' if report['survived'] else 'died'}")
+    print(f"state hash: {report['state_hash']}")
+    spawner = report['spawner']
+    print(f"waves: {spawner['waves']}, demons spawned: {spawner['spawned']}, "
+          f"held back by the cap: {spawner['capped']}")
+    print('events: ' + ', '.join(f'{name} {count}' for name, count
+                                  in report['events'].items()))
+
+
+if __name__ == '__main__':
+    main()
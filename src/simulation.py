@@ -0,0 +1,200 @@
+"""
+Fixed tick simulation of Point of No Return, run apart from drawing
+"""
+import threading
+import time
+import src.constants as constants
+import src.profiler as profiler
+from src.controller import DemonController, ScrollController
+from src.snapshot import Frame, take_snapshot
+
+
+class Simulation:  # pylint: disable=too-many-instance-attributes
+    """
+    Updates the game with its controllers, either once per drawn frame or at
+    a fixed tick decoupled from drawing. At a fixed tick, it keeps snapshots of
+    the last two ticks for the view to interpolate between, and can run on its
+    own thread so slow frames don't hold up input and the demons.
+
+    Attributes:
+        player: the PlayerController for the player
+        lock: a threading.RLock held while the game is updated. Anything else
+            that changes the game while the simulation runs on a thread has to
+            hold it too
+        _game: the Game to update
+        _demons: the DemonController for the demons
+        _scroll: the ScrollController that scrolls every sprite
+        _dt: a float, the seconds of game time in a fixed tick
+        _accumulator: a float, the seconds of time not simulated yet
+        _snapshots: a tuple of the previous and current Snapshots
+        _published: a float, the perf_counter when the current snapshot was
+            taken
+        _events: a list of the Events of every tick since the last frame
+        _thread: the Thread running the simulation, or None if it isn't
+            running on a thread
+        _stopped: a threading.Event that is set to stop the thread
+    """
+    def __init__(self, game, player, tick_rate=constants.SIM_TICK_RATE):
+        """
+        Initializes the simulation with a snapshot of the game as it is
+
+        Args:
+            game: the Game to update
+            player: the PlayerController for the player
+            tick_rate: a float, how many fixed ticks to run per second
+        """
+        self.player = player
+        self.lock = threading.RLock()
+        self._game = game
+        self._demons = DemonController(game)
+        self._scroll = ScrollController(game)
+        self._dt = 1 / tick_rate
+        self._accumulator = 0.0
+        snapshot = take_snapshot(game)
+        self._snapshots = (snapshot, snapshot)
+        self._published = time.perf_counter()
+        self._events = []
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def dt(self):
+        """
+        Returns the seconds of game time in a fixed tick
+        """
+        return self._dt
+
+    @property
+    def snapshots(self):
+        """
+        Returns a tuple of the previous and current Snapshots
+        """
+        return self._snapshots
+
+    @property
+    def threaded(self):
+        """
+        Returns whether the simulation is running on its own thread
+        """
+        return self._thread is not None
+
+    @property
+    def active(self):
+        """
+        Returns whether the game is being played, so ticks should run
+        """
+        return self._game.running and not self._game.paused\
+            and self._game.player.alive()
+
+    def step(self, dt=constants.TICK):
+        """
+        Updates the player, demons, scrolling and game once
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
+        """
+        span = profiler.PROFILER.span
+        with span('player'):
+            self.player.update(dt)
+        with span('demons'):
+            self._demons.update(dt)
+        with span('scroll'):
+            self._scroll.update(dt)
+        with span('game'):
+            self._game.update()
+
+    def tick(self):
+        """
+        Runs one fixed tick, if the game is being played, and takes a snapshot
+        of it
+
+        Returns:
+            a boolean, whether the tick ran
+        """
+        with self.lock:
+            if not self.active:
+                return False
+            self.step(self._dt)
+            snapshot = take_snapshot(self._game, self._game.events.drain())
+            previous = self._snapshots[1]
+            # Nothing to interpolate from after the game restarted
+            if previous.tick >= snapshot.tick:
+                previous = snapshot
+            self._snapshots = (previous, snapshot)
+            self._published = time.perf_counter()
+            self._events.extend(snapshot.events)
+            return True
+
+    def advance(self, elapsed):
+        """
+        Runs as many fixed ticks as fit in the time since the last call,
+        keeping the remainder for next time
+
+        Args:
+            elapsed: a float, the seconds since the last call. Capped at
+                MAX_TICK, so a long stall doesn't make the game jump ahead
+        """
+        if not self.active:
+            self._accumulator = 0.0
+            return
+        self._accumulator += min(elapsed, constants.MAX_TICK)
+        while self._accumulator >= self._dt - constants.TIME_EPSILON:
+            self._accumulator -= self._dt
+            self.tick()
+        self._accumulator = max(self._accumulator, 0.0)
+
+    def frame(self):
+        """
+        Takes what the view needs to draw the next frame, and the events since
+        the last one
+
+        Returns:
+            a Frame with the last two snapshots and how far between them to
+            draw
+        """
+        with self.lock:
+            if self._thread is not None:
+                alpha = (time.perf_counter() - self._published) / self._dt
+            else:
+                alpha = self._accumulator / self._dt
+            events = tuple(self._events)
+            self._events.clear()
+            return Frame(*self._snapshots, min(alpha, 1.0), events)
+
+    def start(self):
+        """
+        Starts running fixed ticks on a separate thread
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='simulation',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the simulation thread, if it is running, and waits for it to
+        finish its tick
+        """
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        """
+        Runs fixed ticks on schedule until stopped
+        """
+        next_tick = time.perf_counter()
+        while not self._stopped.is_set():
+            self.tick()
+            next_tick += self._dt
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stopped.wait(delay)
+            elif -delay > constants.MAX_TICK:
+                # Too far behind to catch up, so skip the missed ticks
+                next_tick = time.perf_counter()
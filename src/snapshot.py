@@ -0,0 +1,138 @@
+"""
+Immutable snapshots of Point of No Return for drawing, and interpolation
+between them
+"""
+from collections import namedtuple
+import pygame
+import src.constants as constants
+from src.utils import round_half_up
+
+# A sprite as of one tick. key tells the same sprite apart between snapshots,
+# surf is the frame it shows (shared, read-only art) and topleft is the
+# sub-pixel (x, y) position of that frame
+SpriteState = namedtuple('SpriteState', 'key surf topleft')
+
+# What the view needs from one tick of the game: the tick number, a tuple of
+# SpriteStates in draw order, the player's health, invincibility time in
+# seconds, SpriteState key, animation name, frame offset and whether they are
+# alive, and a tuple of the Events that happened in the tick
+Snapshot = namedtuple('Snapshot', 'tick sprites health invincibility_time '
+                                  'player animation offset alive events')
+
+# A frame to draw: the snapshots to interpolate between, how far between them
+# to draw (0 is the previous one, 1 the current one) and a tuple of the Events
+# of every tick since the last frame
+Frame = namedtuple('Frame', 'previous current alpha events')
+
+
+def take_snapshot(game, events=()):
+    """
+    Copies what the view needs out of the game, so it can be drawn while the
+    game keeps changing
+
+    Args:
+        game: the Game to copy
+        events: a tuple of the Events drained from the game since the last
+            snapshot. Defaults to none
+
+    Returns:
+        a Snapshot of the game as it is now
+    """
+    states = []
+    for sprite in game.all_sprites.sprites():
+        rect = sprite.rect
+        position = sprite.position
+        states.append(SpriteState(id(sprite), sprite.surf,
+                                  (rect.x + position[0] - rect.centerx,
+                                   rect.y + position[1] - rect.centery)))
+    player = game.player
+    return Snapshot(game.ticks, tuple(states), player.health,
+                    player.invincibility_time, id(player),
+                    player.current_animation_name, player.frame_offset,
+                    player.alive(), events)
+
+
+class DrawnSprite:  # pylint: disable=too-few-public-methods
+    """
+    Stands in for a sprite when drawing from snapshots
+
+    Attributes:
+        surf: the Surface to draw
+        rect: a Rect with the position to draw the surf at
+    """
+    __slots__ = ('surf', 'rect')
+
+    def __init__(self):
+        """
+        Initializes the stand-in with nothing to draw
+        """
+        self.surf = None
+        self.rect = None
+
+
+class Interpolator:  # pylint: disable=too-few-public-methods
+    """
+    Turns a pair of snapshots into sprites to draw, at positions between the
+    two. Keeps one DrawnSprite per sprite from frame to frame, so a view can
+    tell which sprites moved.
+
+    Attributes:
+        max_distance: an int, how many pixels a sprite can move between
+            snapshots before it counts as respawned and is drawn where it is
+            now instead of in between
+        _sprites: a dict mapping the keys of the sprites drawn last frame to
+            their DrawnSprites
+    """
+    def __init__(self, max_distance=constants.INTERPOLATION_MAX_DIST):
+        """
+        Initializes the interpolator
+
+        Args:
+            max_distance: an int, how many pixels a sprite can move between
+                snapshots and still be interpolated
+        """
+        self.max_distance = max_distance
+        self._sprites = {}
+
+    def sprites(self, previous, current, alpha):
+        """
+        Places the sprites of the current snapshot between where they were in
+        the previous one and where they are now
+
+        Args:
+            previous: the Snapshot before current
+            current: the latest Snapshot
+            alpha: a float from 0 to 1, how far from previous to current to
+                place the sprites
+
+        Returns:
+            a list of DrawnSprites in draw order
+        """
+        before = {state.key: state.topleft for state in previous.sprites}
+        drawn = {}
+        for state in current.sprites:
+            sprite = self._sprites.get(state.key)
+            if sprite is None:
+                sprite = DrawnSprite()
+            x, y = state.topleft
+            old = before.get(state.key)
+            if old is not None and abs(x - old[0]) <= self.max_distance\
+                    and abs(y - old[1]) <= self.max_distance:
+                x = old[0] + (x - old[0]) * alpha
+                y = old[1] + (y - old[1]) * alpha
+            sprite.surf = state.surf
+            sprite.rect = pygame.Rect((round_half_up(x), round_half_up(y)),
+                                      state.surf.get_size())
+            drawn[state.key] = sprite
+        self._sprites = drawn
+        return list(drawn.values())
+
+    def sprite(self, key):
+        """
+        Returns the DrawnSprite placed for a sprite by the last call to
+        sprites, or None if it wasn't drawn
+
+        Args:
+            key: the key of the sprite's SpriteStates
+        """
+        return self._sprites.get(key)
@@ -0,0 +1,156 @@
+"""
+Demon spawn waves for Point of No Return
+"""
+import math
+import numpy as np
+import src.constants as constants
+
+
+def ring_positions(rng, count):
+    """
+    Picks random spawn positions in the ring just outside the screen, from
+    DEMON_MIN_SPAWN_DIST to DEMON_MAX_SPAWN_DIST past its edges
+
+    Args:
+        rng: the NumPy Generator to draw the positions with
+        count: an int, how many positions to pick
+
+    Returns:
+        an array of count rows of (x, y) positions
+    """
+    min_x = constants.SCREEN_WIDTH/2 + constants.DEMON_MIN_SPAWN_DIST
+    min_y = constants.SCREEN_HEIGHT/2 + constants.DEMON_MIN_SPAWN_DIST
+    dist = constants.DEMON_MAX_SPAWN_DIST - constants.DEMON_MIN_SPAWN_DIST
+
+    theta = rng.uniform(-math.pi, math.pi, count)
+    fraction = rng.random(count)
+    max_theta = math.atan(min_y / min_x)
+    # Whether each angle comes out of the left or right edge of the screen,
+    # rather than the top or bottom
+    is_x = (np.abs(theta) < max_theta) | (np.abs(theta) > math.pi - max_theta)
+    cos, sin = np.cos(theta), np.sin(theta)
+    trig = np.abs(np.where(is_x, cos, sin))
+
+    min_rad = np.where(is_x, min_x, min_y) / trig
+    rad = min_rad + fraction * dist / trig
+    return np.column_stack((rad * cos + constants.SCREEN_WIDTH / 2,
+                            rad * sin + constants.SCREEN_HEIGHT / 2))
+
+
+class SpawnDirector:  # pylint: disable=too-many-instance-attributes
+    """
+    Spawns demons for a game in waves that grow over time, a whole wave at
+    once, without letting more than a set number of demons be alive
+
+    Attributes:
+        size: an int, how many demons come in the first wave
+        growth: a float, how many more demons each wave brings than the one
+            before it
+        cap: an int, the most demons alive at once
+        _game: the Game to spawn demons in
+        _random: a NumPy Generator that spawn positions are drawn with,
+            seeded from the game's random
+        _wave: an int, how many waves have spawned since the game started
+        _spawned: an int, how many demons have been spawned since the game
+            started
+        _capped: an int, how many demons weren't spawned because of the cap
+            since the game started
+    """
+    def __init__(self, game, size=constants.WAVE_SIZE,
+                 growth=constants.WAVE_GROWTH, cap=constants.DEMON_ALIVE_CAP):
+        """
+        Initializes the director before the first wave
+
+        Args:
+            game: the Game to spawn demons in
+            size: an int, how many demons come in the first wave
+            growth: a float, how many more demons each wave brings than the
+                one before it
+            cap: an int, the most demons alive at once
+        """
+        self.size = size
+        self.growth = growth
+        self.cap = cap
+        self._game = game
+        self._random = np.random.default_rng(game.random.getrandbits(64))
+        self._wave = 0
+        self._spawned = 0
+        self._capped = 0
+
+    @property
+    def wave(self):
+        """
+        Returns how many waves have spawned since the game started
+        """
+        return self._wave
+
+    @property
+    def wave_size(self):
+        """
+        Returns how many demons come in the next wave
+        """
+        return int(self.size + self.growth * self._wave)
+
+    @property
+    def stats(self):
+        """
+        Returns a dict with how many waves and demons have been spawned, and
+        how many demons were held back by the cap
+        """
+        return {'waves': self._wave, 'spawned': self._spawned,
+                'capped': self._capped}
+
+    def reset(self):
+        """
+        Starts over from the first wave with the counters cleared, for when
+        the game restarts, and reseeds the spawn positions from the game's
+        random so the new run doesn't depend on what the last one spawned
+        """
+        self._random = np.random.default_rng(self._game.random.getrandbits(64))
+        self._wave = 0
+        self._spawned = 0
+        self._capped = 0
+
+    def update(self):
+        """
+        Spawns the next wave if the game is on a tick that waves spawn on,
+        every spawn_ticks ticks of the game
+        """
+        spawn_ticks = self._game.spawn_ticks
+        if spawn_ticks and self._game.ticks % spawn_ticks == 0:
+            self.spawn_wave()
+
+    def spawn_wave(self):
+        """
+        Spawns the next wave of demons
+
+        Returns:
+            a list of the Demons spawned
+        """
+        count = self.wave_size
+        self._wave += 1
+        return self.spawn(count)
+
+    def spawn(self, count):
+        """
+        Spawns demons at random points just outside the screen, as many as
+        fit under the cap
+
+        Args:
+            count: an int, how many demons to spawn
+
+        Returns:
+            a list of the Demons spawned
+        """
+        game = self._game
+        allowed = max(0, min(count, self.cap - len(game.demons)))
+        self._capped += count - allowed
+        if not allowed:
+            return []
+        positions = ring_positions(self._random, allowed).tolist()
+        demons = [game.demon_pool.acquire(tuple(position))
+                  for position in positions]
+        game.demons.add(*demons)
+        game.all_sprites.add(*demons)
+        self._spawned += allowed
+        return demons
@@ -3,10 +3,14 @@ Sprites in Point of No Return
 """
 from enum import Enum
 from math import atan2, pi
-import pygame
 from pygame.sprite import Sprite
+import src.assets as assets
 import src.constants as constants
+import src.profiler as profiler
 import src.utils as utils
+from src.entities import EntityView
+from src.events import EventType
+from src.groups import SpatialGroup, YSortedGroup
 
 
 class Direction(Enum):
@@ -39,16 +43,24 @@ class GameSprite(Sprite):  # pylint: disable=too-many-instance-attributes
         surf: a pygame surface, the display image for the sprite
         rect: a pygame rectangle, defines the position of the sprite
         mask: a pygame mask, defines the hit-box for the sprite from the surf
+        entity: an EntityView with the sprite's position, direction, health
+            and timers, kept in a row of the game's EntityStore while the
+            sprite is in a group
         _spawn_pos: a tuple of two ints, the spawn position of the sprite
-        _animations: a dictionary with animation sequence names as keys and
-            dictionaries with the information for each animation sequence
-            (images, center positions, animation frame rate)
-        _animation_frame: an int, the current frame of the animation
+        _animations: a read-only dictionary with animation sequence names as
+            keys and dictionaries with the information for each animation
+            sequence (images, center positions, animation frame rate). Shared
+            with every other sprite using the same art
+        _animation_frame: a float, how many ticks at the frame rate the
+            current animation has been playing for
         _layer: an int, the layer to display the sprite on
         _last_animation: a tuple, first element is the animation dict from
             _animations, second element is the frame of that animation
         _game: a Game that contains all the sprites
     """
+    # Names of the animations this sprite class loads from its image folder
+    _ANIMATION_NAMES = ('stills',)
+
     def __init__(self, game, image_path, spawn_pos=None):
         """
         Initializes the character by setting surf and rect, and setting the
@@ -61,9 +73,9 @@ class GameSprite(Sprite):  # pylint: disable=too-many-instance-attributes
                 to the center of the screen
         """
         super().__init__()
-        # Creates animations dictionary and a key for the still images
-        self._animations = {'stills': utils.get_animation_info(
-            f'{constants.IMAGE_FOLDER}/{image_path}')}
+        self.entity = EntityView()
+        self._animations = assets.REGISTRY.animations(image_path,
+                                                      self._ANIMATION_NAMES)
         # Sets current character image to the first still
         self.surf = self._animations['stills']['animations'][0]
         self._animation_frame = 0
@@ -76,7 +88,8 @@ class GameSprite(Sprite):  # pylint: disable=too-many-instance-attributes
         else:
             self.rect = self.surf.get_rect(center=spawn_pos)
             self._spawn_pos = spawn_pos
-        self.mask = pygame.mask.from_surface(self.surf)
+        self.entity.position = self.rect.center
+        self.mask = self._animations['stills']['masks'][0]
         self._last_animation = (self._animations["stills"], 0)
         self._layer = self.rect.bottom
         self._game = game
@@ -116,45 +129,160 @@ class GameSprite(Sprite):  # pylint: disable=too-many-instance-attributes
         """
         return self._last_animation[1]
 
-    def reset(self):
+    @property
+    def frame_offset(self):
         """
-        Reset the sprite attributes
+        Returns a tuple of the (x, y) pixels the current frame is moved from
+        the first still by the animation positions
+        """
+        still = self._animations['stills']['positions'][0]
+        current = self.last_animation['positions'][self.last_frame]
+        return (still[0] - current[0], still[1] - current[1])
+
+    def reset(self, spawn_pos=None):
+        """
+        Reset the sprite attributes and puts it back at its spawn position
+
+        Args:
+            spawn_pos: tuple of 2 ints, a new spawn position for the sprite.
+                Defaults to None, which keeps the current spawn position
         """
-        self.rect.center = self._spawn_pos
+        if spawn_pos is not None:
+            self._spawn_pos = spawn_pos
+        self.surf = self._animations['stills']['animations'][0]
+        self.mask = self._animations['stills']['masks'][0]
+        self._animation_frame = 0
+        self._last_animation = (self._animations['stills'], 0)
+        self.rect = self.surf.get_rect(center=self._spawn_pos)
+        self.entity.position = self.rect.center
+        self._moved()
 
-    def update(self, *args, **kwargs):
+    def add_internal(self, group):
+        """
+        Records that the sprite was added to a group. Moves the sprite's state
+        into a row of the entity store when it joins its first group.
+
+        Args:
+            group: the Group the sprite was added to
+        """
+        super().add_internal(group)
+        if self.entity.row is None:
+            self._game.entities.allocate(self, self.entity)
+
+    def remove_internal(self, group):
+        """
+        Records that the sprite was removed from a group. Moves the sprite's
+        state out of the entity store when it leaves its last group.
+
+        Args:
+            group: the Group the sprite was removed from
+        """
+        super().remove_internal(group)
+        if not self.alive():
+            self._release_entity()
+
+    def kill(self):
+        """
+        Removes the sprite from all groups and frees its entity store row
+        """
+        super().kill()
+        self._release_entity()
+
+    def update(self, *args, dt=constants.TICK, **kwargs):
         """
         Updates the character's current animation and does any other necessary
         changes to the character's state.
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
         """
-        if self._animation_frame >= len(self.current_animation['animations'])\
-                * self.current_animation['frame_length']:
+        self.move(self._animate(dt))
+
+    def _animate(self, dt):
+        """
+        Shows the current frame of the current animation and advances it
+
+        Args:
+            dt: a float, the seconds of game time to advance by
+
+        Returns:
+            a tuple of the (x, y) pixels to move the sprite by so the new frame
+            lines up with the last one
+        """
+        animation = self.current_animation
+        if self._animation_frame >= len(animation['animations'])\
+                * animation['frame_length']:
             self._animation_frame = 0
 
-        last_surf = self.surf
-        frame = int(self._animation_frame
-                    // self.current_animation['frame_length'])
-        self.surf = self.current_animation['animations'][frame]
-        if last_surf != self.surf:
-            self.mask = pygame.mask.from_surface(self.surf)
+        frame = int(self._animation_frame // animation['frame_length'])
+        self.surf = animation['animations'][frame]
+        self.mask = animation['masks'][frame]
 
         last_pos = self._last_animation[0]['positions'][self._last_animation[1]]
-        current_pos = self.current_animation['positions'][frame]
-        delta = (last_pos[0] - current_pos[0], last_pos[1] - current_pos[1])
-        self.move(delta)
+        current_pos = animation['positions'][frame]
 
-        self._animation_frame += 1
-        self._last_animation = (self.current_animation, frame)
+        self._animation_frame += dt * constants.FRAME_RATE
+        self._last_animation = (animation, frame)
+        return (last_pos[0] - current_pos[0], last_pos[1] - current_pos[1])
+
+    @property
+    def position(self):
+        """
+        Returns the sub-pixel position of the center of the sprite
+        """
+        position = self.entity.position
+        if self.rect.center != (utils.round_half_up(position[0]),
+                                utils.round_half_up(position[1])):
+            return self.rect.center
+        return position
 
     def move(self, delta_pos):
         """
-        Moves the sprite's current position a certain number of pixels
+        Moves the sprite's current position a certain number of pixels,
+        keeping track of the fractions of a pixel. Starts from the rect if it
+        was moved directly since the last move.
 
         Args:
-            delta_pos: tuple of 2 ints, x/y number of pixels to move
+            delta_pos: tuple of 2 floats, x/y number of pixels to move
+        """
+        position = self.position
+        position = (position[0] + delta_pos[0], position[1] + delta_pos[1])
+        self.entity.position = position
+        self.rect.center = (utils.round_half_up(position[0]),
+                            utils.round_half_up(position[1]))
+        self._moved()
+
+    def place(self, center):
         """
-        self.rect.move_ip(int(delta_pos[0]), int(delta_pos[1]))
+        Moves the rect to the sub-pixel position after something else moved
+        it in the entity store, like a system that moves many sprites at once
+
+        Args:
+            center: a tuple of 2 ints, the stored position rounded half up
+        """
+        self.rect.center = center
+        self._moved()
+
+    def _moved(self):
+        """
+        Updates the layer, any spatial indexes and the draw order after the
+        sprite's rect changes
+        """
+        layer_changed = self._layer != self.rect.bottom
         self._layer = self.rect.bottom
+        for group in self.groups():
+            if isinstance(group, SpatialGroup):
+                group.reindex(self)
+            elif layer_changed and isinstance(group, YSortedGroup):
+                group.reindex(self)
+
+    def _release_entity(self):
+        """
+        Frees the sprite's entity store row, if it has one, keeping its state
+        """
+        if self.entity.row is not None:
+            self._game.entities.release(self.entity)
 
 
 class MovingSprite(GameSprite):
@@ -163,14 +291,15 @@ class MovingSprite(GameSprite):
 
     Attributes:
         _speed: maximum speed in pixels per second
-        _current_direction: a tuple of two floats, the last direction this
-            sprite moved, on a -1 to 1 scale relative to _speed and ignoring
-            motion of the screen
         _current_facing: a Direction (Up, Down, Left, Right), which way this
             sprite is currently facing
         _obstacle_collisions: a boolean, whether to alter direction based on
             obstacle collisions
     """
+    _ANIMATION_NAMES = GameSprite._ANIMATION_NAMES + (
+        'up', 'down', 'left', 'right',
+        'still_up', 'still_down', 'still_left', 'still_right')
+
     def __init__(self, game, speed, image_path, obstacle_collisions=True,
                  spawn_pos=None):
         """
@@ -184,22 +313,7 @@ class MovingSprite(GameSprite):
             image_path: string giving the path to the character art
         """
         super().__init__(game, image_path, spawn_pos)
-        # Add the images for the other animation types to the animations
-        # dictionary
-        path = f'{constants.IMAGE_FOLDER}/{image_path}'
-        for direction in ("up", "down", "left", "right"):
-            self._animations[direction] = utils.get_animation_info(
-                f'{path}/{direction}')
-            still = f'still_{direction}'
-            self._animations[still] = {}
-            self._animations[still]['animations'] =\
-                self._animations[direction]['animations'][0:1]
-            self._animations[still]['frame_length'] =\
-                self._animations[direction]['frame_length']
-            self._animations[still]['positions'] =\
-                self._animations[direction]['positions'][0:1]
         self._speed = speed
-        self._current_direction = (0, 0)
         self._current_facing = Direction.UP
         self._obstacle_collisions = obstacle_collisions
 
@@ -213,24 +327,25 @@ class MovingSprite(GameSprite):
     @property
     def frame_speed(self):
         """
-        Returns the pixels per frame speed
+        Returns the pixels per tick speed at the frame rate
         """
-        return self._speed / constants.FRAME_RATE
+        return self._speed * constants.TICK
 
     @property
     def current_direction(self):
         """
-        Returns the last direction the sprite faced as a tuple from -1 to 1
+        Returns the last direction the sprite moved as a tuple from -1 to 1,
+        relative to its speed and ignoring motion of the screen
         """
-        return self._current_direction
+        return self.entity.direction
 
     @property
     def current_angle(self):
         """
         Returns the angle the player is currently facing in degrees
         """
-        return atan2(self._current_direction[1], self._current_direction[0])\
-            * 180 / pi
+        direction = self.entity.direction
+        return atan2(direction[1], direction[0]) * 180 / pi
 
     @property
     def current_facing(self):
@@ -255,16 +370,20 @@ class MovingSprite(GameSprite):
         """
         Returns the current animation name of the sprite based on the facing
         """
-        if self._current_direction == (0, 0):
+        if self.entity.direction == (0, 0):
             return f'still_{repr(self.current_facing)}'
         return repr(self.current_facing)
 
-    def reset(self):
+    def reset(self, spawn_pos=None):
         """
         Reset the sprite attributes
+
+        Args:
+            spawn_pos: tuple of 2 ints, a new spawn position for the sprite.
+                Defaults to None, which keeps the current spawn position
         """
-        super().reset()
-        self._current_direction = (0, 0)
+        super().reset(spawn_pos)
+        self.entity.direction = (0, 0)
         self._current_facing = Direction.UP
 
     def set_direction(self, direction):
@@ -275,17 +394,43 @@ class MovingSprite(GameSprite):
             direction: tuple of 2 floats from -1 to 1, x/y coordinates of
                 target speed as percentage of max
         """
-        self._current_direction = direction
+        self.entity.direction = direction
 
-    def update(self, *args, **kwargs):
+    def update(self, *args, dt=constants.TICK, **kwargs):
         """
         Updates the character's current position and animation. Also detects
         obstacle collisions and sets the direction accordingly.
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
+        """
+        self.steer(dt)
+        # Move sprite in desired direction
+        direction = self.entity.direction
+        self.move((direction[0] * self._speed * dt,
+                   direction[1] * self._speed * dt))
+        self.settle(dt)
+
+    def steer(self, dt=constants.TICK):
+        """
+        Does the part of an update before the sprite moves in its direction:
+        advances the animation and stops the sprite walking into obstacles.
+        Systems that move many sprites at once call this and settle around
+        their own move.
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
         """
-        super().update()
+        # Most frames line up with the last one, so they don't move the sprite
+        delta = self._animate(dt)
+        if delta[0] or delta[1]:
+            self.move(delta)
         # Detect obstacle collisions and move the sprite accordingly
         if self._obstacle_collisions:
-            collisions = utils.spritecollide(self, self._game.obstacles)
+            with profiler.PROFILER.span('collision'):
+                collisions = utils.spritecollide(self, self._game.obstacles)
             for obstacle in collisions:
                 threshold = self.rect.height * .25
                 if (obstacle.rect.bottom <= self.rect.bottom <=
@@ -295,9 +440,16 @@ class MovingSprite(GameSprite):
                          obstacle.rect.bottom and self.current_direction[1] >
                          0):
                     self.set_direction((self.current_direction[0], 0))
-        # Move sprite in desired direction
-        self.move((self.current_direction[0] * self.frame_speed,
-                   self.current_direction[1] * self.frame_speed))
+
+    def settle(self, dt=constants.TICK):  # pylint: disable=unused-argument
+        """
+        Does the part of an update after the sprite moves in its direction.
+        Moving sprites have nothing left to do.
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
+        """
 
 
 # pylint: disable=too-many-instance-attributes
@@ -309,20 +461,22 @@ class AttackingSprite(MovingSprite):
         _attacking: a boolean, True if the sprite is currently attacking and
             False if not
         _max_health: an int representing the maximum health of the sprite
-        _health: an int representing the sprite's current health
-        _max_invincibility: an int representing how many frames the sprite has
-            invincibility after being attacked
-        _invincibility: an int representing how many more frames this sprite is
-            invincible for
-        _max_knockback: an int representing the maximum number of frames this
-            sprite will be knocked back for
-        _knockback: an int representing how many more frames this sprite is
-            being knocked-back for
+        _max_invincibility: a float representing how many seconds the sprite
+            has invincibility after being attacked
+        _max_knockback: a float representing the maximum number of seconds
+            this sprite will be knocked back for
         _knockback_dist: an int representing how many pixels the sprite gets
             knocked-back after an attack
         _knockback_direction: a tuple of two floats representing which direction
             the sprite is getting knocked back in
     """
+    _ANIMATION_NAMES = MovingSprite._ANIMATION_NAMES + (
+        'attack_up', 'attack_down', 'attack_left', 'attack_right')
+    # The EventTypes emitted when the sprite is damaged and when it attacks,
+    # or None to not emit one
+    _HIT_EVENT = None
+    _ATTACK_EVENT = None
+
     # pylint: disable=too-many-arguments
     def __init__(self, game, speed, image_path, obstacle_collisions=True,
                  spawn_pos=None, max_health=1,
@@ -353,19 +507,11 @@ class AttackingSprite(MovingSprite):
         super().__init__(game, speed, image_path,
                          obstacle_collisions=obstacle_collisions,
                          spawn_pos=spawn_pos)
-        # Add attacking animations
-        path = f'{constants.IMAGE_FOLDER}/{image_path}'
-        for animation in ("attack_up", "attack_down", "attack_left",
-                          "attack_right"):
-            self._animations[animation] = utils.get_animation_info(
-                f'{path}/{animation}')
         self._attacking = False
         self._max_health = max_health
-        self._health = self._max_health
-        self._max_invincibility = invincibility_time * constants.FRAME_RATE
-        self._invincibility = 0
-        self._max_knockback = knockback_time * constants.FRAME_RATE
-        self._knockback = 0
+        self.entity.health = max_health
+        self._max_invincibility = invincibility_time
+        self._max_knockback = knockback_time
         self._knockback_dist = knockback_dist
         self._knockback_direction = (0, 0)
 
@@ -374,21 +520,21 @@ class AttackingSprite(MovingSprite):
         """
         Returns the current health of the sprite
         """
-        return self._health
+        return int(self.entity.health)
 
     @property
     def is_invincible(self):
         """
         Returns whether the sprite is currently invincible
         """
-        return self._invincibility > 0
+        return self.entity.invincibility > 0
 
     @property
     def invincibility_time(self):
         """
         Returns how much longer the sprite is invincible for in seconds
         """
-        return self._invincibility / constants.FRAME_RATE
+        return self.entity.invincibility
 
     @property
     def is_attacking(self):
@@ -398,18 +544,22 @@ class AttackingSprite(MovingSprite):
         return self._attacking
 
     @property
-    def attack_started(self):
+    def sword_mask(self):
         """
-        Returns whether the sprite just started an attack
+        Returns the mask of the sword in the displayed frame, or None if the
+        displayed frame isn't an attack
         """
-        return self.is_attacking and self._animation_frame <= 1
+        sword_masks = self.last_animation.get('sword_masks')
+        if sword_masks is None:
+            return None
+        return sword_masks[self.last_frame]
 
     @property
     def current_animation_name(self):
         """
         Returns the current animation name of the sprite as a string
         """
-        if self._knockback > 0:
+        if self.entity.knockback > 0:
             return f'still_{repr(self.current_facing)}'
         if self.is_attacking:
             return f'attack_{repr(self.current_facing)}'
@@ -420,19 +570,23 @@ class AttackingSprite(MovingSprite):
         """
         Return the sprite's current Direction facing
         """
-        if self.is_attacking or self._knockback > 0:
+        if self.is_attacking or self.entity.knockback > 0:
             return self._current_facing
         return super().current_facing
 
-    def reset(self):
+    def reset(self, spawn_pos=None):
         """
         Resets the sprite attributes
+
+        Args:
+            spawn_pos: tuple of 2 ints, a new spawn position for the sprite.
+                Defaults to None, which keeps the current spawn position
         """
-        super().reset()
+        super().reset(spawn_pos)
         self._attacking = False
-        self._health = self._max_health
-        self._invincibility = 0
-        self._knockback = 0
+        self.entity.health = self._max_health
+        self.entity.timers = (0, 0)
+        self._knockback_direction = (0, 0)
 
     def damage(self, attack_direction):
         """
@@ -444,12 +598,12 @@ class AttackingSprite(MovingSprite):
         """
         if self.is_invincible:
             return
-        self._health -= 1
-        self._invincibility = self._max_invincibility
+        self.entity.health -= 1
         dist = (attack_direction[0]**2 + attack_direction[1]**2) ** 0.5
         self._knockback_direction = (attack_direction[0] / dist,
                                      attack_direction[1] / dist)
-        self._knockback = self._max_knockback
+        self.entity.timers = (self._max_invincibility, self._max_knockback)
+        self._emit(self._HIT_EVENT)
 
     def attack(self, direction=None):
         """
@@ -464,43 +618,76 @@ class AttackingSprite(MovingSprite):
         self._current_facing = direction
         self._attacking = True
         self._animation_frame = 0
+        self._emit(self._ATTACK_EVENT)
+
+    def _emit(self, event_type):
+        """
+        Adds an event that happened to the sprite to the game's event queue
 
-    def update(self, *args, **kwargs):
+        Args:
+            event_type: the EventType of what happened, or None to not add one
         """
-        Updates the state of the sprite including animation and movement
+        if event_type is not None:
+            self._game.events.emit(event_type, self._game.ticks,
+                                   self.rect.center)
+
+    def steer(self, dt=constants.TICK):
         """
-        # Handle the sprite getting knocked back by an attack
-        if self._knockback > 0:
-            step = self._knockback_dist/self._max_knockback / self.frame_speed
-            self.set_direction((self.current_direction[0] +
+        Does the part of an update before the sprite moves in its direction,
+        adding any knockback to the direction and ending finished attacks
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
+        """
+        # Handle the sprite getting knocked back by an attack, at the speed
+        # that covers the knockback distance in the knockback time
+        entity = self.entity
+        if entity.knockback > 0:
+            step = self._knockback_dist / self._max_knockback / self._speed
+            direction = entity.direction
+            self.set_direction((direction[0] +
                                 self._knockback_direction[0] * step,
-                                self.current_direction[1] +
+                                direction[1] +
                                 self._knockback_direction[1] * step))
-        super().update()
+        super().steer(dt)
         # Handle the sprite attacking
-        if self._attacking and self._animation_frame == len(
+        if self._attacking and self._animation_frame >= len(
                     self.current_animation['animations']) * int(
                     self.current_animation['frame_length']):
             self._attacking = False
-        # Handle if the sprite is invincible and flash the image
-        if self.is_invincible:
-            self._invincibility -= 1
-            if (self.invincibility_time // constants.TRANSPARENT_TIME) \
-                    % 2 == 0:
-                self.surf.set_alpha(255)
-            else:
-                self.surf.set_alpha(constants.INVINCIBILITY_ALPHA)
-        else:
-            self.surf.set_alpha(255)
+
+    def settle(self, dt=constants.TICK):
+        """
+        Does the part of an update after the sprite moves in its direction,
+        counting down the invincibility and knockback from the last hit
+
+        Args:
+            dt: a float, the seconds of game time to advance by. Defaults to
+                one tick at the frame rate
+        """
+        # Handle if the sprite is invincible and flash the image by switching
+        # to the pre-faded copy of the current frame
+        entity = self.entity
+        invincibility = entity.invincibility
+        if invincibility > 0:
+            invincibility = utils.count_down(invincibility, dt)
+            entity.invincibility = invincibility
+            if (invincibility // constants.TRANSPARENT_TIME) % 2 != 0:
+                animation, frame = self._last_animation
+                self.surf = animation['faded'][frame]
         # Change the knockback time left
-        if self._knockback > 0:
-            self._knockback -= 1
+        if entity.knockback > 0:
+            entity.knockback = utils.count_down(entity.knockback, dt)
 
 
 class Player(AttackingSprite):
     """
     A sprite for the player
     """
+    _HIT_EVENT = EventType.PLAYER_HIT
+    _ATTACK_EVENT = EventType.PLAYER_ATTACK
+
     def __init__(self, game):
         """
         Initializes the player
@@ -512,30 +699,34 @@ class Player(AttackingSprite):
                          max_health=constants.PLAYER_HEALTH,
                          invincibility_time=constants.PLAYER_INVINCIBILITY)
 
-    def set_direction(self, direction):
+    def set_direction(self, direction, dt=constants.TICK):
         """
         Sets the current direction and ensures that it can't go off screen
 
         Args:
             direction: tuple of 2 floats from -1 to 1, x/y coordinates of
                 target speed as percentage of max
+            dt: a float, the seconds of game time the next move will take.
+                Defaults to one tick at the frame rate
         """
-        delta_pos = (direction[0] * self.frame_speed,
-                     direction[1] * self.frame_speed)
+        delta_pos = (direction[0] * self._speed * dt,
+                     direction[1] * self._speed * dt)
         if self.rect.left + delta_pos[0] < 0\
           or self.rect.right + delta_pos[0] > constants.SCREEN_WIDTH:
-            self._current_direction = (0, direction[1])
+            self.entity.direction = (0, direction[1])
         elif self.rect.top + delta_pos[1] < 0\
            or self.rect.bottom + delta_pos[1] > constants.SCREEN_HEIGHT:
-            self._current_direction = (direction[0], 0)
+            self.entity.direction = (direction[0], 0)
         else:
-            self._current_direction = direction
+            self.entity.direction = direction
 
 
 class Demon(AttackingSprite):
     """
     A sprite for all the enemies
     """
+    _HIT_EVENT = EventType.DEMON_HIT
+
     def __init__(self, game, spawn_pos=None):
         """
         Initializes the demon
@@ -552,7 +743,12 @@ class Demon(AttackingSprite):
 
 class Flashlight(MovingSprite):
     """
-    A transparent sprite for the flashlight beam
+    A transparent sprite for the flashlight beam. It doesn't move on its own,
+    but follows the player as drawn.
+
+    Attributes:
+        _player_animation: a string, the animation name of the player the
+            flashlight last followed
     """
     def __init__(self, game):
         """
@@ -564,15 +760,36 @@ class Flashlight(MovingSprite):
         super().__init__(game, constants.PLAYER_SPEED, 'flashlight',
                          obstacle_collisions=False,
                          spawn_pos=constants.FLASHLIGHT_SPAWN)
+        self._player_animation = 'still_up'
 
     @property
     def current_animation_name(self):
         """
         Returns the current animation name of the flashlight
         """
-        player_ani = self._game.player.current_animation_name
+        player_ani = self._player_animation
         return player_ani[player_ani.find('_') + 1:]
 
+    def follow(self, x, animation_name, dt=constants.TICK):
+        """
+        Points the flashlight the way the player faces and moves it across the
+        screen with them
+
+        Args:
+            x: a float, the player's x position without their frame offset, or
+                None to leave the flashlight where it is
+            animation_name: a string, the player's current animation name
+            dt: a float, the seconds of game time to advance the animation
+                by. Defaults to one tick at the frame rate
+        """
+        self._player_animation = animation_name
+        self.update(dt=dt)
+        if x is not None:
+            # The frames are offset to shine ahead of the player
+            x += constants.FLASHLIGHT_SPAWN[0] - constants.SCREEN_WIDTH / 2\
+                + self.frame_offset[0]
+            self.move((x - self.position[0], 0))
+
 
 class Obstacle(GameSprite):
     """
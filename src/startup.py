@@ -0,0 +1,194 @@
+"""
+Startup time report for Point of No Return
+
+Starts the game in fresh interpreters up to the first frame of the start menu,
+on SDL's dummy drivers, and reports how long each module took to import and
+each stage of startup took:
+    python -m src.startup
+    python -m src.startup --runs 10 --save-baseline startup.json
+    python -m src.startup --baseline startup.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import numpy as np
+from src.bench import METRICS, baseline_main, summarize
+
+# The folder src is in, to run the game from
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stages of startup reported by python -m src.main --startup-report, then the
+# time to import src.main and the time until the first frame including
+# starting the interpreter
+STAGES = ('init', 'game', 'view', 'menu')
+COLUMNS = ('imports',) + STAGES + ('first_frame', 'process')
+
+# The fewest milliseconds a package outside src can take to import and still
+# be listed in the report
+MIN_IMPORT_MS = 5
+
+_IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def _environment():
+    """
+    Returns the environment to start the game in, with SDL's dummy drivers
+    """
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    return env
+
+
+def parse_import_times(text):
+    """
+    Reads the output of python -X importtime
+
+    Args:
+        text: a string, the output to read
+
+    Returns:
+        a dict mapping module names, in the order they were imported, to a
+        dict of the milliseconds the module took by itself ('self'), with the
+        modules it imported ('cumulative') and how deep in the imports it was
+        ('depth', 0 for the module imported on the command line)
+    """
+    modules = {}
+    for match in _IMPORT_LINE.finditer(text):
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = {'self': int(self_us) / 1000,
+                         'cumulative': int(cumulative_us) / 1000,
+                         'depth': (len(indent) - 1) // 2}
+    return modules
+
+
+def import_times(module='src.main'):
+    """
+    Imports a module in a fresh interpreter and times every import
+
+    Args:
+        module: a string, the module to import
+
+    Returns:
+        a dict of import times, as returned by parse_import_times
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             f'import {module}'],
+                            cwd=ROOT, env=_environment(), capture_output=True,
+                            text=True, check=True)
+    return parse_import_times(result.stderr)
+
+
+def first_frame():
+    """
+    Starts the game in a fresh interpreter and stops after the first frame of
+    the start menu
+
+    Returns:
+        a dict mapping each stage of startup, 'first_frame' for all of them
+        and 'process' for the whole run including starting the interpreter to
+        milliseconds. If the game couldn't start, the dict only has 'skipped'
+        with the reason.
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-m', 'src.main',
+                             '--startup-report'],
+                            cwd=ROOT, env=_environment(), capture_output=True,
+                            text=True, check=False)
+    process = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        errors = result.stderr.strip().splitlines()
+        return {'skipped': errors[-1] if errors else 'the game failed'}
+    stages = json.loads(result.stdout.strip().splitlines()[-1])
+    times = {stage: stages.get(stage, 0.0) for stage in STAGES}
+    times['first_frame'] = stages['total']
+    times['process'] = process
+    return times
+
+
+def run(runs):
+    """
+    Measures startup a number of times
+
+    Args:
+        runs: an int, how many times to start the game
+
+    Returns:
+        a dict in the format of the benchmark results, with the number of runs
+        as the ticks and a subsystem for each of COLUMNS, and the import times
+        of the last run under 'imports'. If the game couldn't start, the dict
+        only has 'skipped' with the reason.
+    """
+    times = np.zeros((runs, len(COLUMNS)))
+    imports = {}
+    for row in range(runs):
+        imports = import_times()
+        stages = first_frame()
+        if 'skipped' in stages:
+            return stages
+        stages['imports'] = imports['src.main']['cumulative']
+        times[row] = [stages[column] / 1000 for column in COLUMNS]
+    return {'ticks': runs, 'sprites': 0, 'memory_peak': None,
+            'subsystems': summarize(list(COLUMNS), times, total=None),
+            'imports': imports}
+
+
+def print_report(result):
+    """
+    Prints the slowest imports and a table of the startup stages
+
+    Args:
+        result: a dict of results from run
+    """
+    if 'skipped' in result:
+        print(f'startup: skipped ({result["skipped"]})')
+        return
+    print(f'{"module":<28}{"self":>10}{"cumulative":>12} (ms)')
+    for name, stats in sorted(result['imports'].items(),
+                              key=lambda item: -item[1]['cumulative']):
+        if name.startswith('src') or ('.' not in name and
+                                      stats['cumulative'] >= MIN_IMPORT_MS):
+            print(f'{name:<28}{stats["self"]:>10.1f}'
+                  f'{stats["cumulative"]:>12.1f}')
+    print(f'\nstartup over {result["ticks"]} runs')
+    print(f'  {"stage":<12}' + ''.join(f'{metric:>10}' for metric in METRICS)
+          + ' (ms)')
+    for stage, stats in result['subsystems'].items():
+        print(f'  {stage:<12}' + ''.join(f'{stats[metric]:>10.1f}'
+                                          for metric in METRICS))
+
+
+def main(argv=None):
+    """
+    Parses the command line, measures startup, prints the report and compares
+    it against a baseline
+
+    Args:
+        argv: a list of command line arguments. Defaults to None, which uses
+            sys.argv
+
+    Returns:
+        an int exit code, 1 if any stage regressed past the threshold
+    """
+    parser = argparse.ArgumentParser(
+        description='Measure the startup time of Point of No Return')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='how many times to start the game')
+
+    def measure(args):
+        """
+        Starts the game the chosen number of times and prints the report
+        """
+        results = {'startup': run(args.runs)}
+        print_report(results['startup'])
+        return results
+
+    return baseline_main(parser, measure, argv, memory=False, min_delta=1)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,25 +2,40 @@
 Utility helper functions for Point of No Return
 """
 import json
+import math
 import os
+import numpy as np
 import pygame
 import src.constants as constants
+from src.groups import SpatialGroup
 
 
-def get_animation_info(path):
+def get_animation_info(path, sword_masks=False, faded=False):
     """
     Compiles all animation information in a given folder
 
     Args:
         path: a string, the path to the target folder
+        sword_masks: a boolean, whether to also build a mask of the sword
+            pixels in each image. Defaults to False
+        faded: a boolean, whether to also make a translucent copy of each
+            image. Defaults to False
 
     Returns:
-        a dict with three elements:
+        a dict with five elements:
             'animations' maps to a list of images,
             'frame_length' maps to a float, how many src frames to display each
                 animation frame
             'positions' maps to a list of 2-element tuples, the offset for each
                 frame in the animation
+            'masks' maps to a list of collision masks, one for each image
+            'rects' maps to a list of Rects, the bounding rect of the visible
+                pixels in each image
+        if faded is True, another element:
+            'faded' maps to a list of translucent copies of the images, for
+                flashing sprites while they are invincible
+        and if sword_masks is True, another element:
+            'sword_masks' maps to a list of masks of the sword in each image
     """
     animation_info = {}
     with open(f'{path}/info.json') as info:
@@ -35,9 +50,37 @@ def get_animation_info(path):
         animation_info['animations'].append(pygame.image.load(
             f'{path}/{counter}.png').convert_alpha())
         counter += 1
+    animation_info['masks'] = [pygame.mask.from_surface(image)
+                               for image in animation_info['animations']]
+    animation_info['rects'] = [image.get_bounding_rect()
+                               for image in animation_info['animations']]
+    if faded:
+        animation_info['faded'] = [
+            fade(image, constants.INVINCIBILITY_ALPHA)
+            for image in animation_info['animations']]
+    if sword_masks:
+        animation_info['sword_masks'] = [
+            get_sword_mask(image) for image in animation_info['animations']]
     return animation_info
 
 
+def fade(image, alpha):
+    """
+    Makes a translucent copy of an image by scaling the alpha of every pixel,
+    so it can be blitted without surface alpha
+
+    Args:
+        image: a Surface with per pixel alpha
+        alpha: an int from 0-255, the alpha to scale opaque pixels to
+
+    Returns:
+        a new Surface, the faded copy of image
+    """
+    faded = image.copy()
+    faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    return faded
+
+
 def is_sword(color):
     """
     Finds if a certain pixel is part of the character's sword. This is defined
@@ -61,6 +104,34 @@ def is_sword(color):
     return 100 < average_value < 225
 
 
+def get_sword_mask(image):
+    """
+    Finds all the pixels of an image that are part of the character's sword,
+    using the same definition as is_sword for every pixel at once
+
+    Args:
+        image: a Surface with per-pixel alpha
+
+    Returns:
+        a Mask of the visible pixels in image that are part of the sword
+    """
+    rgb = pygame.surfarray.array3d(image).astype(float)
+    red, green, blue = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    average_value = (red + green + blue) / 3
+    max_diff = average_value * 0.05
+    sword = (abs(red - green) <= max_diff) & (abs(red - blue) <= max_diff) &\
+        (abs(green - blue) <= max_diff) & (100 < average_value) &\
+        (average_value < 225)
+    # Only count pixels that are part of the image's collision mask
+    sword &= pygame.surfarray.array_alpha(image) > 127
+
+    sword_surf = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    alpha = pygame.surfarray.pixels_alpha(sword_surf)
+    alpha[...] = np.where(sword, 255, 0)
+    del alpha  # unlock the surface
+    return pygame.mask.from_surface(sword_surf)
+
+
 def touching_sword(player, demon):
     """
     Determines whether the demon has been hit by the player's sword
@@ -73,10 +144,11 @@ def touching_sword(player, demon):
     """
     if not player.is_attacking:
         return False
-    collide = pygame.sprite.collide_mask(player, demon)
-    if collide is None:
+    sword_mask = player.sword_mask
+    if sword_mask is None:
         return False
-    return is_sword(player.surf.get_at(collide))
+    offset = (demon.rect.x - player.rect.x, demon.rect.y - player.rect.y)
+    return sword_mask.overlap(demon.mask, offset) is not None
 
 
 def spritecollide(sprite, group):
@@ -89,24 +161,55 @@ def spritecollide(sprite, group):
 
     Returns a list of sprites from the group that are colliding with sprite
     """
+    if isinstance(group, SpatialGroup):
+        return group.collide(sprite)
     return pygame.sprite.spritecollide(sprite, group, False,
                                        collided=lambda s1, s2: pygame.sprite
                                        .collide_mask(s1, s2) is not None)
 
 
-def blit_alpha(target, source, location, opacity, special_flags=None):
+def count_down(timer, dt):
+    """
+    Counts a timer down without letting float error leave a sliver of time
+
+    Args:
+        timer: a float, the seconds left on the timer
+        dt: a float, the seconds that passed
+
+    Returns:
+        a float, the seconds left, or 0 if the timer ran out
+    """
+    timer -= dt
+    return timer if timer > constants.TIME_EPSILON else 0
+
+
+def round_half_up(value):
     """
-    Blits the source onto the target at the specified location and opacity
+    Rounds a float to the nearest int, rounding halves up so a sprite moves
+    the same way in both directions
 
     Args:
-        target: a Surface to blit onto
-        source: a Surface that gets made transparent and is put on target
-        location: an (x, y) tuple, where to put source on target
-        opacity: an int from 0-255, what to set alpha to
-        special_flags: optional, any special flags from pygame to pass to blit
-    """
-    temp = pygame.Surface((source.get_width(), source.get_height()),
-                          pygame.SRCALPHA)
-    temp.fill((0, 0, 0, opacity))
-    temp.blit(source, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-    target.blit(temp, location, special_flags=special_flags)
+        value: a float to round
+    """
+    return math.floor(value + 0.5)
+
+
+def merge_rects(rects):
+    """
+    Merges overlapping rects into their unions until none of them overlap
+
+    Args:
+        rects: a list of Rects
+
+    Returns:
+        a list of new Rects that don't overlap and cover every rect in rects
+    """
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -2,11 +2,49 @@
 View classes for Point of No Return
 """
 from abc import ABC, abstractmethod
+import functools
 import pygame
-import pygame_menu
 import src.constants as constants
+import src.profiler as profiler
 import src.sprites as sprites
-from src.utils import blit_alpha
+from src.audio import AudioManager
+from src.lighting import Lighting
+from src.preloader import Preloader
+from src.events import EventType
+from src.snapshot import Interpolator
+from src.utils import merge_rects
+
+# The sound effect played for each kind of event. A kill has no sound of its
+# own, since the hit that killed the demon already plays one
+SOUND_EFFECTS = {
+    EventType.PLAYER_HIT: 'player_hit',
+    EventType.PLAYER_ATTACK: 'player_attack',
+    EventType.PLAYER_DIED: 'player_hit',
+    EventType.DEMON_HIT: 'demon_hit',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def game_theme():
+    """
+    Returns the theme of every menu, building it the first time a menu needs
+    it since it loads the menu background from disk
+    """
+    # Only the menus need pygame_menu, so importing the view doesn't load it
+    import pygame_menu  # pylint: disable=import-outside-toplevel
+    return pygame_menu.themes.Theme(
+        background_color=pygame_menu.baseimage.BaseImage(
+            constants.MENU_BACKGROUND),
+        selection_color=constants.MENU_SELECTION_COLOR,
+        title_bar_style=pygame_menu.widgets.MENUBAR_STYLE_NONE,
+        title_close_button=False,
+        title_font=pygame_menu.font.FONT_8BIT,
+        title_font_size=constants.MENU_TITLE_FONT_SIZE,
+        title_offset=constants.MENU_TITLE_OFFSET,
+        widget_font=pygame_menu.font.FONT_BEBAS,
+        widget_font_size=constants.MENU_WIDGET_FONT_SIZE,
+        widget_padding=constants.MENU_WIDGET_PADDING
+    )
 
 
 class View(ABC):
@@ -33,131 +71,144 @@ class View(ABC):
         return
 
     @abstractmethod
-    def draw(self):
+    def draw(self, dt=constants.TICK, frame=None):
         """
         Draws the game based on current state
+
+        Args:
+            dt: a float, the seconds of game time since the last draw
+            frame: a Frame of snapshots to draw instead of the game as it is.
+                Defaults to None, which draws the game as it is
         """
         return
 
 
-class GraphicView(View):
+class GraphicView(View):  # pylint: disable=too-many-instance-attributes
     """
-    Draws game in pygame graphic window
+    Draws game in pygame graphic window. The menus, music and sound effects are
+    only built or loaded the first time they are needed, so the start menu
+    shows as soon as possible.
 
     Attributes:
         _screen: a screen to display the game items on
-        _start_menu: a pygame_menu with the start menu for the game
-        _controls_menu: a pygame_menu to display the controls for the game
-        _pause_menu: a pygame_menu that displays when paused
-        _end_menu: a pygame_menu with the end menu for the game
-        _sound_effects: a dict mapping actions (strings) to Sounds
+        _menus: a dict mapping the names of the menus built so far ('start',
+            'controls', 'end' and 'pause') to their pygame_menus
+        _audio: the AudioManager that plays the sound effects
+        _music_loaded: a boolean, whether the background music is loaded
+        _preloader: the Preloader loading the media in the background
         _flashlight: a Flashlight beam to draw on the screen
+        _lighting: the Lighting with the darkness overlay to draw over the
+            sprites
+        _interpolator: the Interpolator that places the sprites when drawing
+            from snapshots
+        _dirty_rects: a boolean, whether to only redraw the parts of the
+            screen that changed since the last frame
+        _drawn: a dict mapping each sprite drawn last frame (including the
+            flashlight) to a tuple of the Rect its surf covered and the surf
+        _full_redraw: a boolean, whether the next frame has to redraw the
+            whole screen, because a menu drew over it
     """
 
-    def __init__(self, game, screen):
+    def __init__(self, game, screen, dirty_rects=constants.DIRTY_RECTS,
+                 preloader=None):
         """
         Initializes a graphical view
 
         Args:
             game: a Game, the src model to monitor
             screen: the Screen to display the graphics on
+            dirty_rects: a boolean, whether to only redraw the parts of the
+                screen that changed since the last frame
+            preloader: a started Preloader to take the sound effects from and
+                show the progress of on the start menu. Defaults to None,
+                which loads the sound effects when they are first played
         """
         super().__init__(game)
+        self._preloader = Preloader() if preloader is None else preloader
         self._screen = screen
-        self._start_menu = pygame_menu.Menu('Point of No Return',
-                                            constants.SCREEN_WIDTH,
-                                            constants.SCREEN_HEIGHT,
-                                            theme=constants.GAME_THEME)
-        self._start_menu.add.button('Play', self.start_game)
-        self._start_menu.add.button('Controls', self.controls_menu)
-        self._start_menu.add.button('Quit', pygame_menu.events.EXIT)
-
-        self._controls_menu = pygame_menu.Menu('CONTROLS',
-                                               constants.SCREEN_WIDTH,
-                                               constants.SCREEN_HEIGHT,
-                                               theme=constants.GAME_THEME)
-        self._controls_menu.add.label('Move: WASD').update_font({
-            'color': constants.CONTROL_COLOR,
-            'size': constants.CONTROL_SIZE})
-        self._controls_menu.add.label('Attack: Arrow Keys').update_font({
-            'color': constants.CONTROL_COLOR,
-            'size': constants.CONTROL_SIZE})
-        self._controls_menu.add.label('Attack Current Direction: Space')\
-            .update_font({'color': constants.CONTROL_COLOR,
-                          'size': constants.CONTROL_SIZE})
-        self._controls_menu.add.label('Pause: Esc').update_font({
-            'color': constants.CONTROL_COLOR,
-            'size': constants.CONTROL_SIZE})
-        self._controls_menu.add.button('Back', self.main_menu).update_font({
-            'color': constants.CONTROL_COLOR,
-            'size': constants.CONTROL_SIZE})
-
-        self._end_menu = pygame_menu.Menu('GAME OVER',
-                                          constants.SCREEN_WIDTH,
-                                          constants.SCREEN_HEIGHT,
-                                          theme=constants.GAME_THEME)
-        self._end_menu.add.label(f'Score: {self._game.score}',
-                                 label_id='score')\
-            .update_font({'color': constants.SCORE_COLOR,
-                          'size': constants.SCORE_SIZE})
-        self._end_menu.add.button('Restart', self.restart_game)
-        self._end_menu.add.button('Main  Menu', self.main_menu)
-
-        self._pause_menu = pygame_menu.Menu('PAUSED',
-                                            constants.SCREEN_WIDTH,
-                                            constants.SCREEN_HEIGHT,
-                                            theme=constants.GAME_THEME)
-        self._pause_menu.add.button('Resume', self.unpause)
-        self._pause_menu.add.button('Main  Menu', self.main_menu)
-        pygame.mixer.music.load(
-            f'{constants.AUDIO_FOLDER}/background_music.mp3')
-        self._sound_effects = {
-            'player_attack': pygame.mixer.Sound(
-                f'{constants.AUDIO_FOLDER}/player_attack.wav'),
-            'player_hit': pygame.mixer.Sound(
-                f'{constants.AUDIO_FOLDER}/player_hit.wav'),
-            'demon_hit': pygame.mixer.Sound(
-                f'{constants.AUDIO_FOLDER}/demon_hit.wav')
-        }
+        self._dirty_rects = dirty_rects
+        self._drawn = {}
+        self._full_redraw = True
+        self._menus = {}
+        self._audio = AudioManager(self._preloader.sound)
+        self._music_loaded = False
         self._flashlight = sprites.Flashlight(self._game)
+        self._lighting = Lighting()
+        self._interpolator = Interpolator()
 
-    def setup(self):
+    @property
+    def audio(self):
+        """
+        Returns the AudioManager that plays the sound effects
+        """
+        return self._audio
+
+    def setup(self, loop=True):
         """
         Sets up the pygame screen by filling it and starting the start screen
+
+        Args:
+            loop: a boolean, whether to run the start menu until the game
+                starts. False only draws its first frame
         """
         self._screen.fill((0, 0, 255))
-        self.main_menu()
+        self.main_menu(loop)
 
-    def main_menu(self):
+    def main_menu(self, loop=True):
         """
         Sets up start menu, resetting anything from the end menu
+
+        Args:
+            loop: a boolean, whether to run the start menu until the game
+                starts. False only draws its first frame
         """
-        if not self._start_menu.is_enabled():
+        start_menu = self._menu('start')
+        if not start_menu.is_enabled():
             self._game.restart()
-            self._controls_menu.disable()
-            self._pause_menu.disable()
-            self._end_menu.disable()
-            self._start_menu.enable()
+            for menu in self._menus.values():
+                menu.disable()
+            start_menu.enable()
             self._flashlight = sprites.Flashlight(self._game)
+        if not self._music_loaded:
+            pygame.mixer.music.load(
+                f'{constants.AUDIO_FOLDER}/background_music.mp3')
+            self._music_loaded = True
         pygame.mixer.music.play(-1)
-        self._start_menu.mainloop(self._screen)
+        start_menu.mainloop(self._screen, self._show_progress,
+                            disable_loop=not loop)
+
+    def _show_progress(self):
+        """
+        Shows how much of the media has loaded on the start menu, handing the
+        finished animations to the asset registry
+        """
+        label = self._menu('start').get_widget('loading')
+        if self._preloader.collect():
+            title = ''
+        else:
+            title = f'Loading {self._preloader.progress:.0%}'
+        if label.get_title() != title:
+            label.set_title(title)
 
     def controls_menu(self):
         """
         Sets up the controls menu
         """
-        self._start_menu.disable()
-        self._controls_menu.enable()
-        self._controls_menu.mainloop(self._screen)
+        self._menu('start').disable()
+        controls_menu = self._menu('controls')
+        controls_menu.enable()
+        controls_menu.mainloop(self._screen)
 
     def start_game(self):
         """
         Start the game and disable the start menu
         """
+        # Make sure nothing is left to load from disk once the game starts
+        self._preloader.finish()
         for _ in pygame.event.get():
             continue  # clear any spawn demon events
         self._game.running = True
-        self._start_menu.disable()
+        self._menu('start').disable()
 
     def restart_game(self):
         """
@@ -166,7 +217,7 @@ class GraphicView(View):
         for _ in pygame.event.get():
             continue  # clear any spawn demon events
         self._game.restart()
-        self._end_menu.disable()
+        self._menu('end').disable()
         self._flashlight = sprites.Flashlight(self._game)
 
     def unpause(self):
@@ -174,67 +225,272 @@ class GraphicView(View):
         Unpause the game and disable the pause menu
         """
         self._game.paused = False
-        self._pause_menu.disable()
+        self._menu('pause').disable()
+
+    def _menu(self, name):
+        """
+        Returns a menu, building it the first time it is needed
+
+        Args:
+            name: a string, the menu's name: 'start', 'controls', 'end' or
+                'pause'
+        """
+        menu = self._menus.get(name)
+        if menu is None:
+            import pygame_menu  # pylint: disable=import-outside-toplevel
+            builders = {'start': self._build_start_menu,
+                        'controls': self._build_controls_menu,
+                        'end': self._build_end_menu,
+                        'pause': self._build_pause_menu}
+            menu = self._menus[name] = builders[name](pygame_menu)
+        return menu
 
-    def draw(self):
+    def _build_start_menu(self, pygame_menu):
         """
-        Displays the current game state
+        Returns a new start menu
+
+        Args:
+            pygame_menu: the pygame_menu module to build the menu with
         """
-        self._screen.fill((255, 0, 0))
+        start_menu = pygame_menu.Menu('Point of No Return',
+                                      constants.SCREEN_WIDTH,
+                                      constants.SCREEN_HEIGHT,
+                                      theme=game_theme())
+        start_menu.add.button('Play', self.start_game)
+        start_menu.add.button('Controls', self.controls_menu)
+        start_menu.add.button('Quit', pygame_menu.events.EXIT)
+        start_menu.add.label('', label_id='loading').update_font({
+            'color': constants.CONTROL_COLOR,
+            'size': constants.CONTROL_SIZE})
+        return start_menu
 
+    def _build_controls_menu(self, pygame_menu):
+        """
+        Returns a new menu that displays the controls
+
+        Args:
+            pygame_menu: the pygame_menu module to build the menu with
+        """
+        controls_menu = pygame_menu.Menu('CONTROLS',
+                                         constants.SCREEN_WIDTH,
+                                         constants.SCREEN_HEIGHT,
+                                         theme=game_theme())
+        font = {'color': constants.CONTROL_COLOR,
+                'size': constants.CONTROL_SIZE}
+        controls_menu.add.label('Move: WASD').update_font(font)
+        controls_menu.add.label('Attack: Arrow Keys').update_font(font)
+        controls_menu.add.label('Attack Current Direction: Space')\
+            .update_font(font)
+        controls_menu.add.label('Pause: Esc').update_font(font)
+        controls_menu.add.button('Back', self.main_menu).update_font(font)
+        return controls_menu
+
+    def _build_end_menu(self, pygame_menu):
+        """
+        Returns a new game over menu
+
+        Args:
+            pygame_menu: the pygame_menu module to build the menu with
+        """
+        end_menu = pygame_menu.Menu('GAME OVER',
+                                    constants.SCREEN_WIDTH,
+                                    constants.SCREEN_HEIGHT,
+                                    theme=game_theme())
+        end_menu.add.label(f'Score: {self._game.score}', label_id='score')\
+            .update_font({'color': constants.SCORE_COLOR,
+                          'size': constants.SCORE_SIZE})
+        end_menu.add.button('Restart', self.restart_game)
+        end_menu.add.button('Main  Menu', self.main_menu)
+        return end_menu
+
+    def _build_pause_menu(self, pygame_menu):
+        """
+        Returns a new pause menu
+
+        Args:
+            pygame_menu: the pygame_menu module to build the menu with
+        """
+        pause_menu = pygame_menu.Menu('PAUSED',
+                                      constants.SCREEN_WIDTH,
+                                      constants.SCREEN_HEIGHT,
+                                      theme=game_theme())
+        pause_menu.add.button('Resume', self.unpause)
+        pause_menu.add.button('Main  Menu', self.main_menu)
+        return pause_menu
+
+    def draw(self, dt=constants.TICK, frame=None):
+        """
+        Displays the current game state, or the state between two snapshots of
+        it when the game is simulated apart from drawing
+
+        Args:
+            dt: a float, the seconds of game time since the last draw, to
+                animate the flashlight by. Defaults to one tick at the frame
+                rate
+            frame: a Frame of the last two snapshots of the game to draw
+                between. Defaults to None, which draws the game as it is
+        """
+        # The menus open from the game as it is, while snapshots may trail it
+        alive = self._game.player.alive() if frame is None\
+            else frame.current.alive
+        # The menus block until closed, so play what happened before they open
+        self._play_sounds(self._game.events.drain() if frame is None
+                          else frame.events)
         if self._game.paused:
-            self._pause_menu.enable()
-            self._pause_menu.mainloop(self._screen)
+            pause_menu = self._menu('pause')
+            pause_menu.enable()
+            pause_menu.mainloop(self._screen)
+            self._full_redraw = True
 
-        if not self._game.player.alive():
-            pygame.mixer.Sound.play(self._sound_effects['player_hit'])
-            self._end_menu.enable()
-            self._end_menu.get_widget('score')\
+        if not alive:
+            end_menu = self._menu('end')
+            end_menu.enable()
+            end_menu.get_widget('score')\
                 .set_title(f'Score:  {self._game.score}')
-            self._end_menu.mainloop(self._screen)
+            end_menu.mainloop(self._screen)
+            self._full_redraw = True
+
+        if frame is None:
+            player = self._game.player
+            entities = self._game.all_sprites.sprites()
+            dark = self._update_lighting(
+                dt, player.position[0] - player.frame_offset[0],
+                player.current_animation_name)
+            status = (player.health, player.invincibility_time)
+        else:
+            entities = self._interpolator.sprites(frame.previous,
+                                                  frame.current, frame.alpha)
+            drawn = self._interpolator.sprite(frame.current.player)
+            dark = self._update_lighting(
+                dt, None if drawn is None
+                else drawn.rect.centerx - frame.current.offset[0],
+                frame.current.animation)
+            status = (frame.current.health, frame.current.invincibility_time)
+        dirty = self._dirty_areas(entities) if self._dirty_rects else None
+
+        if dirty is None or self._full_redraw:
+            self._render(entities, dark, status)
+            with profiler.PROFILER.span('flip'):
+                pygame.display.flip()
+            self._full_redraw = False
+            return
+
+        rects = [self._drawn[entity][0] for entity in entities]
+        for area in dirty:
+            self._render([entities[index]
+                          for index in area.collidelistall(rects)], dark,
+                         status, area)
+        with profiler.PROFILER.span('flip'):
+            pygame.display.update(dirty)
+
+    def _play_sounds(self, events):
+        """
+        Plays the sound effects for what happened since the last frame
+
+        Args:
+            events: an iterable of the Events since the last frame
+        """
+        for event in events:
+            name = SOUND_EFFECTS.get(event.type)
+            if name is not None:
+                self._audio.play(name)
+
+    def _update_lighting(self, dt, x, animation_name):
+        """
+        Moves the flashlight with the player and cuts it out of the darkness
+        overlay
+
+        Args:
+            dt: a float, the seconds of game time to advance the flashlight's
+                animation by
+            x: a float, the player's x position as drawn without their frame
+                offset, or None if the player isn't drawn
+            animation_name: a string, the player's current animation name
+
+        Returns:
+            a screen sized Surface of darkness with the flashlight cut out
+        """
+        with profiler.PROFILER.span('lighting'):
+            self._flashlight.follow(x, animation_name, dt)
+            return self._lighting.update(self._flashlight.surf,
+                                         self._flashlight.rect)
+
+    def _dirty_areas(self, entities):
+        """
+        Finds the parts of the screen that changed since the last frame: where
+        sprites and the flashlight were and are now if they moved or changed
+        image, where removed sprites were, and the health bar
+
+        Args:
+            entities: a list of the sprites to draw this frame
+
+        Returns:
+            a list of non-overlapping Rects to redraw, or None if they cover
+            too much of the screen to be worth redrawing separately
+        """
+        drawn = {}
+        dirty = [pygame.Rect(constants.HEALTH_BAR_RECT)]
+        for sprite in entities + [self._flashlight]:
+            # Frames can be bigger than the rect, and are blitted in full
+            current = (pygame.Rect(sprite.rect.topleft, sprite.surf.get_size()),
+                       sprite.surf)
+            drawn[sprite] = current
+            previous = self._drawn.pop(sprite, None)
+            if previous is None:
+                dirty.append(current[0])
+            elif previous[0] != current[0] or previous[1] is not current[1]:
+                dirty.append(previous[0])
+                dirty.append(current[0])
+        # Whatever is left was drawn last frame and is gone now
+        dirty.extend(rect for rect, _ in self._drawn.values())
+        self._drawn = drawn
+
+        screen_rect = self._screen.get_rect()
+        dirty = merge_rects([rect.clip(screen_rect) for rect in dirty
+                             if rect.colliderect(screen_rect)])
+        if sum(rect.width * rect.height for rect in dirty)\
+                > screen_rect.width * screen_rect.height\
+                * constants.DIRTY_RECT_MAX_FRACTION:
+            return None
+        return dirty
+
+    def _render(self, entities, dark, status, area=None):
+        """
+        Draws the background, sprites, darkness and health bar
+
+        Args:
+            entities: a list of the sprites to draw, in draw order
+            dark: the Surface of darkness to draw over the sprites
+            status: a tuple of the player's health and invincibility time in
+                seconds, for the health bar
+            area: a Rect to draw inside of. Defaults to None, which draws the
+                whole screen
+        """
+        self._screen.set_clip(area)
+        self._screen.fill(constants.BACKGROUND_COLOR)
 
         # Display all entities
-        for entity in self._game.all_sprites:
-            if isinstance(entity, sprites.Demon) and entity.invincibility_time\
-                    == constants.DEFAULT_INVINCIBILITY:
-                pygame.mixer.Sound.play(self._sound_effects['demon_hit'])
-            self._screen.blit(entity.surf, entity.rect)
-
-        if self._game.player.invincibility_time ==\
-                constants.DEFAULT_INVINCIBILITY:
-            pygame.mixer.Sound.play(self._sound_effects['player_hit'])
-        if self._game.player.attack_started:
-            pygame.mixer.Sound.play(self._sound_effects['player_attack'])
-        if self._game.demons_killed > 0:
-            pygame.mixer.Sound.play(self._sound_effects['demon_hit'])
+        with profiler.PROFILER.span('sprites'):
+            for entity in entities:
+                self._screen.blit(entity.surf, entity.rect)
 
         # Lighting circle around player
-        dark = pygame.Surface(constants.SCREEN_SIZE, pygame.SRCALPHA)
-        dark.fill((0, 0, 0, constants.DARKNESS))
-
-        flash_direction = self._game.player.current_direction
-        flash_direction = (flash_direction[0], 0)
-        self._flashlight.set_direction(flash_direction)
-        self._flashlight.update()
-        blit_alpha(dark, self._flashlight.surf, self._flashlight.rect.topleft,
-                   constants.LIGHT_DIFF, special_flags=pygame.BLEND_RGBA_SUB)
-        self._screen.blit(dark, (0, 0))
+        with profiler.PROFILER.span('lighting'):
+            self._screen.blit(dark, (0, 0))
 
         # Health bar
+        health, invincibility_time = status
         pygame.draw.rect(self._screen, constants.HEALTH_BAR_COLOR_1,
                          (constants.HEALTH_BAR_POS[0],
                           constants.HEALTH_BAR_POS[1],
-                          constants.HEALTH_BAR_UNIT_WIDTH *
-                          self._game.player.health,
+                          constants.HEALTH_BAR_UNIT_WIDTH * health,
                           constants.HEALTH_BAR_HEIGHT))
-        if self._game.player.is_invincible:
-            if (self._game.player.invincibility_time //
-                    constants.TRANSPARENT_TIME) % 2 == 0:
+        if invincibility_time > 0:
+            if (invincibility_time // constants.TRANSPARENT_TIME) % 2 == 0:
                 pygame.draw.rect(self._screen,
                                  constants.HEALTH_BAR_COLOR_1,
                                  (constants.HEALTH_BAR_POS[0]
-                                  + constants.HEALTH_BAR_UNIT_WIDTH
-                                  * self._game.player.health,
+                                  + constants.HEALTH_BAR_UNIT_WIDTH * health,
                                   constants.HEALTH_BAR_POS[1],
                                   constants.HEALTH_BAR_UNIT_WIDTH,
                                   constants.HEALTH_BAR_HEIGHT))
@@ -242,10 +498,8 @@ class GraphicView(View):
                 pygame.draw.rect(self._screen,
                                  constants.HEALTH_BAR_COLOR_2,
                                  (constants.HEALTH_BAR_POS[0]
-                                  + constants.HEALTH_BAR_UNIT_WIDTH
-                                  * self._game.player.health,
+                                  + constants.HEALTH_BAR_UNIT_WIDTH * health,
                                   constants.HEALTH_BAR_POS[1],
                                   constants.HEALTH_BAR_UNIT_WIDTH,
                                   constants.HEALTH_BAR_HEIGHT))
-
-        pygame.display.flip()
+        self._screen.set_clip(None)
@@ -0,0 +1,109 @@
+"""
+Tests for the shared asset registry in assets.py
+"""
+import pygame
+import pytest
+from src.assets import AssetRegistry, load_options
+from src.game import Game
+from src.sprites import MovingSprite, Demon
+import src.constants as constants
+
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+NAMES = ('stills', 'up', 'still_up')
+
+
+def test_registry_shares_animations():
+    """
+    Tests that repeated requests for the same animations are served from cache
+    """
+    registry = AssetRegistry()
+    first = registry.animations('test_animations', NAMES)
+    second = registry.animations('test_animations', NAMES)
+    assert first is second
+    assert registry.stats['hits'] == 1
+    assert registry.stats['misses'] == 1
+    assert registry.stats['entries'] == 3
+    assert registry.stats['bytes'] > 0
+
+
+def test_registry_still_animations():
+    """
+    Tests that the still animations are the first frame of their direction
+    """
+    registry = AssetRegistry()
+    animations = registry.animations('test_animations', NAMES)
+    assert animations['still_up']['animations'] ==\
+        animations['up']['animations'][0:1]
+    assert animations['still_up']['positions'] ==\
+        animations['up']['positions'][0:1]
+
+
+def test_registry_is_read_only():
+    """
+    Tests that cached animations can't be changed by the sprites sharing them
+    """
+    registry = AssetRegistry()
+    animations = registry.animations('test_animations', NAMES)
+    with pytest.raises(TypeError):
+        animations['stills'] = {}
+    with pytest.raises(TypeError):
+        animations['stills']['frame_length'] = 1
+
+
+def test_registry_evict_and_reload():
+    """
+    Tests that evicting and reloading replaces the cached animations
+    """
+    registry = AssetRegistry()
+    old = registry.animations('test_animations', NAMES)
+    registry.reload('test_animations')
+    new = registry.animations('test_animations', NAMES)
+    assert old is not new
+    assert registry.stats['misses'] == 2
+    registry.evict()
+    assert registry.stats['entries'] == 0
+    assert registry.stats['bytes'] == 0
+
+
+def test_sprites_share_frames():
+    """
+    Tests that sprites using the same art share the same frames
+    """
+    game = Game()
+    first = Demon(game)
+    second = Demon(game)
+    # pylint: disable=protected-access
+    assert first._animations is second._animations
+    sprite = MovingSprite(game, constants.PLAYER_SPEED, 'test_animations')
+    assert sprite._animations['still_left']['animations'][0] is\
+        sprite._animations['left']['animations'][0]
+
+
+@pytest.mark.parametrize('folder, sword_masks, faded', [
+    ('demon/attack_up', True, True),
+    ('player/left', False, True),
+    ('obstacle', False, False),
+    ('flashlight/up', False, False),
+])
+def test_load_options(folder, sword_masks, faded):
+    """
+    Tests that only attack animations get sword masks, and only the sprites
+    that flash get translucent copies of their frames
+    """
+    assert load_options(folder) == {'sword_masks': sword_masks,
+                                    'faded': faded}
+
+
+def test_only_flashing_sprites_faded():
+    """
+    Tests that obstacles and the flashlight, which never flash, don't keep
+    translucent copies of their frames
+    """
+    registry = AssetRegistry()
+    demon = registry.animations('demon', ('stills', 'still_up'))
+    obstacle = registry.animations('obstacle', ('stills',))
+    assert len(demon['still_up']['faded']) == 1
+    assert 'faded' not in obstacle['stills']
@@ -0,0 +1,95 @@
+"""
+Tests for the sound effect channels in audio.py
+"""
+import os
+import pygame
+import pytest
+import src.constants as constants
+from src.audio import AudioManager
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+@pytest.fixture(name='manager')
+def fixture_manager():
+    """
+    Starts the mixer on SDL's dummy audio driver, so the sound effects play
+    without an audio device, and stops it afterwards
+
+    Returns:
+        a function that builds an AudioManager playing the sound effects from
+        the media folder, with its clock at the time in a list it is given
+    """
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.mixer.init()
+
+    def build(now, channels, **kwargs):
+        return AudioManager(
+            lambda name: pygame.mixer.Sound(
+                f'{constants.AUDIO_FOLDER}/{name}.wav'),
+            channels, clock=lambda: now[0], **kwargs)
+
+    yield build
+    pygame.mixer.quit()
+
+
+@pytest.mark.parametrize('later, merged', [(0.01, True), (0.1, False)])
+def test_repeats_merged(manager, later, merged):
+    """
+    Tests whether an effect triggered again right after it started is merged
+    into the voice already playing
+    """
+    now = [0.0]
+    audio = manager(now, {'demon_hit': 4}, merge_time=0.05)
+    assert audio.play('demon_hit') is not None
+    now[0] = later
+    assert (audio.play('demon_hit') is None) == merged
+    assert audio.stats['merged'] == int(merged)
+    assert audio.stats['played'] == 2 - merged
+
+
+def test_full_pool_drops_equal_priority(manager):
+    """
+    Tests whether an effect with every channel busy is dropped instead of
+    cutting off a voice that is just as important
+    """
+    audio = manager([0.0], {'demon_hit': 2, 'player_hit': 1}, merge_time=0)
+    channels = [audio.play('demon_hit') for _ in range(3)]
+    assert channels[0] is not None and channels[1] is not None
+    assert channels[0] != channels[1]
+    assert channels[2] is None
+    assert audio.stats['dropped'] == 1
+    assert audio.stats['playing'] == 2
+
+
+def test_steals_oldest_lower_priority(manager):
+    """
+    Tests whether a more important effect with every channel busy steals the
+    oldest voice of a less important one
+    """
+    now = [0.0]
+    audio = manager(now, {'player_hit': 1, 'demon_hit': 2}, merge_time=0,
+                    priorities={'player_hit': 1, 'demon_hit': 0})
+    oldest = audio.play('demon_hit')
+    now[0] = 0.01
+    audio.play('demon_hit')
+    audio.play('player_hit')
+    assert audio.play('player_hit') == oldest
+    assert audio.stats['stolen'] == 1
+    assert audio.stats['playing'] == 3
+
+
+def test_channels_reserved(manager):
+    """
+    Tests whether the effects' channels are reserved so other sounds can't
+    take them
+    """
+    audio = manager([0.0], {'demon_hit': 6, 'player_hit': 4})
+    audio.play('player_hit')
+    assert pygame.mixer.get_num_channels() >= 10
+    reserved = [pygame.mixer.Channel(index) for index in range(10)]
+    assert [channel.get_busy() for channel in reserved] == [False] * 6\
+        + [True] + [False] * 3
+    pygame.mixer.Sound(f'{constants.AUDIO_FOLDER}/demon_hit.wav').play()
+    assert sum(channel.get_busy() for channel in reserved) == 1
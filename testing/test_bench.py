@@ -0,0 +1,59 @@
+"""
+Tests for the benchmark scenarios in bench.py
+"""
+import pygame
+import pytest
+from src.bench import SCENARIOS, run_scenario, compare
+
+pygame.init()
+SCREEN = pygame.display.set_mode((1, 1))
+
+
+def test_run_scenario():
+    """
+    Tests that a scenario reports every subsystem and its memory
+    """
+    result = run_scenario(SCENARIOS['demons_chasing'], SCREEN, ticks=5)
+    assert result['ticks'] == 5
+    assert set(result['subsystems']) == {'player', 'demons', 'scroll', 'game',
+                                         'tick'}
+    for stats in result['subsystems'].values():
+        assert 0 <= stats['mean'] and stats['p95'] <= stats['p99']
+    assert result['memory_peak'] > 0
+
+
+def result_with(mean, memory_peak=1000):
+    """
+    Returns a result dict with one subsystem for comparing
+
+    Args:
+        mean: a float, the milliseconds to use for every metric
+        memory_peak: an int, the memory peak in bytes
+    """
+    return {'ticks': 1, 'sprites': 1, 'memory_peak': memory_peak,
+            'subsystems': {'game': {'mean': mean, 'p95': mean, 'p99': mean}}}
+
+
+@pytest.mark.parametrize('mean,memory_peak,regressions', [
+    (1.0, 1000, 0),
+    (1.05, 1050, 0),
+    (2.0, 1000, 3),
+    (1.0, 2000, 1),
+])
+def test_compare(mean, memory_peak, regressions):
+    """
+    Tests that only metrics worse than the threshold count as regressions
+    """
+    baseline = {'scenario': result_with(1.0)}
+    results = {'scenario': result_with(mean, memory_peak)}
+    assert len(compare(results, baseline, threshold=0.1)) == regressions
+
+
+def test_compare_ignores_small_changes():
+    """
+    Tests that increases below the minimum are ignored however large they are
+    as a fraction
+    """
+    baseline = {'scenario': result_with(0.001)}
+    results = {'scenario': result_with(0.01)}
+    assert not compare(results, baseline, min_delta=0.05)
@@ -3,6 +3,7 @@ Test methods for the controllers
 """
 
 import math
+import random
 import pygame
 import pytest
 from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
@@ -98,15 +99,73 @@ DC_CASES = [
 ]
 
 
+@pytest.mark.parametrize("vectorized", [True, False])
 @pytest.mark.parametrize("spawn,direction", DC_CASES)
-def test_demon_controller(spawn, direction):
+def test_demon_controller(spawn, direction, vectorized):
     """
     Tests the demon controller's movement
     """
     game = empty_game()
-    demon = DemonController(game)
+    demon = DemonController(game, vectorized=vectorized)
     demon_sprite = Demon(game, spawn)
     game.demons.add(demon_sprite)
     game.all_sprites.add(demon_sprite)
     demon.update()
     assert demon_sprite.current_direction == direction
+
+
+def test_vectorized_demon_controller_matches_scalar():
+    """
+    Tests that steering a horde of demons at once moves them the same as
+    steering them one at a time
+    """
+    rng = random.Random(0)
+    spawns = [(rng.uniform(-100, SCREEN_WIDTH + 100),
+               rng.uniform(-100, SCREEN_HEIGHT + 100)) for _ in range(200)]
+    hordes = []
+    for vectorized in (True, False):
+        game = empty_game()
+        controller = DemonController(game, vectorized=vectorized)
+        for spawn in spawns:
+            demon_sprite = Demon(game, spawn)
+            game.demons.add(demon_sprite)
+            game.all_sprites.add(demon_sprite)
+        for _ in range(10):
+            controller.update()
+        hordes.append(game.demons.sprites())
+    for fast, slow in zip(*hordes):
+        assert fast.rect == slow.rect
+        assert fast.current_direction == pytest.approx(slow.current_direction)
+
+
+def test_vectorized_demon_controller_matches_scalar_after_hits():
+    """
+    Tests that moving the demons through the entity store gives the same
+    result as updating them one at a time, around obstacles, while they
+    are knocked back and after their rects are moved directly
+    """
+    rng = random.Random(1)
+    spawns = [(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+              for _ in range(100)]
+    hordes = []
+    for vectorized in (True, False):
+        game = Game(seed=1, spawn_ticks=0)
+        controller = DemonController(game, vectorized=vectorized)
+        for spawn in spawns:
+            demon_sprite = Demon(game, spawn)
+            game.demons.add(demon_sprite)
+            game.all_sprites.add(demon_sprite)
+        demons = game.demons.sprites()
+        for tick in range(30):
+            if tick % 10 == 0:
+                for index, demon_sprite in enumerate(demons[::4]):
+                    demon_sprite.damage((index % 3 - 1, 1))
+                    demon_sprite.rect.x += index % 2
+            controller.update()
+        hordes.append(demons)
+    for fast, slow in zip(*hordes):
+        assert fast.rect == slow.rect
+        assert fast.position == pytest.approx(slow.position)
+        assert fast.current_direction == pytest.approx(slow.current_direction)
+        assert fast.entity.timers == slow.entity.timers
+        assert fast.surf is slow.surf
@@ -0,0 +1,105 @@
+"""
+Tests for the entity store in entities.py
+"""
+import pygame
+from src.constants import DEMON_HEALTH
+from src.controller import DemonController
+from src.entities import EntityStore, EntityView, X, Y, DIRECTION_X,\
+    DIRECTION_Y, HEALTH, INVINCIBILITY
+from src.game import Game
+from src.sprites import Direction
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def test_store_allocate_and_release():
+    """
+    Tests that rows are handed out, freed and reused
+    """
+    store = EntityStore(capacity=2)
+    first = store.allocate('first')
+    second = store.allocate('second')
+    assert len(store) == 2
+    assert first.id != second.id
+    row = first.row
+    store.release(first)
+    assert len(store) == 1
+    assert first.row is None and first.id is None
+    assert store.sprites([second.row]) == ['second']
+    third = store.allocate('third')
+    assert third.row == row
+    assert store.sprites([third.row, second.row]) == ['third', 'second']
+
+
+def test_state_moves_with_the_view():
+    """
+    Tests that a view keeps its state when it leaves the store and brings it
+    into its next row
+    """
+    store = EntityStore(capacity=2)
+    entity = EntityView()
+    entity.position = (3, 4)
+    assert store.allocate('sprite', entity) is entity
+    assert tuple(store.positions[entity.row]) == (3, 4)
+    entity.health = 2
+    store.release(entity)
+    store.allocate('other').health = 5
+    assert (entity.position, entity.health) == ((3, 4), 2)
+    store.allocate('sprite', entity)
+    assert store.state[entity.row, HEALTH] == 2
+
+
+def test_store_grows():
+    """
+    Tests that the store grows when it runs out of rows and keeps the state of
+    the existing rows
+    """
+    store = EntityStore(capacity=1)
+    entities = []
+    for index in range(5):
+        entity = store.allocate(None)
+        entity.position = (index, -index)
+        entities.append(entity)
+    assert len(store) == 5
+    for index, entity in enumerate(entities):
+        assert entity.position == (index, -index)
+        assert tuple(store.positions[entity.row]) == (index, -index)
+
+
+def test_sprites_keep_state_in_store():
+    """
+    Tests that the sprites' state is in their entity store rows
+    """
+    game = Game()
+    game.obstacles.empty()
+    controller = DemonController(game)
+    game.create_new_demon()
+    demon = game.demons.sprites()[0]
+    for _ in range(3):
+        controller.update()
+    row = game.entities.state[demon.entity.row]
+    assert tuple(row[X:Y + 1]) == demon.position
+    assert tuple(row[DIRECTION_X:DIRECTION_Y + 1]) == demon.current_direction
+    demon.damage(Direction.UP.value)
+    assert row[HEALTH] == demon.health == DEMON_HEALTH - 1
+    assert row[INVINCIBILITY] == demon.invincibility_time > 0
+    row[HEALTH] = 1
+    assert demon.health == 1
+    assert game.entities.sprites([demon.entity.row]) == [demon]
+
+
+def test_killed_sprites_free_their_rows():
+    """
+    Tests that sprites only hold a row while they are in a group
+    """
+    game = Game()
+    rows = len(game.entities)
+    game.create_new_demon()
+    demon = game.demons.sprites()[0]
+    assert len(game.entities) == rows + 1
+    game.demon_pool.release(demon)
+    assert demon.entity.row is None
+    assert len(game.entities) == rows
+    game.restart()
+    assert len(game.entities) == len(game.all_sprites)
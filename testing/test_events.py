@@ -0,0 +1,115 @@
+"""
+Tests the game event queue and the events the game emits
+"""
+import pygame
+import pytest
+import src.utils as utils
+from src.events import EventQueue, EventType
+from src.game import Game
+from src.sprites import Direction
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def test_drain_empties_queue():
+    """
+    Tests whether draining returns the events in order and empties the queue
+    """
+    queue = EventQueue()
+    queue.emit(EventType.PLAYER_HIT, 1, (0, 0))
+    queue.emit(EventType.DEMON_KILLED, 2, (5, 5))
+    events = queue.drain()
+    assert [event.type for event in events] == [EventType.PLAYER_HIT,
+                                                EventType.DEMON_KILLED]
+    assert events[1].tick == 2 and events[1].position == (5, 5)
+    assert len(queue) == 0
+    assert not queue.drain()
+
+
+@pytest.mark.parametrize('emitted', [3, 4, 10])
+def test_full_queue_drops_oldest(emitted):
+    """
+    Tests whether a full queue keeps the newest events and counts every one
+    """
+    capacity = 4
+    queue = EventQueue(capacity)
+    for tick in range(emitted):
+        queue.emit(EventType.DEMON_HIT, tick, (0, 0))
+    events = queue.drain()
+    assert [event.tick for event in events] ==\
+        list(range(max(emitted - capacity, 0), emitted))
+    assert queue.counts['demon_hit'] == emitted
+    assert queue.counts['dropped'] == max(emitted - capacity, 0)
+
+
+def test_clear_resets_counts():
+    """
+    Tests whether clearing the queue forgets its events and counts
+    """
+    queue = EventQueue()
+    queue.emit(EventType.PLAYER_DIED, 1, (0, 0))
+    queue.clear()
+    assert len(queue) == 0
+    assert not any(queue.counts.values())
+
+
+@pytest.mark.parametrize('sprite,event_type', [
+    ('player', EventType.PLAYER_HIT),
+    ('demon', EventType.DEMON_HIT),
+])
+def test_damage_emits_hit(sprite, event_type):
+    """
+    Tests whether damaging a sprite emits one hit, and none while it is
+    invincible
+    """
+    game = Game()
+    game.create_new_demon()
+    target = game.player if sprite == 'player' else next(iter(game.demons))
+    target.damage(Direction.UP.value)
+    target.damage(Direction.UP.value)
+    events = game.events.drain()
+    assert [event.type for event in events] == [event_type]
+    assert events[0].position == target.rect.center
+
+
+def test_attack_emits_attack():
+    """
+    Tests whether the player attacking emits an attack event
+    """
+    game = Game()
+    game.player.attack()
+    assert [event.type for event in game.events.drain()] ==\
+        [EventType.PLAYER_ATTACK]
+
+
+def test_kill_emits_hit_and_kill(monkeypatch):
+    """
+    Tests whether a demon killed by the sword emits its hit then its kill on
+    the tick it died
+    """
+    monkeypatch.setattr(utils, 'touching_sword', lambda player, demon: True)
+    game = Game()
+    game.obstacles.empty()
+    game.create_new_demon()
+    demon = next(iter(game.demons))
+    demon.entity.health = 1
+    demon.move((game.player.rect.centerx - demon.rect.centerx,
+                game.player.rect.centery - demon.rect.centery))
+    game.update()
+    events = game.events.drain()
+    assert [event.type for event in events] == [EventType.DEMON_HIT,
+                                                EventType.DEMON_KILLED]
+    assert events[1].tick == game.ticks
+    assert game.demons_killed == 1
+
+
+def test_restart_clears_events():
+    """
+    Tests whether restarting the game drops the events of the last one
+    """
+    game = Game()
+    game.player.attack()
+    game.restart()
+    assert len(game.events) == 0
+    assert game.events.counts['player_attack'] == 0
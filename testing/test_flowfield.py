@@ -0,0 +1,109 @@
+"""
+Tests for the demon flow field in flowfield.py
+"""
+import numpy as np
+import pygame
+import pytest
+from src.controller import DemonController
+from src.flowfield import FlowField
+from src.game import Game
+from src.sprites import Demon, Obstacle
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def rock_game(rock=True):
+    """
+    Returns a game with a demon below the player and, if asked, a rock
+    between them
+    """
+    game = Game(seed=0)
+    game.obstacles.empty()
+    game.all_sprites.empty()
+    game.all_sprites.add(game.player)
+    x, y = game.player.rect.center
+    if rock:
+        obs = Obstacle(game, (x, y + 150))
+        game.obstacles.add(obs)
+        game.all_sprites.add(obs)
+    demon = Demon(game, (x, y + 320))
+    game.demons.add(demon)
+    game.all_sprites.add(demon)
+    return game, demon
+
+
+def test_open_field_goes_straight():
+    """
+    Tests that without obstacles every cell is as far as a straight line from
+    the player, and no demon is steered off the straight line
+    """
+    game, _ = rock_game(rock=False)
+    field = FlowField(game)
+    field.update()
+    rows, cols = np.indices(field.shape)
+    target_row, target_col = field.cell(game.player.rect.center)
+    steps = np.maximum(np.abs(rows - target_row), np.abs(cols - target_col))
+    assert np.array_equal(field.distances, steps)
+    positions = np.random.default_rng(0).uniform(-100, 900, (50, 2))
+    assert not field.sample(positions).any()
+
+
+def test_flow_leads_around_rock():
+    """
+    Tests that following the field from behind a rock reaches the player
+    without stepping through the rock's base
+    """
+    game, demon = rock_game()
+    field = FlowField(game)
+    field.update()
+    target = field.cell(game.player.rect.center)
+    row, col = field.cell(demon.rect.center)
+    assert field.distances[row, col] > abs(row - target[0])
+    # pylint: disable=protected-access
+    for _ in range(field.distances[row, col]):
+        flow = field._flow[row, col]
+        if not flow.any():
+            break
+        # Each step goes to the neighbour the flow points at
+        col, row = col + int(np.sign(flow[0])), row + int(np.sign(flow[1]))
+        assert not field._blocked[row, col]
+    assert field.distances[row, col] == max(abs(row - target[0]),
+                                            abs(col - target[1]))
+
+
+def test_rebuilds_only_on_change():
+    """
+    Tests that the field is only rebuilt when the player changes cells or
+    the obstacles move
+    """
+    game, _ = rock_game()
+    field = FlowField(game)
+    field.update()
+    field.update()
+    assert field.builds == 1
+    game.player.move((30, 0))
+    field.update()
+    assert field.builds == 2
+    for obs in game.obstacles:
+        obs.move((0, 40))
+    field.update()
+    assert field.builds == 3
+
+
+@pytest.mark.parametrize('vectorized', [True, False])
+@pytest.mark.parametrize('flow_field, reaches', [(True, True),
+                                                 (False, False)])
+def test_demon_reaches_player(vectorized, flow_field, reaches):
+    """
+    Tests that a demon behind a rock only reaches the player when it is
+    steered with the flow field
+    """
+    game, demon = rock_game()
+    controller = DemonController(game, vectorized, flow_field)
+    player = game.player.rect.center
+    for _ in range(300):
+        controller.update()
+    dist = np.hypot(demon.rect.centerx - player[0],
+                    demon.rect.centery - player[1])
+    assert (dist < 50) == reaches
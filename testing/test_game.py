@@ -6,7 +6,8 @@ import pygame
 import pytest
 from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT,\
     DEMON_MIN_SPAWN_DIST, DEMON_MAX_SPAWN_DIST,\
-    OBSTACLE_MIN_SPAWN_DIST, OBSTACLE_MAX_SPAWN_DIST
+    OBSTACLE_MIN_SPAWN_DIST, OBSTACLE_MAX_SPAWN_DIST, OBSTACLE_DESPAWN_DIST
+from src.controller import ScrollController
 from src.game import Game
 
 pygame.init()
@@ -53,3 +54,27 @@ def test_new_obstacle(is_top):
         assert (-OBSTACLE_MAX_SPAWN_DIST <= pos[1] <= -OBSTACLE_MIN_SPAWN_DIST)\
             or (OBSTACLE_MIN_SPAWN_DIST <= pos[1] - SCREEN_HEIGHT <=
                 OBSTACLE_MAX_SPAWN_DIST)
+
+
+@pytest.mark.parametrize("direction", [-1, 1])
+def test_obstacles_recycled(direction):
+    """
+    Tests that obstacles left behind are despawned and reused, so the number
+    of obstacles stays flat on a long walk
+    """
+    game = Game()
+    scroll = ScrollController(game)
+    # Walk through obstacles so the player never gets stuck
+    game.player._obstacle_collisions = False  # pylint: disable=protected-access
+    seen = set()
+    for _ in range(5000):
+        game.player.set_direction((0, direction))
+        game.player.update()
+        scroll.update()
+        game.update()
+        seen.update(game.obstacles)
+        for obs in game.obstacles:
+            assert abs(obs.rect.centery - game.player.rect.centery) <=\
+                OBSTACLE_DESPAWN_DIST
+    assert len(game.all_sprites) == len(game.obstacles) + 1
+    assert len(seen) < 30
@@ -0,0 +1,140 @@
+"""
+Tests for the sprite groups in groups.py
+"""
+import random
+import pygame
+import pytest
+from src.game import Game
+from src.groups import SpatialHash, SpatialGroup, YSortedGroup
+from src.sprites import Demon, Obstacle
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+class RectSprite(pygame.sprite.Sprite):  # pylint: disable=too-few-public-methods
+    """
+    A bare sprite with only a rect, for testing the spatial hash
+    """
+    def __init__(self, rect):
+        super().__init__()
+        self.rect = pygame.Rect(rect)
+
+
+QUERY_CASES = [
+    ((0, 0, 10, 10), True),
+    ((90, 90, 20, 20), True),
+    ((150, 150, 10, 10), False),
+    ((-200, -200, 10, 10), False),
+    ((0, 0, 300, 300), True),
+]
+
+
+@pytest.mark.parametrize("rect,found", QUERY_CASES)
+def test_spatial_hash_query(rect, found):
+    """
+    Tests that querying the spatial hash finds sprites in the covered cells
+    """
+    spatial_hash = SpatialHash(100)
+    sprite = RectSprite((50, 50, 10, 10))
+    spatial_hash.insert(sprite)
+    assert (sprite in spatial_hash.query(pygame.Rect(rect))) == found
+
+
+def test_spatial_hash_update():
+    """
+    Tests that moving a sprite moves it between cells
+    """
+    spatial_hash = SpatialHash(100)
+    sprite = RectSprite((50, 50, 10, 10))
+    spatial_hash.insert(sprite)
+    sprite.rect.move_ip(200, 0)
+    spatial_hash.update(sprite)
+    assert sprite not in spatial_hash.query(pygame.Rect(50, 50, 10, 10))
+    assert sprite in spatial_hash.query(pygame.Rect(250, 50, 10, 10))
+    spatial_hash.remove(sprite)
+    assert len(spatial_hash) == 0
+    assert not spatial_hash.query(pygame.Rect(250, 50, 10, 10))
+
+
+def test_group_follows_moves_and_kills():
+    """
+    Tests that sprites are reindexed when they move and dropped when killed
+    """
+    game = Game()
+    demon = Demon(game, (100, 100))
+    game.demons.add(demon)
+    demon.move((500, 300))
+    assert demon not in game.demons.query(pygame.Rect(100, 100, 1, 1))
+    assert demon in game.demons.query(demon.rect)
+    demon.kill()
+    assert demon not in game.demons.query(demon.rect)
+
+
+def test_collide_matches_brute_force():
+    """
+    Tests that the spatial group finds the same collisions as checking every
+    sprite, while testing fewer candidates
+    """
+    rng = random.Random(0)
+    game = Game()
+    game.obstacles.empty()
+    plain = pygame.sprite.Group()
+    for _ in range(100):
+        obs = Obstacle(game, (rng.randint(0, 800), rng.randint(0, 600)))
+        game.obstacles.add(obs)
+        plain.add(obs)
+    for _ in range(20):
+        demon = Demon(game, (rng.randint(0, 800), rng.randint(0, 600)))
+        expected = pygame.sprite.spritecollide(
+            demon, plain, False, collided=pygame.sprite.collide_mask)
+        assert set(game.obstacles.collide(demon)) == set(expected)
+    stats = game.obstacles.stats
+    assert stats['hits'] <= stats['candidates'] < 20 * 100
+    game.obstacles.reset_stats()
+    assert game.obstacles.stats == {'candidates': 0, 'hits': 0}
+
+
+def test_group_init_with_sprites():
+    """
+    Tests that sprites passed to the constructor are indexed
+    """
+    sprite = RectSprite((50, 50, 10, 10))
+    group = SpatialGroup(sprite)
+    assert group.query(sprite.rect) == [sprite]
+
+
+def test_y_sorted_group_follows_moves():
+    """
+    Tests that the group iterates in layer order as sprites move past each
+    other
+    """
+    game = Game()
+    group = YSortedGroup()
+    obstacles = [Obstacle(game, (100, y_val)) for y_val in (300, 100, 200)]
+    group.add(*obstacles)
+    assert [obs.layer for obs in group] == sorted(obs.layer for obs in group)
+    obstacles[1].move((0, 500))
+    assert group.sprites()[-1] is obstacles[1]
+    for _ in range(20):
+        random.choice(obstacles).move((0, random.randint(-200, 200)))
+        layers = [obs.layer for obs in group]
+        assert layers == sorted(layers)
+
+
+def test_y_sorted_group_remove_and_add():
+    """
+    Tests that removed sprites leave the draw order and sprites added again
+    are only drawn once
+    """
+    game = Game()
+    group = YSortedGroup()
+    obstacles = [Obstacle(game, (100, y_val)) for y_val in (100, 200, 300)]
+    group.add(*obstacles)
+    group.remove(obstacles[0])
+    assert group.sprites() == obstacles[1:]
+    group.remove(obstacles[2])
+    group.add(obstacles[2])
+    assert group.sprites() == obstacles[1:]
+    group.empty()
+    assert not group.sprites()
@@ -0,0 +1,93 @@
+"""
+Tests for the input sources in inputs.py
+"""
+import pygame
+import pytest
+from src.constants import MOVES
+from src.inputs import decode_keys, encode_keys, idle_keys, RandomKeys,\
+    InputRecorder, InputReplay, seed_fits
+from src.sim import run
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+@pytest.mark.parametrize("pressed", [(), ('up',), ('down', 'left'),
+                                     tuple(MOVES)])
+def test_encode_decode_keys(pressed):
+    """
+    Tests that key states survive being packed into an int
+    """
+    keys = idle_keys()
+    for move in pressed:
+        keys[MOVES[move]] = True
+    assert decode_keys(encode_keys(keys)) == keys
+
+
+def test_random_keys_hold():
+    """
+    Tests that random keys are held for the given number of ticks
+    """
+    keys = RandomKeys(seed=0, hold=5)
+    first = dict(keys())
+    for _ in range(4):
+        assert keys() == first
+    assert set(first) == set(idle_keys())
+
+
+def test_replay_matches_recording(tmp_path):
+    """
+    Tests that replaying a recorded run ends in the same state
+    """
+    path = tmp_path / 'run.pnr'
+    recorder = InputRecorder(RandomKeys(7), seed=7, spawn_ticks=20)
+    recorded = run(600, recorder.spawn_ticks, seed=recorder.seed,
+                   get_pressed=recorder)
+    recorder.save(path)
+
+    replay = InputReplay.load(path)
+    assert len(replay) == len(recorder) == recorded['ticks']
+    assert (replay.seed, replay.spawn_ticks) == (7, 20)
+    replayed = run(len(replay), replay.spawn_ticks, seed=replay.seed,
+                   get_pressed=replay)
+    assert replayed['score'] == recorded['score']
+    assert replayed['state_hash'] == recorded['state_hash']
+
+
+def test_replay_runs_out():
+    """
+    Tests that a replay presses no keys once it runs out
+    """
+    keys = idle_keys()
+    keys[MOVES['up']] = True
+    replay = InputReplay(0, 0, [encode_keys(keys)])
+    assert replay() == keys
+    assert replay() == idle_keys()
+
+
+def test_load_rejects_other_files(tmp_path):
+    """
+    Tests that loading a file that isn't a replay fails
+    """
+    path = tmp_path / 'not_a_replay'
+    path.write_bytes(b'hello')
+    with pytest.raises(ValueError):
+        InputReplay.load(path)
+
+
+@pytest.mark.parametrize("seed, fits", [
+    (None, True),
+    (0, True),
+    (-2 ** 63, True),
+    (2 ** 63 - 1, True),
+    (2 ** 63, False),
+    (-2 ** 63 - 1, False),
+])
+def test_seed_fits(seed, fits, tmp_path):
+    """
+    Tests that exactly the seeds a replay file can hold fit
+    """
+    assert seed_fits(seed) == fits
+    if fits and seed is not None:
+        InputRecorder(idle_keys, seed, 0).save(tmp_path / 'run.pnr')
+        assert InputReplay.load(tmp_path / 'run.pnr').seed == seed
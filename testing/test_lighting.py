@@ -0,0 +1,68 @@
+"""
+Tests for the darkness overlay in lighting.py
+"""
+import random
+import pygame
+import src.constants as constants
+from src.game import Game
+from src.lighting import Lighting
+from src.sprites import Flashlight
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def flashlight_frames():
+    """
+    Returns a list of every frame of the flashlight animations
+    """
+    flashlight = Flashlight(Game())
+    return [frame for name in ('stills', 'up', 'down', 'left', 'right')
+            for frame in flashlight._animations[name]['animations']]  # pylint: disable=protected-access
+
+
+def fresh_darkness(frame, topleft):
+    """
+    Returns a new darkness overlay with a flashlight frame cut out of it the
+    way it was made every frame before the overlay was cached: the frame's
+    alpha is capped at LIGHT_DIFF on a temporary surface and subtracted
+    """
+    dark = pygame.Surface(constants.SCREEN_SIZE, pygame.SRCALPHA)
+    dark.fill((0, 0, 0, constants.DARKNESS))
+    light = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
+    light.fill((0, 0, 0, constants.LIGHT_DIFF))
+    light.blit(frame, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+    dark.blit(light, topleft, special_flags=pygame.BLEND_RGBA_SUB)
+    return dark
+
+
+def test_overlay_matches_fresh_darkness():
+    """
+    Tests that moving the light around the overlay gives the same pixels as
+    making the darkness from scratch every frame
+    """
+    frames = flashlight_frames()
+    lighting = Lighting()
+    rng = random.Random(1)
+    for _ in range(30):
+        frame = rng.choice(frames)
+        rect = frame.get_rect(topleft=(rng.randint(-300, 800),
+                                       rng.randint(-300, 600)))
+        overlay = lighting.update(frame, rect)
+        dark = fresh_darkness(frame, rect.topleft)
+        assert (pygame.surfarray.array_alpha(overlay)
+                == pygame.surfarray.array_alpha(dark)).all()
+
+
+def test_cutouts_are_cached():
+    """
+    Tests that each flashlight frame is only cut out once and the same
+    overlay is reused
+    """
+    frames = flashlight_frames()
+    lighting = Lighting()
+    overlays = {id(lighting.update(frame, frame.get_rect()))
+                for frame in frames * 2}
+    assert overlays == {id(lighting.overlay)}
+    assert lighting.cached_frames == len(set(frames))
+    assert lighting.cutout(frames[0]) is lighting.cutout(frames[0])
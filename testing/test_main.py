@@ -0,0 +1,93 @@
+"""
+Tests for the game loop in main.py
+"""
+import argparse
+import pygame
+import pytest
+import src.constants as constants
+from src.controller import PlayerController
+from src.game import Game
+from src.inputs import InputRecorder, InputReplay, RandomKeys
+from src.main import game_loop, parse_args
+from src.sim import run
+from src.simulation import Simulation
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+class RestartingView:  # pylint: disable=too-few-public-methods
+    """
+    Stands in for the GraphicView, pausing the game and restarting it from
+    the pause menu after a number of frames, then closing the window
+
+    Attributes:
+        state_hash: the hash of the game state when it was restarted
+        _game: the Game being drawn
+        _frames: an int, how many frames were drawn
+        _restart: an int, the frame to restart the game on
+    """
+    def __init__(self, game, restart):
+        """
+        Initializes the view
+
+        Args:
+            game: the Game being drawn
+            restart: an int, the frame to restart the game on
+        """
+        self.state_hash = None
+        self._game = game
+        self._frames = 0
+        self._restart = restart
+
+    def draw(self, dt, frame):  # pylint: disable=unused-argument
+        """
+        Counts the frame, pausing, restarting or closing the game on cue
+        """
+        self._frames += 1
+        if self._frames == self._restart - 1:
+            self._game.paused = True
+        elif self._frames == self._restart:
+            self.state_hash = self._game.state_hash()
+            self._game.restart()
+        elif self._frames == 2 * self._restart:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def test_restart_stops_recording(tmp_path):
+    """
+    Tests that restarting from the pause menu saves the recording of the
+    first run, which replays to the state the game was restarted in
+    """
+    path = str(tmp_path / 'run.pnr')
+    game = Game(5, constants.DEMON_SPAWN_TICKS)
+    game.running = True
+    recorder = InputRecorder(RandomKeys(5), 5, constants.DEMON_SPAWN_TICKS)
+    sim = Simulation(game, PlayerController(game, recorder),
+                     constants.FRAME_RATE)
+    view = RestartingView(game, 30)
+    pygame.event.clear()
+    game_loop(game, view, sim, recorder,
+              argparse.Namespace(record=path, decoupled=False))
+    assert game.ticks > 0
+
+    replay = InputReplay.load(path)
+    # Nothing is recorded once the game restarts on frame 30
+    assert len(replay) == len(recorder) == 30
+    replayed = run(len(replay), replay.spawn_ticks, seed=replay.seed,
+                   get_pressed=replay)
+    assert replayed['state_hash'] == view.state_hash
+
+
+@pytest.mark.parametrize("seed, valid", [('7', True), (str(2 ** 63), False)])
+def test_record_needs_seed_that_fits(seed, valid):
+    """
+    Tests that a seed too big for a replay file is rejected before the game
+    starts instead of when the recording is saved
+    """
+    argv = ['--record', 'run.pnr', '--seed', seed]
+    if valid:
+        assert parse_args(argv).seed == int(seed)
+    else:
+        with pytest.raises(SystemExit):
+            parse_args(argv)
@@ -0,0 +1,67 @@
+"""
+Tests for the demon pool in pool.py
+"""
+import pygame
+from src.constants import DEMON_HEALTH
+from src.game import Game
+from src.pool import DemonPool
+from src.sprites import Direction
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def test_pool_prewarms():
+    """
+    Tests that the pool builds its demons up front
+    """
+    pool = DemonPool(Game(), size=5)
+    assert len(pool) == 5
+    assert pool.stats['created'] == 5
+
+
+def test_pool_reuses_demons():
+    """
+    Tests that released demons are reset and handed out again
+    """
+    game = Game()
+    pool = DemonPool(game, size=1)
+    demon = pool.acquire((100, 100))
+    game.demons.add(demon)
+    demon.damage(Direction.UP.value)
+    pool.release(demon)
+    assert not demon.alive()
+    again = pool.acquire((200, 300))
+    assert again is demon
+    assert again.rect.center == (200, 300)
+    assert again.health == DEMON_HEALTH
+    assert not again.is_invincible
+    assert again.current_direction == (0, 0)
+    assert pool.stats['created'] == 1
+    assert pool.stats['reused'] == 2
+
+
+def test_pool_cap_and_high_water():
+    """
+    Tests that the pool keeps at most cap idle demons and tracks the most
+    demons spawned at once
+    """
+    pool = DemonPool(Game(), size=0, cap=2)
+    demons = [pool.acquire((0, 0)) for _ in range(4)]
+    for demon in demons:
+        pool.release(demon)
+    assert pool.stats == {'idle': 2, 'in_use': 0, 'high_water': 4,
+                          'created': 4, 'reused': 0, 'dropped': 2}
+
+
+def test_game_returns_killed_demons():
+    """
+    Tests that restarting the game returns its demons to the pool
+    """
+    game = Game()
+    for _ in range(3):
+        game.create_new_demon()
+    assert game.demon_pool.stats['in_use'] == 3
+    game.restart()
+    assert not game.demons
+    assert game.demon_pool.stats['in_use'] == 0
@@ -0,0 +1,74 @@
+"""
+Tests for the background asset preloader in preloader.py
+"""
+import pygame
+import pytest
+import src.utils as utils
+from src.assets import AssetRegistry
+from src.preloader import Preloader, animation_folders
+from src.sprites import Demon, Player
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def test_animation_folders():
+    """
+    Tests that every folder with animation info of the game's sprites is
+    found, and nothing else
+    """
+    folders = animation_folders()
+    for folder in ('demon', 'demon/attack_up', 'player/left', 'obstacle',
+                   'flashlight/right'):
+        assert folder in folders
+    assert 'backgrounds' not in folders
+    assert not any(folder.startswith('test_animations')
+                   for folder in folders)
+    assert folders == sorted(folders)
+    assert animation_folders(sprites=('test_animations',))[0]\
+        == 'test_animations'
+
+
+@pytest.mark.parametrize("image_path, names", [
+    ('demon', Demon._ANIMATION_NAMES),  # pylint: disable=protected-access
+    ('player', Player._ANIMATION_NAMES),  # pylint: disable=protected-access
+])
+def test_preloaded_registry_never_loads(monkeypatch, image_path, names):
+    """
+    Tests that a preloaded registry serves sprites without loading anything,
+    with the same animations as loading them on request
+    """
+    registry = AssetRegistry()
+    preloader = Preloader(registry, workers=2)
+    preloader.start()
+    preloader.finish()
+    assert preloader.done
+    assert preloader.progress == 1
+    assert registry.stats['entries'] == len(animation_folders())
+    assert registry.stats['pending'] == 0
+
+    expected = AssetRegistry().animations(image_path, names)
+
+    def fail(*_, **__):
+        raise AssertionError('loaded from disk after preloading')
+    monkeypatch.setattr(utils, 'get_animation_info', fail)
+    animations = registry.animations(image_path, names)
+    for name in names:
+        assert set(animations[name]) == set(expected[name])
+        for frame, expected_frame in zip(animations[name]['animations'],
+                                         expected[name]['animations']):
+            assert frame.get_view('2').raw == expected_frame.get_view('2').raw
+
+
+def test_requests_wait_for_background_loads():
+    """
+    Tests that asking for animations while they are still loading uses the
+    background load
+    """
+    registry = AssetRegistry()
+    preloader = Preloader(registry, workers=1)
+    preloader.start()
+    animations = registry.animations('demon', ('stills', 'up'))
+    preloader.finish()
+    assert registry.animations('demon', ('stills', 'up')) is animations
+    assert registry.stats['entries'] == len(animation_folders())
@@ -0,0 +1,119 @@
+"""
+Tests for the frame profiler in profiler.py
+"""
+import csv
+import json
+import pygame
+import pytest
+import src.profiler as profiler_module
+from src.controller import DemonController
+from src.game import Game
+from src.profiler import Profiler
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def run_frames(profiler, count, spans=('update', 'draw')):
+    """
+    Times a number of frames that each enter the given spans
+
+    Args:
+        profiler: the Profiler to time the frames with
+        count: an int, how many frames to time
+        spans: a tuple of span names to enter in each frame
+    """
+    for _ in range(count):
+        profiler.start_frame()
+        for name in spans:
+            with profiler.span(name):
+                pass
+        profiler.end_frame()
+
+
+def test_disabled_profiler_records_nothing():
+    """
+    Tests that a disabled profiler keeps no frames
+    """
+    profiler = Profiler()
+    run_frames(profiler, 3)
+    assert not profiler.frames
+    assert profiler.stats == {'frames': 0, 'slow': 0}
+
+
+@pytest.mark.parametrize('capacity,count', [(5, 3), (5, 5), (5, 12)])
+def test_ring_buffer(capacity, count):
+    """
+    Tests that only the most recent frames are kept
+    """
+    profiler = Profiler(capacity=capacity)
+    profiler.enabled = True
+    run_frames(profiler, count)
+    frames = profiler.frames
+    assert len(frames) == min(capacity, count)
+    assert frames[-1]['frame'] == count - 1
+    assert profiler.stats['frames'] == count
+    assert profiler.span_names() == ['update', 'draw']
+
+
+def test_repeated_spans_add_up():
+    """
+    Tests that a span entered more than once a frame adds up its time
+    """
+    profiler = Profiler()
+    profiler.enabled = True
+    run_frames(profiler, 1, ('collision', 'collision'))
+    frame = profiler.frames[0]
+    assert list(frame['spans']) == ['collision']
+    assert 0 <= frame['spans']['collision'] <= frame['total']
+
+
+def test_obstacle_collisions_timed(monkeypatch):
+    """
+    Tests that checking the demons against the obstacles is timed as
+    collision, inside the span of the controller that moves them
+    """
+    profiler = Profiler()
+    profiler.enabled = True
+    monkeypatch.setattr(profiler_module, 'PROFILER', profiler)
+    game = Game(seed=0)
+    game.spawner.spawn(10)
+    profiler.start_frame()
+    with profiler.span('demons'):
+        DemonController(game).update()
+    frame = profiler.end_frame()
+    assert 0 < frame['spans']['collision'] <= frame['spans']['demons']
+
+
+def test_slow_frames():
+    """
+    Tests that frames over the budget are counted and reported
+    """
+    profiler = Profiler(budget=0)
+    profiler.enabled = True
+    run_frames(profiler, 4)
+    assert len(profiler.slow_frames) == 4
+    assert profiler.stats['slow'] == 4
+    assert 'slow frame 3' in profiler.report()
+
+
+@pytest.mark.parametrize('name', ['frames.csv', 'frames.json'])
+def test_export(tmp_path, name):
+    """
+    Tests that the kept frames are written with every span
+    """
+    profiler = Profiler()
+    profiler.enabled = True
+    run_frames(profiler, 3)
+    path = str(tmp_path / name)
+    profiler.export(path)
+    with open(path, encoding='utf-8') as output:
+        if name.endswith('.json'):
+            frames = json.load(output)['frames']
+            assert [frame['frame'] for frame in frames] == [0, 1, 2]
+            assert set(frames[0]['spans']) == {'update', 'draw'}
+        else:
+            rows = list(csv.reader(output))
+            assert rows[0] == ['frame', 'total', 'over_budget', 'update',
+                               'draw']
+            assert len(rows) == 4
@@ -0,0 +1,85 @@
+"""
+Tests for the demon separation steering in separation.py
+"""
+import numpy as np
+import pygame
+import pytest
+from src.controller import DemonController
+from src.game import Game
+from src.separation import Separation, cell_pairs
+from src.sprites import Demon
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def random_points(count, seed=0):
+    """
+    Returns an array of random points around the screen, some of them in a
+    tight clump
+    """
+    rng = np.random.default_rng(seed)
+    spread = rng.uniform(-100, 900, (count - count // 4, 2))
+    clump = rng.normal(400, 20, (count // 4, 2))
+    return np.concatenate((spread, clump))
+
+
+@pytest.mark.parametrize('count', [2, 50, 300])
+def test_cell_pairs_finds_close_pairs(count):
+    """
+    Tests that every pair of points closer than the cell size is found once
+    """
+    points = random_points(count)
+    first, second = cell_pairs(points, 48)
+    pairs = {tuple(sorted(pair)) for pair in zip(first.tolist(),
+                                                 second.tolist())}
+    assert len(pairs) == len(first)
+    dists = np.hypot(*(points[:, np.newaxis] - points).transpose(2, 0, 1))
+    close = {(i, j) for i, j in zip(*np.nonzero(dists < 48)) if i < j}
+    assert close <= pairs
+
+
+@pytest.mark.parametrize('count', [1, 20, 120])
+def test_forces_match_all_pairs(count):
+    """
+    Tests that the pushes from nearby demons match comparing every pair
+    """
+    points = random_points(count)
+    radius = 48
+    expected = np.zeros((count, 2))
+    for i in range(count):
+        for j in range(count):
+            offset = points[i] - points[j]
+            dist = np.hypot(*offset)
+            if i != j and dist < radius:
+                expected[i] += offset * (1 - dist / radius) / dist
+    assert Separation(radius).forces(points) == pytest.approx(expected)
+
+
+def test_stacked_demons_pushed_apart():
+    """
+    Tests that demons on the same spot push each other in opposite ways
+    """
+    forces = Separation(48).forces(np.array([[10.0, 10.0], [10.0, 10.0]]))
+    assert forces[1, 0] < 0 < forces[0, 0]
+    assert forces[0] == pytest.approx(-forces[1])
+
+
+@pytest.mark.parametrize('vectorized', [True, False])
+@pytest.mark.parametrize('separation', [True, False])
+def test_horde_spreads_out(vectorized, separation):
+    """
+    Tests that a horde chasing the player only stacks up on one spot without
+    separation
+    """
+    game = Game(seed=0)
+    game.obstacles.empty()
+    for spawn in random_points(40).tolist():
+        demon = Demon(game, spawn)
+        game.demons.add(demon)
+        game.all_sprites.add(demon)
+    controller = DemonController(game, vectorized, separation=separation)
+    for _ in range(240):
+        controller.update()
+    centers = {demon.rect.center for demon in game.demons}
+    assert (len(centers) == len(game.demons)) == separation
@@ -0,0 +1,32 @@
+"""
+Tests for the headless simulation in sim.py
+"""
+import pygame
+from src.inputs import RandomKeys
+from src.sim import run
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def test_run_idle():
+    """
+    Tests that an idle player with no demons survives the whole run
+    """
+    report = run(100, spawn_ticks=0)
+    assert report['ticks'] == 100
+    assert report['survived']
+    assert report['demons'] == 0
+
+
+def test_run_is_repeatable():
+    """
+    Tests that runs with the same seed end in the same state
+    """
+    reports = [run(300, spawn_ticks=6, seed=3, get_pressed=RandomKeys(3))
+               for _ in range(2)]
+    for report in reports:
+        del report['seconds']
+        del report['ticks_per_second']
+    assert reports[0] == reports[1]
+    assert reports[0]['demons'] > 0
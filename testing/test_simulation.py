@@ -0,0 +1,102 @@
+"""
+Tests for the fixed tick simulation in simulation.py
+"""
+import time
+import pygame
+import pytest
+import src.constants as constants
+from src.controller import PlayerController
+from src.game import Game
+from src.inputs import RandomKeys, idle_keys
+from src.simulation import Simulation
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def running_simulation(tick_rate=constants.SIM_TICK_RATE, seed=0,
+                       get_pressed=idle_keys):
+    """
+    Returns a Simulation of a running game
+    """
+    game = Game(seed, constants.DEMON_SPAWN_TICKS)
+    game.running = True
+    return Simulation(game, PlayerController(game, get_pressed), tick_rate)
+
+
+@pytest.mark.parametrize("tick_rate, elapsed, ticks, alpha", [
+    (60, 0.05, 3, 0),
+    (120, 0.05, 6, 0),
+    (60, 0.025, 1, 0.5),
+    (60, 1.0, 6, 0),
+])
+def test_advance_runs_fixed_ticks(tick_rate, elapsed, ticks, alpha):
+    """
+    Tests that advancing runs every whole tick in the elapsed time, up to
+    MAX_TICK, and draws the rest of the way to the next one
+    """
+    sim = running_simulation(tick_rate)
+    sim.advance(elapsed)
+    frame = sim.frame()
+    assert frame.current.tick == ticks
+    assert frame.previous.tick == ticks - 1
+    assert frame.alpha == pytest.approx(alpha, abs=1e-6)
+
+
+def test_fixed_ticks_match_stepping():
+    """
+    Tests that running fixed ticks ends in the same state as stepping the
+    game by the same tick
+    """
+    fixed = running_simulation(constants.FRAME_RATE, 4, RandomKeys(4))
+    stepped = running_simulation(constants.FRAME_RATE, 4, RandomKeys(4))
+    for _ in range(120):
+        fixed.advance(constants.TICK)
+        stepped.step(constants.TICK)
+    assert fixed.snapshots[1].tick == 120
+    # pylint: disable=protected-access
+    assert fixed._game.state_hash() == stepped._game.state_hash()
+
+
+def test_paused_game_does_not_tick():
+    """
+    Tests that no ticks run while the game is paused, and that time spent
+    paused isn't caught up on afterwards
+    """
+    sim = running_simulation()
+    sim._game.paused = True  # pylint: disable=protected-access
+    sim.advance(constants.MAX_TICK)
+    assert sim.snapshots[1].tick == 0
+    sim._game.paused = False  # pylint: disable=protected-access
+    sim.advance(0)
+    assert sim.snapshots[1].tick == 0
+
+
+def test_restart_starts_interpolation_over():
+    """
+    Tests that the first tick after a restart isn't interpolated from before it
+    """
+    sim = running_simulation()
+    sim.advance(constants.MAX_TICK)
+    sim._game.restart()  # pylint: disable=protected-access
+    sim.tick()
+    previous, current = sim.snapshots
+    assert previous is current
+
+
+def test_threaded_simulation():
+    """
+    Tests that the simulation ticks on its own thread until stopped
+    """
+    sim = running_simulation()
+    sim.start()
+    assert sim.threaded
+    time.sleep(0.1)
+    sim.stop()
+    assert not sim.threaded
+    ticks = sim.snapshots[1].tick
+    assert ticks > 0
+    frame = sim.frame()
+    assert 0 <= frame.alpha <= 1
+    time.sleep(0.05)
+    assert sim.snapshots[1].tick == ticks
@@ -0,0 +1,75 @@
+"""
+Tests for the game snapshots and interpolation in snapshot.py
+"""
+import pygame
+import pytest
+from src.game import Game
+from src.snapshot import Interpolator, take_snapshot
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def test_snapshot_matches_sprites():
+    """
+    Tests that a snapshot has every sprite in draw order, at their rects
+    """
+    game = Game(seed=0)
+    for _ in range(5):
+        game.create_new_demon()
+    snapshot = take_snapshot(game)
+    sprites = game.all_sprites.sprites()
+    assert [state.key for state in snapshot.sprites]\
+        == [id(sprite) for sprite in sprites]
+    drawn = Interpolator().sprites(snapshot, snapshot, 1)
+    for sprite, drawn_sprite in zip(sprites, drawn):
+        assert drawn_sprite.surf is sprite.surf
+        assert drawn_sprite.rect.topleft == sprite.rect.topleft
+    assert snapshot.health == game.player.health
+    assert snapshot.animation == game.player.current_animation_name
+    assert snapshot.offset == game.player.frame_offset
+    assert snapshot.alive
+    assert Interpolator().sprite(snapshot.player) is None
+    interpolator = Interpolator()
+    drawn = interpolator.sprites(snapshot, snapshot, 1)
+    assert interpolator.sprite(snapshot.player)\
+        is drawn[sprites.index(game.player)]
+
+
+@pytest.mark.parametrize("alpha, offset", [
+    (0, 0),
+    (0.5, 15),
+    (1, 30),
+    (0.25, 7.5),
+])
+def test_interpolates_between_snapshots(alpha, offset):
+    """
+    Tests that sprites are drawn the given fraction of the way between where
+    they were in the two snapshots
+    """
+    game = Game(seed=0)
+    previous = take_snapshot(game)
+    start = game.player.rect.topleft
+    game.player.move((30, -30))
+    current = take_snapshot(game)
+    drawn = Interpolator().sprites(previous, current, alpha)
+    index = game.all_sprites.sprites().index(game.player)
+    assert drawn[index].rect.topleft\
+        == pytest.approx((start[0] + offset, start[1] - offset), abs=0.5)
+
+
+def test_teleported_sprites_are_not_interpolated():
+    """
+    Tests that a sprite that moved too far between snapshots is drawn where it
+    is now, and that each sprite keeps the same stand-in between frames
+    """
+    game = Game(seed=0)
+    interpolator = Interpolator(max_distance=50)
+    previous = take_snapshot(game)
+    first = interpolator.sprites(previous, previous, 1)
+    game.player.move((200, 0))
+    current = take_snapshot(game)
+    second = interpolator.sprites(previous, current, 0.5)
+    assert second == first
+    index = game.all_sprites.sprites().index(game.player)
+    assert second[index].rect.topleft == game.player.rect.topleft
@@ -0,0 +1,95 @@
+"""
+Tests for the demon spawn waves in spawner.py
+"""
+import numpy as np
+import pygame
+import pytest
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT,\
+    DEMON_MIN_SPAWN_DIST, DEMON_MAX_SPAWN_DIST
+from src.game import Game
+from src.spawner import ring_positions
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+def test_ring_positions_outside_screen():
+    """
+    Tests that every spawn position is in the ring just outside the screen
+    """
+    positions = ring_positions(np.random.default_rng(0), 1000)
+    assert positions.shape == (1000, 2)
+    x, y = positions[:, 0], positions[:, 1]
+    # How far past the screen's edges each position is, negative if inside
+    past_x = np.maximum(-x, x - SCREEN_WIDTH)
+    past_y = np.maximum(-y, y - SCREEN_HEIGHT)
+    in_x = (past_x >= DEMON_MIN_SPAWN_DIST - 1e-6)\
+        & (past_x <= DEMON_MAX_SPAWN_DIST + 1e-6)
+    in_y = (past_y >= DEMON_MIN_SPAWN_DIST - 1e-6)\
+        & (past_y <= DEMON_MAX_SPAWN_DIST + 1e-6)
+    assert np.all(in_x | in_y)
+    # Demons come from every side
+    assert np.any(x < 0) and np.any(x > SCREEN_WIDTH)
+    assert np.any(y < 0) and np.any(y > SCREEN_HEIGHT)
+
+
+@pytest.mark.parametrize('size, growth, sizes', [
+    (1, 0, [1, 1, 1, 1]),
+    (1, 0.5, [1, 1, 2, 2]),
+    (3, 2, [3, 5, 7, 9]),
+])
+def test_waves_grow(size, growth, sizes):
+    """
+    Tests that each wave brings the right number of demons
+    """
+    game = Game(seed=0)
+    game.spawner.size, game.spawner.growth = size, growth
+    spawned = [len(game.spawner.spawn_wave()) for _ in sizes]
+    assert spawned == sizes
+    assert len(game.demons) == sum(sizes)
+    assert all(demon in game.all_sprites for demon in game.demons)
+    assert game.spawner.stats == {'waves': len(sizes),
+                                  'spawned': sum(sizes), 'capped': 0}
+
+
+@pytest.mark.parametrize('count', [5, 8, 20])
+def test_alive_cap(count):
+    """
+    Tests that the spawner never has more demons alive than the cap
+    """
+    cap = 8
+    game = Game(seed=0)
+    game.spawner.cap = cap
+    game.create_new_demon()
+    game.spawner.spawn(count)
+    assert len(game.demons) == min(count + 1, cap)
+    assert game.spawner.stats['capped'] == max(count + 1 - cap, 0)
+
+
+def test_waves_on_spawn_ticks():
+    """
+    Tests that the game starts a wave every spawn_ticks ticks, and that
+    restarting starts over from the first wave
+    """
+    game = Game(seed=0, spawn_ticks=10)
+    game.obstacles.empty()
+    for _ in range(30):
+        game.update()
+    assert game.spawner.wave == 3
+    game.restart()
+    assert game.spawner.wave == 0
+    assert game.spawner.stats == {'waves': 0, 'spawned': 0, 'capped': 0}
+    assert not game.demons
+
+
+def test_restart_reseeds_spawns():
+    """
+    Tests that after a restart the demons spawn in the same places whether or
+    not any spawned before it
+    """
+    spawned, fresh = Game(seed=0), Game(seed=0)
+    spawned.spawner.spawn(10)
+    for game in (spawned, fresh):
+        game.restart()
+    assert [demon.rect.center for demon in spawned.spawner.spawn(5)]\
+        == [demon.rect.center for demon in fresh.spawner.spawn(5)]
@@ -5,7 +5,7 @@ import pygame
 import pytest
 import src.constants as constants
 import src.utils as utils
-from src.sprites import Direction, GameSprite, MovingSprite
+from src.sprites import Direction, GameSprite, MovingSprite, Player
 from src.game import Game
 
 
@@ -45,6 +45,7 @@ def test_correct_animation_frame(frames, image):
         sprite.update()
     # pylint: disable=protected-access
     assert sprite.surf == sprite._animations['stills']['animations'][image]
+    assert sprite.mask is sprite._animations['stills']['masks'][image]
 
 
 def shifted_position(direction):
@@ -76,40 +77,40 @@ MOVEMENT_CASES = [
      (constants.SCREEN_WIDTH/2, constants.SCREEN_HEIGHT/2)),
     ((1, 0), 'right', Direction.RIGHT,
      (shifted_position('right')[0] +
-      constants.PLAYER_SPEED//constants.FRAME_RATE,
+      constants.PLAYER_SPEED / constants.FRAME_RATE,
       shifted_position('right')[1])),
     ((-1, 0), 'left', Direction.LEFT,
      (shifted_position('left')[0] -
-      constants.PLAYER_SPEED // constants.FRAME_RATE,
+      constants.PLAYER_SPEED / constants.FRAME_RATE,
       shifted_position('left')[1])),
     ((0, -1), 'up', Direction.UP,
      (shifted_position('up')[0],
       shifted_position('up')[1] -
-      constants.PLAYER_SPEED // constants.FRAME_RATE)),
+      constants.PLAYER_SPEED / constants.FRAME_RATE)),
     ((0, 1), 'down', Direction.DOWN,
      (shifted_position('up')[0],
       shifted_position('up')[1] +
-      constants.PLAYER_SPEED // constants.FRAME_RATE)),
+      constants.PLAYER_SPEED / constants.FRAME_RATE)),
     ((-1, -1), 'left', Direction.LEFT,
      (shifted_position('left')[0] -
-      constants.PLAYER_SPEED // constants.FRAME_RATE,
+      constants.PLAYER_SPEED / constants.FRAME_RATE,
       shifted_position('left')[1] -
-      constants.PLAYER_SPEED // constants.FRAME_RATE)),
+      constants.PLAYER_SPEED / constants.FRAME_RATE)),
     ((1, 1), 'right', Direction.RIGHT,
      (shifted_position('left')[0] +
-      constants.PLAYER_SPEED // constants.FRAME_RATE,
+      constants.PLAYER_SPEED / constants.FRAME_RATE,
       shifted_position('left')[1] +
-      constants.PLAYER_SPEED // constants.FRAME_RATE)),
+      constants.PLAYER_SPEED / constants.FRAME_RATE)),
     ((-1, -2), 'up', Direction.UP,
      (shifted_position('up')[0] -
-      constants.PLAYER_SPEED // constants.FRAME_RATE,
+      constants.PLAYER_SPEED / constants.FRAME_RATE,
       shifted_position('up')[1] -
-      2 * constants.PLAYER_SPEED // constants.FRAME_RATE)),
+      2 * constants.PLAYER_SPEED / constants.FRAME_RATE)),
     ((1, 2), 'down', Direction.DOWN,
      (shifted_position('down')[0] +
-      constants.PLAYER_SPEED // constants.FRAME_RATE,
+      constants.PLAYER_SPEED / constants.FRAME_RATE,
       shifted_position('down')[1] +
-      2 * constants.PLAYER_SPEED // constants.FRAME_RATE)),
+      2 * constants.PLAYER_SPEED / constants.FRAME_RATE)),
 ]
 
 
@@ -127,4 +128,84 @@ def test_moving_sprite_properties(direction, animation, facing, position):
     # pylint: disable=protected-access
     assert sprite.current_animation == sprite._animations[animation]
     assert sprite.current_facing == facing
-    assert sprite.rect.center == position
+    assert sprite.position == pytest.approx(position)
+    assert sprite.rect.center == (utils.round_half_up(position[0]),
+                                  utils.round_half_up(position[1]))
+
+
+def test_invincibility_flashes_shared_frames():
+    """
+    Tests that an invincible sprite flashes between its frames and their
+    pre-faded copies without changing the frames other sprites share
+    """
+    game = empty_game()
+    game.create_new_demon()
+    game.create_new_demon()
+    demon, other = game.demons.sprites()
+    demon.damage(Direction.UP.value)
+    surfs = set()
+    for _ in range(constants.FRAME_RATE // 2):
+        demon.update()
+        animation, frame = demon._last_animation  # pylint: disable=protected-access
+        assert demon.surf in (animation['animations'][frame],
+                              animation['faded'][frame])
+        surfs.add(demon.surf in animation['faded'])
+    assert surfs == {True, False}
+    other.update()
+    assert other.surf.get_alpha() == 255
+
+
+@pytest.mark.parametrize('steps', [1, 2, 4, 8])
+def test_movement_is_independent_of_tick_length(steps):
+    """
+    Tests that moving for the same game time in ticks of different lengths
+    ends up in the same place, including fractions of a pixel
+    """
+    sprite = MovingSprite(empty_game(), constants.PLAYER_SPEED,
+                          'test_animations')
+    sprite.set_direction((1, 0))
+    sprite.update(dt=constants.TICK)
+    start = sprite.position
+    for _ in range(steps):
+        sprite.update(dt=4 * constants.TICK / steps)
+    assert sprite.position == pytest.approx(
+        (start[0] + 4 * constants.PLAYER_SPEED / constants.FRAME_RATE,
+         start[1]))
+
+
+@pytest.mark.parametrize('dt', [constants.TICK, 0.05, 0.1])
+def test_timers_count_game_time(dt):
+    """
+    Tests that invincibility and knockback last the same game time whatever
+    the tick length
+    """
+    game = empty_game()
+    game.create_new_demon()
+    demon = game.demons.sprites()[0]
+    demon.damage(Direction.UP.value)
+    elapsed = 0
+    while demon.is_invincible:
+        demon.update(dt=dt)
+        elapsed += dt
+    assert elapsed == pytest.approx(constants.DEMON_INVINCIBILITY, abs=dt)
+    assert demon.entity.timers == (0, 0)
+
+
+@pytest.mark.parametrize('direction', [(1, 0), (-1, 0), (0, 1), (0, -1)])
+def test_player_stays_on_screen_on_slow_ticks(direction):
+    """
+    Tests that the player stops at the edge of the screen even when one tick
+    would carry it past the edge
+    """
+    player = Player(empty_game())
+    player.set_direction(direction)
+    player.update()
+    gap = {(1, 0): constants.SCREEN_WIDTH - player.rect.right,
+           (-1, 0): player.rect.left,
+           (0, 1): constants.SCREEN_HEIGHT - player.rect.bottom,
+           (0, -1): player.rect.top}[direction] - 5
+    player.move((direction[0] * gap, direction[1] * gap))
+    player.set_direction(direction, constants.MAX_TICK)
+    player.update(dt=constants.MAX_TICK)
+    assert player.current_direction == (0, 0)
+    assert pygame.Rect((0, 0), constants.SCREEN_SIZE).contains(player.rect)
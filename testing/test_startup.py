@@ -0,0 +1,40 @@
+"""
+Tests for the startup time report in startup.py
+"""
+import pytest
+from src.startup import parse_import_times, import_times
+
+IMPORT_TIMES = """import time: self [us] | cumulative | imported package
+import time:       733 |       1761 |   cProfile
+import time:      2056 |       2516 |         json.scanner
+import time:      4043 |       4547 |     csv
+import time:     19469 |    1107632 | src.main
+"""
+
+
+@pytest.mark.parametrize("name, self_ms, cumulative_ms, depth", [
+    ('cProfile', 0.733, 1.761, 1),
+    ('json.scanner', 2.056, 2.516, 4),
+    ('csv', 4.043, 4.547, 2),
+    ('src.main', 19.469, 1107.632, 0),
+])
+def test_parse_import_times(name, self_ms, cumulative_ms, depth):
+    """
+    Tests that each line of -X importtime output is read in milliseconds with
+    its depth
+    """
+    modules = parse_import_times(IMPORT_TIMES)
+    assert list(modules) == ['cProfile', 'json.scanner', 'csv', 'src.main']
+    assert modules[name]['self'] == pytest.approx(self_ms)
+    assert modules[name]['cumulative'] == pytest.approx(cumulative_ms)
+    assert modules[name]['depth'] == depth
+
+
+def test_view_import_leaves_out_menus():
+    """
+    Tests that importing the view doesn't load pygame_menu, which only the
+    menus need
+    """
+    modules = import_times('src.view')
+    assert 'src.view' in modules
+    assert 'pygame_menu' not in modules
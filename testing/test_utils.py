@@ -5,6 +5,8 @@ import pygame
 import pytest
 import src.constants as constants
 import src.utils as utils
+from src.game import Game
+from src.sprites import Demon, Direction
 
 
 def test_animation_info():
@@ -13,10 +15,37 @@ def test_animation_info():
     """
     pygame.init()
     _ = pygame.display.set_mode((1, 1))
-    info = utils.get_animation_info(f"{constants.IMAGE_FOLDER}/test_animations")
+    info = utils.get_animation_info(f"{constants.IMAGE_FOLDER}/test_animations",
+                                    faded=True)
     assert len(info['animations']) == 4
     assert info['positions'] == [(25, 23), (3, 4), (5, 6), (7, 8)]
     assert info['frame_length'] == constants.FRAME_RATE / 5
+    assert len(info['masks']) == 4
+    assert len(info['rects']) == 4
+    assert len(info['faded']) == 4
+    for image, mask, rect, faded in zip(info['animations'], info['masks'],
+                                        info['rects'], info['faded']):
+        assert mask.get_size() == image.get_size()
+        assert rect == image.get_bounding_rect()
+        assert faded.get_size() == image.get_size()
+        assert faded.get_alpha() == image.get_alpha()
+
+
+@pytest.mark.parametrize("alpha", [0, 100, 255])
+def test_fade(alpha):
+    """
+    Tests that fading an image scales the alpha of each pixel and keeps its
+    color
+    """
+    pygame.init()
+    _ = pygame.display.set_mode((1, 1))
+    image = pygame.Surface((2, 1), pygame.SRCALPHA)
+    image.set_at((0, 0), (10, 20, 30, 255))
+    image.set_at((1, 0), (10, 20, 30, 0))
+    faded = utils.fade(image, alpha)
+    assert tuple(faded.get_at((0, 0))) == (10, 20, 30, alpha)
+    assert faded.get_at((1, 0)).a == 0
+    assert image.get_at((0, 0)).a == 255
 
 
 IS_SWORD_CASES = [
@@ -40,3 +69,71 @@ def test_is_sword(color, sword):
     Tests whether the is_sword function properly detects swords
     """
     assert utils.is_sword(color) == sword
+
+
+@pytest.mark.parametrize("direction", ["up", "down", "left", "right"])
+def test_sword_mask(direction):
+    """
+    Tests whether get_sword_mask finds the same pixels as is_sword
+    """
+    pygame.init()
+    _ = pygame.display.set_mode((1, 1))
+    info = utils.get_animation_info(
+        f"{constants.IMAGE_FOLDER}/player/attack_{direction}",
+        sword_masks=True)
+    for image, mask, sword_mask in zip(info['animations'], info['masks'],
+                                       info['sword_masks']):
+        for x in range(image.get_width()):
+            for y in range(image.get_height()):
+                pixel = (x, y)
+                assert sword_mask.get_at(pixel) == (
+                    mask.get_at(pixel) and utils.is_sword(image.get_at(pixel)))
+
+
+def test_touching_sword():
+    """
+    Tests whether touching_sword only counts hits from the sword pixels
+    """
+    pygame.init()
+    _ = pygame.display.set_mode((1, 1))
+    game = Game()
+    game.obstacles.empty()
+    player = game.player
+    player.attack(Direction.RIGHT)
+    player.update()
+    # Shrink the demon to a single pixel to control where it touches
+    demon = Demon(game)
+    demon.mask = pygame.mask.Mask((1, 1), fill=True)
+    width, height = player.sword_mask.get_size()
+    pixels = [(x, y) for y in range(height) for x in range(width)]
+
+    sword = next(pixel for pixel in pixels if player.sword_mask.get_at(pixel))
+    demon.rect = pygame.Rect(player.rect.x + sword[0],
+                             player.rect.y + sword[1], 1, 1)
+    assert utils.touching_sword(player, demon)
+
+    body = next(pixel for pixel in pixels if player.mask.get_at(pixel)
+                and not player.sword_mask.get_at(pixel))
+    demon.rect = pygame.Rect(player.rect.x + body[0],
+                             player.rect.y + body[1], 1, 1)
+    assert pygame.sprite.collide_mask(player, demon) is not None
+    assert not utils.touching_sword(player, demon)
+
+
+MERGE_CASES = [
+    ([(0, 0, 10, 10)], [(0, 0, 10, 10)]),
+    ([(0, 0, 10, 10), (20, 0, 10, 10)], [(0, 0, 10, 10), (20, 0, 10, 10)]),
+    ([(0, 0, 10, 10), (5, 5, 10, 10)], [(0, 0, 15, 15)]),
+    # The last rect joins the first two, and then their union overlaps the
+    # third
+    ([(0, 0, 10, 10), (30, 0, 10, 10), (12, 8, 10, 10), (5, 5, 30, 2)],
+     [(0, 0, 40, 18)]),
+]
+
+
+@pytest.mark.parametrize("rects,merged", MERGE_CASES)
+def test_merge_rects(rects, merged):
+    """
+    Tests that overlapping rects are merged until none of them overlap
+    """
+    assert [tuple(rect) for rect in utils.merge_rects(rects)] == merged
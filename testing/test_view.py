@@ -0,0 +1,103 @@
+"""
+Tests for the graphic view in view.py
+"""
+from unittest import mock
+import pygame
+import src.constants as constants
+from src.controller import PlayerController, DemonController, ScrollController
+from src.events import EventType
+from src.game import Game
+from src.inputs import RandomKeys
+from src.simulation import Simulation
+from src.view import GraphicView
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+# pylint: disable=protected-access
+
+
+def test_menus_are_built_on_first_use():
+    """
+    Tests that making a view doesn't build any menus or load any audio, and
+    that each menu is only built once
+    """
+    # Menus have to fit in the window
+    pygame.display.set_mode(constants.SCREEN_SIZE)
+    view = GraphicView(Game(), pygame.Surface(constants.SCREEN_SIZE))
+    assert not view._menus
+    assert not view.audio._sounds
+    assert not view._music_loaded
+    pause_menu = view._menu('pause')
+    assert view._menu('pause') is pause_menu
+    assert list(view._menus) == ['pause']
+
+
+def test_dirty_rects_match_full_redraw():
+    """
+    Tests that only redrawing what changed leaves the screen the same as
+    redrawing all of it
+    """
+    game = Game(seed=2, spawn_ticks=30)
+    game.running = True
+    for _ in range(20):
+        game.create_new_demon()
+    steps = [PlayerController(game, RandomKeys(2)).update,
+             DemonController(game).update, ScrollController(game).update,
+             game.update]
+    dirty = GraphicView(game, pygame.Surface(constants.SCREEN_SIZE), True)
+    full = GraphicView(game, pygame.Surface(constants.SCREEN_SIZE), False)
+    for _ in range(60):
+        # Keep the player alive so no menu opens
+        game.player.entity.health = constants.PLAYER_HEALTH
+        for step in steps:
+            step()
+        # Leave the sounds out, there may be no audio device
+        dirty._play_sounds = full._play_sounds = lambda events: None
+        dirty.draw()
+        full.draw()
+        assert pygame.image.tobytes(dirty._screen, 'RGB')\
+            == pygame.image.tobytes(full._screen, 'RGB')
+
+
+def test_flashlight_follows_drawn_player():
+    """
+    Tests that the flashlight stays over the player as drawn between
+    snapshots, however long the frames are
+    """
+    game = Game(seed=3, spawn_ticks=constants.DEMON_SPAWN_TICKS)
+    game.running = True
+    sim = Simulation(game, PlayerController(game, RandomKeys(3)))
+    view = GraphicView(game, pygame.Surface(constants.SCREEN_SIZE))
+    view._play_sounds = lambda events: None
+    flashlight = view._flashlight
+    for elapsed in [0.01, 0.03, 0.1, 0.02] * 15:
+        game.player.entity.health = constants.PLAYER_HEALTH
+        sim.advance(elapsed)
+        frame = sim.frame()
+        view.draw(elapsed, frame)
+        player = view._interpolator.sprite(frame.current.player)
+        assert flashlight.rect.centerx - flashlight.frame_offset[0]\
+            == player.rect.centerx - frame.current.offset[0]
+        assert frame.current.animation.endswith(
+            flashlight.current_animation_name)
+
+
+def test_death_sound_plays_before_end_menu():
+    """
+    Tests that the view plays the sound of the player dying from its event,
+    before the end menu blocks
+    """
+    game = Game(seed=4, spawn_ticks=0)
+    game.running = True
+    view = GraphicView(game, pygame.Surface(constants.SCREEN_SIZE))
+    played = []
+    view._audio.play = played.append
+    end_menu = mock.Mock()
+    end_menu.mainloop.side_effect = lambda screen: played.append('end menu')
+    view._menus['end'] = end_menu
+    game.player.kill()
+    game.events.emit(EventType.PLAYER_DIED, game.ticks,
+                     game.player.rect.center)
+    view.draw()
+    assert played == ['player_hit', 'end menu']